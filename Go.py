@@ -1,3 +1,6 @@
+import random
+import time
+
 '''
 O TAD interseção é usado para representar uma interseção do tabuleiro de Go.
 
@@ -101,6 +104,12 @@ def obtem_intersecoes_adjacentes(i, l):
     a ordem de leitura em que l corresponde à interseção superior direita do tabuleiro de Go.
     '''
 
+    # Se l for o canto de um goban, as adjacentes de cada interseção estão numa tabela
+    if obtem_lin(l) in (9, 13, 19) and obtem_col(l) == chr(ord("A") + obtem_lin(l) - 1):
+        tabelas = _obtem_tabelas(obtem_lin(l))
+        if i in tabelas['indices']:
+            return tabelas['adjacentes'][tabelas['indices'][i]]
+
     col = obtem_col(i)
     lin = obtem_lin(i)
     intersecoes_adjacentes = ()
@@ -124,6 +133,11 @@ def ordena_intersecoes(t):
     de acordo com a ordem de leitura do tabuleiro de Go.
     '''
 
+    # O índice de cada interseção no maior goban corresponde à ordem de leitura
+    indices = _obtem_tabelas(19)['indices']
+    if all(intersecao in indices for intersecao in t):
+        return tuple(sorted(t, key=indices.__getitem__))
+
     # Ordena pela linha e em caso de igualdade pela coluna
     return tuple(sorted(t, key=lambda i: (obtem_lin(i), obtem_col(i))))
 
@@ -171,7 +185,7 @@ def eh_pedra(arg):
     Esta função devolve True caso o seu argumento seja um TAD pedra e False caso contrário.
     '''
 
-    return arg in (cria_pedra_branca(), cria_pedra_preta(), cria_pedra_neutra())
+    return arg in _PEDRAS
 
 def eh_pedra_branca(p):
     '''
@@ -201,7 +215,16 @@ def pedras_iguais(p1, p2):
     if not eh_pedra(p1) or not eh_pedra(p2):
         return False
 
-    return eh_pedra_branca(p1) and eh_pedra_branca(p2) or eh_pedra_preta(p1) and eh_pedra_preta(p2) or not eh_pedra_jogador(p1) and not eh_pedra_jogador(p2)
+    return pedras_iguais_sem_verificacao(p1, p2)
+
+def pedras_iguais_sem_verificacao(p1, p2):
+    '''
+    pedras_iguais_sem_verificacao: pedra x pedra → booleano
+
+    Esta função devolve True se as pedras p1 e p2 forem iguais, sem verificar que são pedras.
+    '''
+
+    return p1 == p2
 
 def pedra_para_str(p):
     '''
@@ -227,44 +250,79 @@ def eh_pedra_jogador(p):
 
     return eh_pedra_branca(p) or eh_pedra_preta(p)
 
+def obtem_pedra_adversaria(p):
+    '''
+    obtem_pedra_adversaria: pedra → pedra
+
+    Esta função devolve a pedra do adversário do jogador com pedras p.
+    '''
+
+    return cria_pedra_preta() if eh_pedra_branca(p) else cria_pedra_branca()
+
+# Pedras possíveis, criadas uma única vez
+_PEDRAS = (cria_pedra_branca(), cria_pedra_preta(), cria_pedra_neutra())
+
 '''
 O TAD goban é usado para representar um tabuleiro do jogo Go e as pedras dos jogadores
 que nele são colocadas.
 
 -Cada goban é representado por uma lista de listas de interseções onde cada uma das listas (dentro da lista que
 representa o goban) representa uma coluna do tabuleiro.
+
+-Um goban incremental é representado por um dicionário que guarda as mesmas colunas ('colunas') e mantém
+atualizadas as cadeias do tabuleiro à medida que as pedras são colocadas. Cada interseção tem um índice
+(linha - 1) * n + coluna, pela ordem de leitura; 'cadeia' associa a cada índice o representante da sua cadeia
+(ou -1 se estiver livre), 'pedras' associa a cada representante os índices das pedras da cadeia e
+'liberdades' o conjunto dos índices das liberdades da cadeia. O valor de 'hash' é o hash de Zobrist do goban,
+atualizado a cada pedra colocada ou removida. Para a pontuação, 'contagem' guarda o número de pedras brancas e
+pretas; 'territorio' associa a cada índice livre a sua região, 'regioes' associa a cada região os seus índices e
+o seu dono, 'pontos_territorio' soma as regiões de cada jogador e 'alteradas' guarda os índices alterados
+desde a última pontuação, para que só as regiões que lhes tocam sejam pontuadas de novo.
+
+-Um goban em bits é representado por um dicionário com três inteiros usados como conjuntos de bits,
+um bit por interseção (pelo mesmo índice da representação incremental): as pedras brancas ('brancas'),
+as pedras pretas ('pretas') e as interseções livres ('vazias'), além do hash de Zobrist ('hash').
+Vizinhanças, cadeias, capturas e territórios são calculados com deslocamentos e máscaras.
 '''
 
-def cria_goban_vazio(n):
+# Representações possíveis de um goban
+REPRESENTACOES = ('listas', 'incremental', 'bits')
+
+def cria_goban_vazio(n, representacao='listas'):
     '''
-    cria goban vazio: int → goban
+    cria goban vazio: int x str → goban
 
-    Esta função devolve um goban de tamanho nxn, sem interseções ocupadas.
+    Esta função devolve um goban de tamanho nxn, sem interseções ocupadas, na representação indicada.
     '''
 
     # Verifica o argumento
-    if not n in (9, 13, 19) or not isinstance(n, int):
+    if not n in (9, 13, 19) or not isinstance(n, int) or not representacao in REPRESENTACOES:
         raise ValueError("cria_goban_vazio: argumento invalido")
-    
+
     goban = []
 
     # Adiciona ao goban n colunas com n pedras neutras
     for coluna in range(n):
         goban += [[cria_pedra_neutra()] * n]
 
+    if not representacao == 'listas':
+        return converte_goban(goban, representacao)
+
     return goban
 
-def cria_goban(n, ib, ip):
+def cria_goban(n, ib, ip, representacao='listas'):
     '''
-    cria_goban: int x tuplo x tuplo → goban
+    cria_goban: int x tuplo x tuplo x str → goban
 
     Esta função devolve um goban de tamanho nxn, com as interseções do tuplo ib ocupadas por pedras brancas
-    e as interseções do tuplo ip ocupadas por pedras pretas.
+    e as interseções do tuplo ip ocupadas por pedras pretas, na representação indicada.
     '''
-    
+
     # Verifica o tamanho do tabuleiro e que ib e ip são tuplos
     if not n in (9, 13, 19) or not isinstance(n, int) or not isinstance(ib, tuple) or not isinstance(ip, tuple):
         raise ValueError("cria_goban: argumentos invalidos")
+    if not representacao in REPRESENTACOES:
+        raise ValueError("cria_goban: argumentos invalidos")
     
     # Verifica que duas pedras diferentes não estão na mesma interseção
     for intersecao in ib:
@@ -290,6 +348,9 @@ def cria_goban(n, ib, ip):
     for intersecao in ip:
         goban[ord(obtem_col(intersecao))-ord("A")][obtem_lin(intersecao)-1] = cria_pedra_preta()
 
+    if not representacao == 'listas':
+        return converte_goban(goban, representacao)
+
     return goban
 
 def cria_copia_goban(t):
@@ -299,6 +360,11 @@ def cria_copia_goban(t):
     Esta função recebe um goban e devolve uma cópia do goban.
     '''
 
+    if eh_goban_incremental(t):
+        return _copia_goban_incremental(t)
+    if eh_goban_bits(t):
+        return dict(t)
+
     copia = []
 
     for coluna in t:
@@ -314,8 +380,8 @@ def obtem_ultima_intersecao(g):
     Esta função recebe um goban e devolve a interseção correspondente ao canto superior direito do goban.
     '''
 
-    col = chr(len(g)+ord("A")-1)
-    lin = len(g)
+    col = chr(obtem_tamanho(g)+ord("A")-1)
+    lin = obtem_tamanho(g)
 
     return cria_intersecao(col, lin)
 
@@ -327,7 +393,10 @@ def obtem_pedra(g, i):
     Se a posição não estiver ocupada, devolve uma pedra neutra.
     '''
 
-    valor_da_pedra = g[ord(obtem_col(i))-ord("A")][obtem_lin(i)-1]
+    if eh_goban_bits(g):
+        return _pedra_bits(g, indice_da_intersecao(i, g['n']))
+
+    valor_da_pedra = obtem_colunas(g)[ord(obtem_col(i))-ord("A")][obtem_lin(i)-1]
 
     if eh_pedra_branca(valor_da_pedra):
         return cria_pedra_branca()
@@ -345,44 +414,22 @@ def obtem_cadeia(g, i):
     Se a posição não estiver ocupada, devolve a cadeia de posições livres.
     '''
 
-    def cadeia(g,i,tup):
-        '''
-        cadeia: goban x intersecao x tuplo de interseções → tuplo
-
-        Esta função recursiva encontra as interseções adjacentes com o mesmo valor da interseção recebida.
-        Depois as adjacentes com o mesmo valor dessas interseções e assim successivamente até que todas as
-        interseçoes da cadeia estejam contabilizadas. Ela devolve um tuplo formado por todas essas interseções.
-        '''
+    # Num goban em bits a cadeia é obtida expandindo a interseção com deslocamentos
+    if eh_goban_bits(g):
+        n = g['n']
+        dentro = _bits_da_pedra(g, obtem_pedra(g, i))
+        return _bits_para_intersecoes(_preenche_bits(1 << indice_da_intersecao(i, n), dentro, n), n)
 
-        for adjacente in obtem_intersecoes_adjacentes(i, obtem_ultima_intersecao(g)):
+    # Num goban incremental a cadeia de pedras já é conhecida
+    if eh_goban_incremental(g) and g['cadeia'][indice_da_intersecao(i, g['n'])] >= 0:
+        pedras = g['pedras'][g['cadeia'][indice_da_intersecao(i, g['n'])]]
+        return tuple(intersecao_do_indice(k, g['n']) for k in sorted(pedras))
 
-            # Descobre a pedra da adjacente
-            if eh_pedra_branca(obtem_pedra(g, adjacente)):
-                valor_intersecao_adjacente = cria_pedra_branca()
-            elif eh_pedra_preta(obtem_pedra(g, adjacente)):
-                valor_intersecao_adjacente = cria_pedra_preta()
-            else:
-                valor_intersecao_adjacente = cria_pedra_neutra()
-            
-            # Se a pedra da adjacente e da intercesão forem iguais e a adjacente não estiver no tuplo, adiciona-a
-            if pedras_iguais(valor_intersecao_base, valor_intersecao_adjacente) and not adjacente in tup:
-                tup += adjacente,
-                tup = cadeia(g, adjacente, tup)
-        
-        return tup
-    
-    # Este tuplo vai conter todas as interseções da cadeia
-    tup=(i),
-
-    # Descobre a pedra da interseção
-    if eh_pedra_branca(obtem_pedra(g, i)):
-        valor_intersecao_base = cria_pedra_branca()
-    elif eh_pedra_preta(obtem_pedra(g, i)):
-        valor_intersecao_base = cria_pedra_preta()
-    else:
-        valor_intersecao_base = cria_pedra_neutra()
+    # Preenche a cadeia com a pesquisa iterativa usada na rotulagem do goban
+    n = obtem_tamanho(g)
+    membros = _preenche_componente(obtem_colunas(g), n, indice_da_intersecao(i, n), [-1] * (n * n), 0)[0]
 
-    return ordena_intersecoes(cadeia(g, i, tup))
+    return tuple(intersecao_do_indice(k, n) for k in membros)
 
 def coloca_pedra(g, i, p):
     '''
@@ -392,6 +439,11 @@ def coloca_pedra(g, i, p):
     e devolve o próprio goban.
     '''
     
+    if eh_goban_incremental(g):
+        return _altera_ponto_incremental(g, indice_da_intersecao(i, g['n']), p)
+    if eh_goban_bits(g):
+        return _altera_ponto_bits(g, indice_da_intersecao(i, g['n']), p)
+
     col = ord(obtem_col(i))-ord("A")
     lin = obtem_lin(i)-1
 
@@ -429,23 +481,41 @@ def eh_goban(arg):
     Esta função devolve True caso o seu argumento seja um TAD goban e False caso contrário.
     '''
 
+    # Um goban incremental é válido se as suas colunas formarem um goban
+    if eh_goban_incremental(arg):
+        return eh_goban(arg.get('colunas')) and len(arg['colunas']) == arg.get('n')
+
+    # Um goban em bits é válido se os seus conjuntos de bits forem disjuntos e cobrirem o goban
+    if eh_goban_bits(arg):
+        if not arg.get('n') in (9, 13, 19) or not all(isinstance(arg.get(chave), int) for chave in ('brancas', 'pretas', 'vazias')):
+            return False
+        total = _obtem_mascaras(arg['n'])[0]
+        return arg['brancas'] & arg['pretas'] == 0 and arg['vazias'] == total & ~(arg['brancas'] | arg['pretas']) and \
+            (arg['brancas'] | arg['pretas']) & ~total == 0
+
+    if isinstance(arg, dict):
+        return False
+
     # Verifica se o argumento tem um tamanho
     try:
         tamanho_goban = obtem_lin(obtem_ultima_intersecao(arg))
     except (TypeError, ValueError):
         return False
 
-    # Verifica se o formato do argumento está correto
-    if not tamanho_goban in (9, 13, 19) or not type(arg) == type(cria_goban_vazio(tamanho_goban)):
+    # Verifica se o formato do argumento está correto (o goban vazio é criado uma única vez)
+    if not tamanho_goban in (9, 13, 19):
+        return False
+    vazio = cria_goban_vazio(tamanho_goban)
+    if not type(arg) == type(vazio):
         return False
     
     for coluna in arg:
         # Verifica se cada coluna está correta
-        if not type(coluna) == type(cria_goban_vazio(tamanho_goban)[0]) or not len(coluna) == tamanho_goban:
+        if not type(coluna) == type(vazio[0]) or not len(coluna) == tamanho_goban:
             return False
         for intersecao in coluna:
             # Verifica se cada interseção está correta
-            if not eh_pedra(intersecao):
+            if not intersecao in _PEDRAS:
                 return False
             
     return True
@@ -464,11 +534,7 @@ def eh_intersecao_valida(g, i):
         return False
     
     # Verifica se o número pertence ao goban
-    for coluna in g:
-        if not obtem_lin(i) in range(1, tamanho_goban +1):
-            return False
-    
-    return True
+    return obtem_lin(i) in range(1, tamanho_goban +1)
 
 def gobans_iguais(g1, g2):
     '''
@@ -480,62 +546,45 @@ def gobans_iguais(g1, g2):
     if not eh_goban(g1) or not eh_goban(g2):
         return False 
 
-    tamanho_goban = obtem_lin(obtem_ultima_intersecao(g1))
-
-    # Verifica que os dois gobans têm o mesmo tamanho
-    if not tamanho_goban == obtem_lin(obtem_ultima_intersecao(g2)):
-        return False
-    
-    for linha in range(tamanho_goban):
-        for coluna in range(tamanho_goban):
-            col = chr(coluna + ord("A"))
-            lin = linha+1
-            intersecao = cria_intersecao(col,lin)
-            # Verifica se cada interseção em g1 é igual em g2
-            if not pedras_iguais(obtem_pedra(g1, intersecao), obtem_pedra(g2, intersecao)):
-                return False
-            
-    return True
+    return gobans_iguais_sem_verificacao(g1, g2)
 
-def goban_para_str(g):
+def gobans_iguais_sem_verificacao(g1, g2):
     '''
-    goban_para_str: goban → str
+    gobans_iguais_sem_verificacao: goban x goban → booleano
 
-    Esta função recebe um goban e devolve a cadeia de caracteres que representa o goban.
+    Esta função devolve True se os gobans g1 e g2 forem iguais, sem verificar que são gobans.
     '''
 
-    # Tamanho do goban
-    tamanho_goban = obtem_lin(obtem_ultima_intersecao(g))
-
-    # Linha com letras das colunas inicial
-    linha_das_colunas = "   "
-    for coluna in range(tamanho_goban):
-        linha_das_colunas += chr(coluna + ord("A")) + " "
-    linha_das_colunas = linha_das_colunas[:-1] # Retira o espaço final
-    str_goban = linha_das_colunas + "\n"
+    # Gobans em bits são iguais se os seus conjuntos de bits forem iguais
+    if eh_goban_bits(g1) and eh_goban_bits(g2):
+        return g1['n'] == g2['n'] and g1['brancas'] == g2['brancas'] and g1['pretas'] == g2['pretas']
 
-    # Linhas do Goban
-    for linha in range(tamanho_goban, 0, -1):
+    # Gobans incrementais com hashes diferentes não podem ser iguais
+    if eh_goban_incremental(g1) and eh_goban_incremental(g2) and not g1['hash'] == g2['hash']:
+        return False
 
-        linha_goban = str(linha) # Número da linha
+    # Verifica que os dois gobans têm o mesmo tamanho e que cada interseção em g1 é igual em g2
+    return obtem_tamanho(g1) == obtem_tamanho(g2) and obtem_colunas(g1) == obtem_colunas(g2)
 
-        if linha < 10:
-            linha_goban = " " + linha_goban
-        linha_goban += " " # Número da linha no início da linha
+def goban_para_str(g):
+    '''
+    goban_para_str: goban → str
 
-        for coluna in range(tamanho_goban):
-            linha_goban += pedra_para_str(g[coluna][linha - 1]) + " " # Pedra
+    Esta função recebe um goban e devolve a cadeia de caracteres que representa o goban.
+    '''
 
-        if linha < 10:
-            linha_goban += " "
-        linha_goban += str(linha) + "\n" # Número da linha no final da linha
-        
-        str_goban += linha_goban
+    # Tamanho e colunas do goban, e partes fixas do desenho
+    n = obtem_tamanho(g)
+    colunas = obtem_colunas(g)
+    desenho = _obtem_desenho(n)
 
-    # Linha com letras das colunas final
-    str_goban += linha_das_colunas
+    # Linha com letras das colunas, linhas do goban de cima para baixo e de novo a linha com letras
+    linhas = [desenho['letras']]
+    for linha in range(n - 1, -1, -1):
+        linhas += [_desenha_linha(colunas, linha, n, desenho)]
+    linhas += [desenho['letras']]
 
-    return str_goban
+    return '\n'.join(linhas)
 
 def obtem_territorios(g):
     '''
@@ -546,36 +595,25 @@ def obtem_territorios(g):
     e os territórios ordenados em ordem de leitura da primeira interseção do território.
     '''
 
-    def eh_intersecao_contabilizada(intersecao, territorios):
-        '''
-        eh_intersecao_contabilizada: intersecao x tuplo → booleano
-
-        Esta função retorna True se a interseção já foi contabilizada em algum território
-        e false caso contrário.
-        '''
+    if eh_goban_bits(g):
+        return _obtem_territorios_bits(g)
 
-        for territorio in territorios:
-            # Verifica se a interseção está em algum território
-            if intersecao in territorio:
-                return True
-            
-        return False
-    
-    territorios = ()
+    # Num goban incremental as regiões livres já são conhecidas
+    if eh_goban_incremental(g):
+        n = g['n']
+        regioes = sorted(membros for membros, dono in _atualiza_territorios(g)['regioes'].values())
+        return tuple(tuple(intersecao_do_indice(k, n) for k in membros) for membros in regioes)
 
-    tamanho_goban = obtem_lin(obtem_ultima_intersecao(g))
+    # Os territórios são as componentes livres da rotulagem, já em ordem de leitura
+    n = obtem_tamanho(g)
+    rotulagem = rotula_goban(g)
+    territorios = []
 
-    for num_col in range(tamanho_goban):
-        for num_lin in range(1, tamanho_goban + 1):
-            col = chr(ord("A") + num_col)
-            lin = num_lin
-            intersecao = cria_intersecao(col, lin)
-            # Se for um território não contabilizado, adiciona-o ao tuplo territórios
-            if not eh_intersecao_contabilizada(intersecao, territorios) and not eh_pedra_jogador(obtem_pedra(g, intersecao)):
-                territorios += (obtem_cadeia(g, intersecao)),
+    for componente in range(len(rotulagem['componentes'])):
+        if not eh_pedra_jogador(rotulagem['pedras'][componente]):
+            territorios += [tuple(intersecao_do_indice(k, n) for k in rotulagem['componentes'][componente])]
 
-    # Organiza os territórios por ordem de leitura da primeira interseção do território
-    return tuple(sorted(territorios, key=lambda territorio: (obtem_lin(territorio[0]), obtem_col(territorio[0]))))
+    return tuple(territorios)
 
 def obtem_adjacentes_diferentes(g, t):
     '''
@@ -588,22 +626,25 @@ def obtem_adjacentes_diferentes(g, t):
     (b) ocupadas por pedras de jogador, se as interseções do tuplo t estão livres.
     '''
 
-    adjacentes_diferentes = ()
+    if eh_goban_bits(g):
+        return _obtem_adjacentes_diferentes_bits(g, t)
+
+    n = obtem_tamanho(g)
+    colunas = obtem_colunas(g)
+    vizinhos = obtem_vizinhos(n)
+    adjacentes_diferentes = set()
 
     for intersecao in t:
-        adjacentes = obtem_intersecoes_adjacentes(intersecao, obtem_ultima_intersecao(g))
-        for adjacente in adjacentes:
-            # Se a adjacente for diferente da interseção e a adjacente não estiver no resultado
-            if not obtem_pedra(g, adjacente) == obtem_pedra(g, intersecao) and adjacente not in adjacentes_diferentes: 
-                # Se a interseção tiver uma pedra de um jogador
-                if eh_pedra_jogador(obtem_pedra(g, intersecao)):
-                    # Se a adjacente for neutra
-                    if not eh_pedra_jogador(obtem_pedra(g, adjacente)):
-                            adjacentes_diferentes += (adjacente),
-                else:
-                    adjacentes_diferentes += (adjacente),
-        
-    return ordena_intersecoes(adjacentes_diferentes)
+        k = indice_da_intersecao(intersecao, n)
+        pedra = colunas[k % n][k // n]
+        for adjacente in vizinhos[k]:
+            pedra_adjacente = colunas[adjacente % n][adjacente // n]
+            # Se a adjacente for diferente da interseção: livre, se a interseção tiver uma pedra de um
+            # jogador, ou qualquer pedra de jogador, se a interseção estiver livre
+            if not pedra_adjacente == pedra and (not eh_pedra_jogador(pedra) or not eh_pedra_jogador(pedra_adjacente)):
+                adjacentes_diferentes.add(adjacente)
+
+    return tuple(intersecao_do_indice(k, n) for k in sorted(adjacentes_diferentes))
 
 def jogada(g, i, p):
     '''
@@ -613,7 +654,29 @@ def jogada(g, i, p):
     na interseção i e remove todas as pedras do jogador contrário pertencentes a
     cadeias adjacentes à i sem liberdades, devolvendo o próprio goban.
     '''
-    
+
+    # Num goban incremental as capturas são feitas a partir das liberdades das cadeias
+    if eh_goban_incremental(g):
+        joga_incremental(g, indice_da_intersecao(i, g['n']), p)
+        return g
+
+    # Num goban em bits as capturas são calculadas com deslocamentos e máscaras
+    if eh_goban_bits(g):
+        _joga_bits(g, indice_da_intersecao(i, g['n']), p)
+        return g
+
+    _joga_listas(g, i, p)
+
+    return g
+
+def _joga_listas(g, i, p):
+    '''
+    _joga_listas: goban x intersecao x pedra → lista
+
+    Esta função auxiliar faz a jogada da função jogada num goban representado por listas
+    e devolve a lista dos índices das pedras capturadas.
+    '''
+
     # Coloca a pedra na interseção i
     coloca_pedra(g, i, p)
     
@@ -635,12 +698,15 @@ def jogada(g, i, p):
             elif eh_pedra_preta(pedra) and not eh_pedra_preta(pedra_adjacente):
                 pedras_adversarias_adjacentes += [adjacente]
 
-    # Remove pedras adversárias sem liberdades
+    # Remove pedras adversárias sem liberdades (uma cadeia adjacente por dois lados só é removida uma vez)
+    capturadas = []
     for adversaria in pedras_adversarias_adjacentes:
-        if not tem_liberdades(g, adversaria):
-            remove_cadeia(g, obtem_cadeia(g, adversaria))
+        if eh_pedra_jogador(obtem_pedra(g, adversaria)) and not tem_liberdades(g, adversaria):
+            cadeia = obtem_cadeia(g, adversaria)
+            capturadas += [indice_da_intersecao(intersecao, len(g)) for intersecao in cadeia]
+            remove_cadeia(g, cadeia)
 
-    return g
+    return capturadas
 
 def obtem_pedras_jogadores(g):
     '''
@@ -649,218 +715,2162 @@ def obtem_pedras_jogadores(g):
     Esta função devolve um tuplo de dois inteiros que correspondem ao número de interseções 
     ocupadas por pedras do jogador branco e preto, respetivamente.
     '''
-    
-    pedras_branco = 0
-    pedras_preto = 0
 
-    tamanho_goban = obtem_lin(obtem_ultima_intersecao(g))
+    if eh_goban_bits(g):
+        return (g['brancas'].bit_count(), g['pretas'].bit_count())
+    if eh_goban_incremental(g):
+        return tuple(g['contagem'])
 
-    for num_col in range(tamanho_goban):
-        for num_lin in range(1, tamanho_goban + 1):
-            col = chr(ord("A") + num_col)
-            lin = num_lin
-            intersecao = cria_intersecao(col, lin)
+    pedras_branco = 0
+    pedras_preto = 0
 
+    for coluna in obtem_colunas(g):
+        for pedra in coluna:
             # Verifica a cor da pedra e contabiliza o ponto para o jogador
-            if eh_pedra_branca(obtem_pedra(g, intersecao)):
+            if eh_pedra_branca(pedra):
                 pedras_branco += 1
-            elif eh_pedra_preta(obtem_pedra(g, intersecao)):
+            elif eh_pedra_preta(pedra):
                 pedras_preto += 1
 
     return (pedras_branco, pedras_preto)
 
-# FUNÇÕES ADICIONAIS
+# FUNÇÕES COMUNS ÀS REPRESENTAÇÕES
 
-def calcula_pontos(g):
+def obtem_tamanho(g):
     '''
-    calcula_pontos: goban → tuple
+    obtem_tamanho: goban → int
 
-    Esta função ́e uma função auxiliar que recebe um goban e devolve o tuplo de dois
-    inteiros com as pontuações dos jogadores branco e preto, respetivamente.
+    Esta função devolve a dimensão do goban g, qualquer que seja a sua representação.
     '''
 
-    def obtem_adjacentes_cadeia(g, cadeia):
-        '''
-        obtem_adjacentes_cadeia: goban x cadeia → tuplo
-        
-        Esta função retorna um tuplo contendo todas as interseções adjacentes à cadeia.
-        '''
+    if isinstance(g, dict):
+        return g['n']
 
-        adjacentes = ()
+    return len(g)
+
+def obtem_colunas(g):
+    '''
+    obtem_colunas: goban → lista
 
-        for intersecao in cadeia:
-            intersecoes_adjacentes = obtem_intersecoes_adjacentes(intersecao, obtem_ultima_intersecao(g))
-            for adjacente in intersecoes_adjacentes:
-                if adjacente not in cadeia and adjacente not in adjacentes:
-                    adjacentes += (adjacente),
+    Esta função devolve a lista das colunas do goban g, qualquer que seja a sua representação.
+    Num goban em bits as colunas são construídas de novo.
+    '''
 
-        return adjacentes
+    if eh_goban_bits(g):
+        return _bits_para_colunas(g)
+    if isinstance(g, dict):
+        return g['colunas']
 
-    pontos_branco, pontos_preto = obtem_pedras_jogadores(g)
+    return g
 
-    territorios = obtem_territorios(g)
+# TABELAS DE INTERSEÇÕES
 
-    tamanho_goban = obtem_lin(obtem_ultima_intersecao(g))
+# Tabelas de interseções e adjacências, calculadas uma única vez por dimensão do goban
+_TABELAS = {}
 
-    # Caso o goban esteja vazio 
-    if g == cria_goban_vazio(tamanho_goban):
-        return (0, 0)
-    
+def _obtem_tabelas(n):
+    '''
+    _obtem_tabelas: int → dicionário
 
-    for territorio in territorios:
-        adjacentes_territorio = obtem_adjacentes_cadeia(g, territorio)
-        adjacentes_brancas = 0
-        adjacentes_pretas = 0
+    Esta função auxiliar devolve as tabelas de um goban nxn, calculadas na primeira utilização:
+    as interseções partilhadas de cada índice pela ordem de leitura ('intersecoes'), o índice de
+    cada interseção ('indices'), os índices adjacentes a cada índice ('vizinhos'), as interseções
+    adjacentes a cada índice ('adjacentes'), pela ordem de obtem_intersecoes_adjacentes, e os índices
+    das interseções na diagonal de cada índice ('diagonais').
+    '''
 
-        # Contagem da quantidade de adjacentes ao território da mesma cor
-        for adjacente in adjacentes_territorio:
-            if eh_pedra_branca(obtem_pedra(g, adjacente)):
-                adjacentes_brancas += 1
-            elif eh_pedra_preta(obtem_pedra(g, adjacente)):
-                adjacentes_pretas += 1
+    if not n in _TABELAS:
+        intersecoes = tuple(cria_intersecao(chr(ord("A") + k % n), k // n + 1) for k in range(n * n))
+        vizinhos = []
+        diagonais = []
+        for k in range(n * n):
+            col = k % n
+            lin = k // n
+            diagonais += [tuple((lin + dl) * n + col + dc for dl in (-1, 1) for dc in (-1, 1)
+                                if 0 <= lin + dl < n and 0 <= col + dc < n)]
+            adjacentes = ()
+            if lin > 0:
+                adjacentes += k - n, # Interseção abaixo
+            if col > 0:
+                adjacentes += k - 1, # Interseção à esquerda
+            if col < n - 1:
+                adjacentes += k + 1, # Interseção à direita
+            if lin < n - 1:
+                adjacentes += k + n, # Interseção acima
+            vizinhos += [adjacentes]
 
-        # Contabiliza os territórios pertencentes a cada jogador        
-        if adjacentes_brancas == len(adjacentes_territorio):
-            pontos_branco += len(territorio)
-        elif adjacentes_pretas == len(adjacentes_territorio):
-            pontos_preto += len(territorio)
+        _TABELAS[n] = {'intersecoes': intersecoes,
+                       'indices': {intersecoes[k]: k for k in range(n * n)},
+                       'vizinhos': vizinhos,
+                       'adjacentes': tuple(tuple(intersecoes[j] for j in vizinhos[k]) for k in range(n * n)),
+                       'diagonais': diagonais}
 
-    return (pontos_branco, pontos_preto)
+    return _TABELAS[n]
 
-def eh_jogada_legal(g, i, p, l):
+def indice_da_intersecao(i, n):
     '''
-    eh_jogada_legal: goban x intersecao x pedra x goban → booleano
+    indice_da_intersecao: intersecao x int → int
 
-    Esta função ́e uma função auxiliar que recebe um goban g, uma interseção
-    i, uma pedra de jogador p e um outro goban l e devolve True se a jogada for legal ou
-    False caso contrário, sem modificar g ou l.
+    Esta função devolve o índice da interseção i num goban nxn, pela ordem de leitura.
     '''
-    
-    # Verifica se a interseção i é válida e vazia
-    if not eh_intersecao_valida(g, i) or eh_pedra_jogador(obtem_pedra(g, i)):
-        return False
-    
-    # Faz uma cópia do goban e realiza um jogada nessa cópia
-    copia_goban = cria_copia_goban(g)
-    jogada(copia_goban, i, p)
 
-    # Verifica se a jogada cumpre a regra do suícidio e não repete o estado do goban
-    if not tem_liberdades(copia_goban, i) or gobans_iguais(copia_goban, l):
-        return False
+    return (obtem_lin(i) - 1) * n + ord(obtem_col(i)) - ord("A")
 
-    return True
+def intersecao_do_indice(k, n):
+    '''
+    intersecao_do_indice: int x int → intersecao
 
-def turno_jogador(g, p, l):
+    Esta função devolve a interseção (partilhada) correspondente ao índice k num goban nxn.
     '''
-    turno_jogador: goban x pedra x goban → booleano
 
-    Esta função é uma função auxiliar que oferece ao jogador que joga com pedras p
-    a opção de passar a jogada ou de colocar uma pedra própria numa interseção.
-    Se o jogador passar, a função devolve False sem modificar os argumentos.
-    Se o jogador fizer uma jogada ilegal, ele terá que repetir a jogada até ser legal.
-    Caso contrário, a função devolve True e modifica destrutivamente o tabuleiro g de acordo com a jogada realizada.
+    return _obtem_tabelas(n)['intersecoes'][k]
+
+def obtem_vizinhos(n):
     '''
-    
-    pedra = pedra_para_str(p)
+    obtem_vizinhos: int → lista
 
-    while True: # Caso o input não seja a representação externa de uma intercesão do goban ou "P", repete o input
-        jogada_realizada = input(f"Escreva uma intersecao ou 'P' para passar [{pedra}]:")
+    Esta função devolve a lista que associa a cada índice de um goban nxn o tuplo com os
+    índices das interseções adjacentes, pela mesma ordem de obtem_intersecoes_adjacentes.
+    '''
 
-        if jogada_realizada == 'P':
-            return False # O jogador passa a vez
-        else:
-            if str_intersecao_valida(jogada_realizada):
-                jogada_realizada = str_para_intersecao(jogada_realizada)
-                if eh_jogada_legal(g, jogada_realizada, p, l):
-                    jogada(g, jogada_realizada, p)
-                    return True # Se a jogada for legal, executa-a e passa a vez
+    return _obtem_tabelas(n)['vizinhos']
 
-def go(n, tb, tp):
+# GOBAN INCREMENTAL
+
+def eh_goban_incremental(arg):
     '''
-    go: int x tuple x tuple → booleano
+    eh_goban_incremental: universal → booleano
 
-    Esta função permite jogar um jogo completo do Go de dois jogadores.
-    A função recebe um inteiro correspondente à dimensão do tabuleiro, e dois
-    tuplos (potencialmente vazios) com a representação externa das interseções ocupadas
-    por pedras brancas (tb) e pretas (tp) inicialmente. A função devolve True se o jogador
-    com pedras brancas conseguir ganhar o jogo, ou False caso contrário.
+    Esta função devolve True caso o seu argumento seja um goban na representação incremental
+    e False caso contrário.
     '''
 
-    def fazer_jogada(goban, pedra, ultimo_goban):
-        '''
-        fazer_jogada: goban x pedra x goban → booleano
+    return isinstance(arg, dict) and arg.get('tipo') == 'incremental'
 
-        Esta função retorna True caso o jogador passe a jogada,
-        caso contrário executa a jogada no goban e retorna False.
-        '''
+def converte_goban(g, representacao):
+    '''
+    converte_goban: goban x str → goban
 
-        pontuacao = calcula_pontos(goban)
-        print(f'Branco (O) tem {pontuacao[0]} pontos')
-        print(f'Preto (X) tem {pontuacao[1]} pontos')
-        print(goban_para_str(goban))
+    Esta função devolve um novo goban com as mesmas pedras do goban g, na representação indicada.
+    '''
 
-        return not turno_jogador(goban, pedra, ultimo_goban) # Retorna se o jogador passou ou não
+    if not representacao in REPRESENTACOES:
+        raise ValueError("converte_goban: argumentos invalidos")
 
-    # Verifica a validade dos argumentos
-    if not n in (9, 13, 19) or not isinstance(n, int):
-        raise ValueError('go: argumentos invalidos')
+    # As colunas são sempre listas novas, mesmo que as de g sejam tuplos (num goban persistente)
+    colunas = [list(coluna) for coluna in obtem_colunas(g)]
 
-    if not isinstance(tb, tuple) or not isinstance(tp, tuple):
-        raise ValueError('go: argumentos invalidos')
+    if representacao == 'incremental':
+        return _cria_goban_incremental(colunas)
+    if representacao == 'bits':
+        return _cria_goban_bits(colunas)
 
-    # Transforma a representação externa em interseções se os argumentos forem válidos
-    tbranco = ()
-    tpreto = ()
-    for intercesao in tb:
-        if not str_intersecao_valida(intercesao) or not eh_intersecao_valida(cria_goban_vazio(n), str_para_intersecao(intercesao)) or str_para_intersecao(intercesao) in (tbranco, tpreto):
-            raise ValueError('go: argumentos invalidos')
-        tbranco += (str_para_intersecao(intercesao)),
-    for intercesao in tp:
-        if not str_intersecao_valida(intercesao) or not eh_intersecao_valida(cria_goban_vazio(n), str_para_intersecao(intercesao)) or str_para_intersecao(intercesao) in (tbranco, tpreto):
-            raise ValueError('go: argumentos invalidos')
-        tpreto += (str_para_intersecao(intercesao)),
-    
-    # Se os argumentos forem válidos cria o goban
-    goban = cria_goban(n,tbranco,tpreto)
+    return colunas
 
-    
-    # O jogo acaba quando estas duas variaveis valerem True
-    branco_passou = False
-    preto_passou = False
+def _cria_goban_incremental(colunas):
+    '''
+    _cria_goban_incremental: lista → goban
 
-    # As duas variáveis ultimo_goban verificam que não se repete o estado do goban
-    ultimo_goban_1 = cria_goban_vazio(n)
+    Esta função auxiliar devolve o goban incremental com as colunas dadas, calculando
+    as cadeias e as liberdades iniciais.
+    '''
 
-    # Enquanto não passarem os dois o jogo continua
-    while True:
-        # Jogada do preto
-        ultimo_goban_2 = cria_copia_goban(goban)
-        preto_passou = fazer_jogada(goban, cria_pedra_preta(), ultimo_goban_1)
-        if preto_passou and branco_passou:
-            break
+    n = len(colunas)
+    g = {'tipo': 'incremental', 'n': n, 'colunas': colunas, 'cadeia': [-1] * (n * n), 'pedras': {}, 'liberdades': {},
+         'hash': obtem_hash(colunas), 'contagem': list(obtem_pedras_jogadores(colunas)),
+         'territorio': [-1] * (n * n), 'regioes': {}, 'pontos_territorio': [0, 0], 'alteradas': set(range(n * n))}
 
-        # Jogada do branco
-        ultimo_goban_1 = cria_copia_goban(goban)
-        branco_passou = fazer_jogada(goban, cria_pedra_branca(), ultimo_goban_2)
-        if preto_passou and branco_passou:
-            break
-    
-    # Mostra o tabuleiro e a pontuação final
-    pontuacao = calcula_pontos(goban)
-    print(f'Branco (O) tem {pontuacao[0]} pontos')
-    print(f'Preto (X) tem {pontuacao[1]} pontos')
-    print(goban_para_str(goban))
+    return _reconstroi_cadeias(g, range(n * n))
 
-    return pontuacao[0] > pontuacao[1]
+def _copia_goban_incremental(g):
+    '''
+    _copia_goban_incremental: goban → goban
 
-#FUNÇÕES EXTRA
+    Esta função auxiliar devolve uma cópia independente do goban incremental g.
+    '''
 
-def tem_liberdades(g, i):
-        '''
-        tem_liberdades: goban x intersecao → bool
+    copia = dict(g)
+    copia['colunas'] = [coluna[:] for coluna in g['colunas']]
+    copia['cadeia'] = g['cadeia'][:]
+    copia['pedras'] = {representante: pedras[:] for representante, pedras in g['pedras'].items()}
+    copia['liberdades'] = {representante: set(livres) for representante, livres in g['liberdades'].items()}
+    copia['contagem'] = g['contagem'][:]
+    copia['territorio'] = g['territorio'][:]
+    copia['regioes'] = dict(g['regioes'])
+    copia['pontos_territorio'] = g['pontos_territorio'][:]
+    copia['alteradas'] = set(g['alteradas'])
 
-        Esta função auxiliar verifica se uma cadeia de pedras tem pelo menos uma liberdade.
-        '''
+    return copia
+
+def _reconstroi_cadeias(g, indices):
+    '''
+    _reconstroi_cadeias: goban x iterável → goban
+
+    Esta função auxiliar desfaz as cadeias que passam pelos índices dados e volta a calculá-las
+    (com as respetivas liberdades) a partir das pedras do goban, devolvendo o próprio goban.
+    É o caminho geral usado quando uma pedra é removida ou substituída.
+    '''
+
+    n = g['n']
+    colunas = g['colunas']
+    cadeia = g['cadeia']
+    pedras = g['pedras']
+    liberdades = g['liberdades']
+
+    # Desfaz as cadeias afetadas
+    por_calcular = []
+    for k in indices:
+        representante = cadeia[k]
+        if representante >= 0:
+            for pedra in pedras.pop(representante):
+                cadeia[pedra] = -1
+                por_calcular += [pedra]
+            del liberdades[representante]
+        elif eh_pedra_jogador(colunas[k % n][k // n]):
+            por_calcular += [k]
+
+    # Volta a calcular as cadeias com a pesquisa iterativa da rotulagem
+    for k in por_calcular:
+        if cadeia[k] >= 0 or not eh_pedra_jogador(colunas[k % n][k // n]):
+            continue
+        pedras[k], liberdades[k] = _preenche_componente(colunas, n, k, cadeia, k)
+
+    return g
+
+def _une_cadeias(g, r1, r2, diario=None):
+    '''
+    _une_cadeias: goban x int x int x lista → int
+
+    Esta função auxiliar junta as cadeias com representantes r1 e r2, mudando o representante
+    das pedras da cadeia mais pequena, e devolve o representante da cadeia resultante.
+    Se for dado um diário, acrescenta-lhe as alterações necessárias para desfazer a junção.
+    '''
+
+    pedras = g['pedras']
+    liberdades = g['liberdades']
+    cadeia = g['cadeia']
+
+    if len(pedras[r1]) < len(pedras[r2]):
+        r1, r2 = r2, r1
+
+    if diario is not None:
+        diario += [('pedras_tamanho', r1, len(pedras[r1])), ('pedras_remove', r2, pedras[r2]),
+                   ('liberdades_remove', r2, liberdades[r2])]
+        diario += [('liberdade_adiciona', r1, livre) for livre in liberdades[r2] - liberdades[r1]]
+        diario += [('cadeia', pedra, r2) for pedra in pedras[r2]]
+
+    for pedra in pedras[r2]:
+        cadeia[pedra] = r1
+    pedras[r1] += pedras.pop(r2)
+    liberdades[r1] |= liberdades.pop(r2)
+
+    return r1
+
+def _captura_cadeia(g, representante, diario=None):
+    '''
+    _captura_cadeia: goban x int x lista → lista
+
+    Esta função auxiliar remove do goban incremental a cadeia com o representante dado,
+    devolve os índices das pedras removidas às cadeias adjacentes como liberdades e
+    devolve a lista desses índices. Se for dado um diário, acrescenta-lhe as alterações
+    necessárias para repor a cadeia.
+    '''
+
+    n = g['n']
+    colunas = g['colunas']
+    cadeia = g['cadeia']
+    liberdades = g['liberdades']
+    vizinhos = obtem_vizinhos(n)
+
+    capturadas = g['pedras'].pop(representante)
+    livres = liberdades.pop(representante)
+
+    chaves = obtem_chaves_zobrist(n)
+    cor = colunas[capturadas[0] % n][capturadas[0] // n]
+    if diario is not None:
+        diario += [('pedras_remove', representante, capturadas), ('liberdades_remove', representante, livres)]
+        diario += [('ponto', pedra, cor) for pedra in capturadas]
+        diario += [('cadeia', pedra, representante) for pedra in capturadas]
+
+    for pedra in capturadas:
+        colunas[pedra % n][pedra // n] = cria_pedra_neutra()
+        _regista_alteracao(g, pedra, cor, cria_pedra_neutra())
+        cadeia[pedra] = -1
+        g['hash'] ^= chaves[pedra][cor]
+
+    for pedra in capturadas:
+        for adjacente in vizinhos[pedra]:
+            adjacente_representante = cadeia[adjacente]
+            if adjacente_representante >= 0 and not pedra in liberdades[adjacente_representante]:
+                liberdades[adjacente_representante].add(pedra)
+                if diario is not None:
+                    diario += [('liberdade_adiciona', adjacente_representante, pedra)]
+
+    return capturadas
+
+def _altera_ponto_incremental(g, k, p):
+    '''
+    _altera_ponto_incremental: goban x int x pedra → goban
+
+    Esta função auxiliar coloca a pedra p (possivelmente neutra) no índice k do goban incremental
+    sem capturas, recalculando as cadeias que passam por k e pelas interseções adjacentes.
+    '''
+
+    n = g['n']
+    chaves = obtem_chaves_zobrist(n)[k]
+    g['hash'] ^= chaves.get(g['colunas'][k % n][k // n], 0) ^ chaves.get(p, 0)
+    _regista_alteracao(g, k, g['colunas'][k % n][k // n], p)
+    g['colunas'][k % n][k // n] = p
+
+    return _reconstroi_cadeias(g, (k,) + obtem_vizinhos(n)[k])
+
+def joga_incremental(g, k, p, diario=None):
+    '''
+    joga_incremental: goban x int x pedra x lista → lista
+
+    Esta função coloca a pedra p no índice k do goban incremental, junta-a às cadeias
+    do mesmo jogador, captura as cadeias adversárias adjacentes que fiquem sem liberdades e
+    devolve a lista dos índices das pedras capturadas. Se for dado um diário, acrescenta-lhe
+    as alterações necessárias para desfazer a jogada (só numa interseção livre).
+    '''
+
+    n = g['n']
+    colunas = g['colunas']
+    cadeia = g['cadeia']
+    liberdades = g['liberdades']
+    vizinhos = obtem_vizinhos(n)[k]
+
+    if cadeia[k] >= 0 or not eh_pedra_jogador(p):
+        # Se a interseção estiver ocupada segue o caminho geral
+        _altera_ponto_incremental(g, k, p)
+    else:
+        colunas[k % n][k // n] = p
+        _regista_alteracao(g, k, cria_pedra_neutra(), p)
+        cadeia[k] = k
+        g['pedras'][k] = [k]
+        g['hash'] ^= obtem_chaves_zobrist(n)[k][p]
+        livres = set()
+        liberdades[k] = livres
+        if diario is not None:
+            diario += [('ponto', k, cria_pedra_neutra()), ('cadeia', k, -1), ('pedras_cria', k, None),
+                       ('liberdades_cria', k, None)]
+
+        # A pedra ocupa uma liberdade de cada cadeia adjacente
+        for adjacente in vizinhos:
+            representante = cadeia[adjacente]
+            if representante < 0:
+                livres.add(adjacente)
+            elif k in liberdades[representante]:
+                liberdades[representante].remove(k)
+                if diario is not None:
+                    diario += [('liberdade_remove', representante, k)]
+
+        # Junta a pedra às cadeias adjacentes do mesmo jogador
+        for adjacente in vizinhos:
+            representante = cadeia[adjacente]
+            if representante >= 0 and colunas[adjacente % n][adjacente // n] == p and not representante == cadeia[k]:
+                _une_cadeias(g, cadeia[k], representante, diario)
+
+    # Remove as cadeias adversárias sem liberdades
+    capturadas = []
+    for adjacente in vizinhos:
+        representante = cadeia[adjacente]
+        if representante >= 0 and not colunas[adjacente % n][adjacente // n] == p and not liberdades[representante]:
+            capturadas += _captura_cadeia(g, representante, diario)
+
+    return capturadas
+
+def avalia_jogada_incremental(g, k, p):
+    '''
+    avalia_jogada_incremental: goban x int x pedra → tuplo
+
+    Esta função analisa a jogada da pedra p no índice livre k de um goban incremental,
+    consultando apenas as liberdades das cadeias adjacentes. Devolve um tuplo com False se a jogada
+    for suicídio (True caso contrário) e a lista dos representantes das cadeias que captura.
+    '''
+
+    n = g['n']
+    colunas = g['colunas']
+    cadeia = g['cadeia']
+    liberdades = g['liberdades']
+
+    tem_liberdade = False
+    capturadas = []
+
+    for adjacente in obtem_vizinhos(n)[k]:
+        representante = cadeia[adjacente]
+        if representante < 0:
+            tem_liberdade = True
+        elif colunas[adjacente % n][adjacente // n] == p:
+            # Uma cadeia própria com outra liberdade dá essa liberdade à pedra
+            if len(liberdades[representante]) > 1:
+                tem_liberdade = True
+        elif len(liberdades[representante]) == 1 and not representante in capturadas:
+            # A cadeia adversária fica sem liberdades e é capturada
+            capturadas += [representante]
+
+    return (tem_liberdade or len(capturadas) > 0, capturadas)
+
+def hash_apos_jogada_incremental(g, k, p, capturadas):
+    '''
+    hash_apos_jogada_incremental: goban x int x pedra x lista → int
+
+    Esta função devolve o hash do goban incremental g depois da jogada da pedra p
+    no índice k, que captura as cadeias com os representantes dados, sem fazer a jogada.
+    '''
+
+    n = g['n']
+    colunas = g['colunas']
+    chaves = obtem_chaves_zobrist(n)
+    valor = g['hash'] ^ chaves[k][p]
+
+    for representante in capturadas:
+        for pedra in g['pedras'][representante]:
+            valor ^= chaves[pedra][colunas[pedra % n][pedra // n]]
+
+    return valor
+
+def _regista_alteracao(g, k, antiga, nova):
+    '''
+    _regista_alteracao: goban x int x pedra x pedra → goban
+
+    Esta função auxiliar atualiza a contagem de pedras do goban incremental g quando a pedra
+    no índice k passa de antiga a nova, marca o índice para a próxima pontuação e devolve o próprio goban.
+    '''
+
+    contagem = g['contagem']
+
+    if eh_pedra_branca(antiga):
+        contagem[0] -= 1
+    elif eh_pedra_preta(antiga):
+        contagem[1] -= 1
+
+    if eh_pedra_branca(nova):
+        contagem[0] += 1
+    elif eh_pedra_preta(nova):
+        contagem[1] += 1
+
+    g['alteradas'].add(k)
+
+    return g
+
+def _atualiza_territorios(g):
+    '''
+    _atualiza_territorios: goban → goban
+
+    Esta função auxiliar volta a calcular, no goban incremental g, apenas as regiões livres que contêm
+    ou tocam índices alterados desde a última pontuação, e os respetivos donos, devolvendo o próprio goban.
+    '''
+
+    alteradas = g['alteradas']
+    if not alteradas:
+        return g
+
+    n = g['n']
+    colunas = g['colunas']
+    territorio = g['territorio']
+    regioes = g['regioes']
+    pontos_territorio = g['pontos_territorio']
+    vizinhos = obtem_vizinhos(n)
+
+    # Regiões que contêm ou tocam um índice alterado
+    afetadas = set()
+    for k in alteradas:
+        for j in (k,) + vizinhos[k]:
+            if territorio[j] >= 0:
+                afetadas.add(territorio[j])
+
+    # Desfaz as regiões afetadas e retira os seus pontos
+    por_calcular = list(alteradas)
+    for regiao in afetadas:
+        membros, dono = regioes.pop(regiao)
+        if eh_pedra_branca(dono):
+            pontos_territorio[0] -= len(membros)
+        elif eh_pedra_preta(dono):
+            pontos_territorio[1] -= len(membros)
+        for membro in membros:
+            territorio[membro] = -1
+        por_calcular += membros
+
+    # Volta a calcular as regiões livres e os seus donos
+    for k in por_calcular:
+        if territorio[k] >= 0 or eh_pedra_jogador(colunas[k % n][k // n]):
+            continue
+        membros, fronteira = _preenche_componente(colunas, n, k, territorio, k)
+        cores = {colunas[adjacente % n][adjacente // n] for adjacente in fronteira}
+        dono = cria_pedra_neutra()
+        if len(cores) == 1:
+            dono = cores.pop()
+        if eh_pedra_branca(dono):
+            pontos_territorio[0] += len(membros)
+        elif eh_pedra_preta(dono):
+            pontos_territorio[1] += len(membros)
+        regioes[k] = (membros, dono)
+
+    alteradas.clear()
+
+    return g
+
+def _calcula_pontos_incremental(g):
+    '''
+    _calcula_pontos_incremental: goban → tuplo
+
+    Esta função auxiliar devolve as pontuações dos jogadores branco e preto do goban incremental g,
+    pontuando de novo apenas as regiões tocadas desde a última pontuação.
+    '''
+
+    _atualiza_territorios(g)
+
+    return (g['contagem'][0] + g['pontos_territorio'][0], g['contagem'][1] + g['pontos_territorio'][1])
+
+def _repete_goban_anterior(g, i, p, l):
+    '''
+    _repete_goban_anterior: goban x intersecao x pedra x goban → booleano
+
+    Esta função auxiliar devolve True se a jogada da pedra p na interseção livre i do goban g,
+    que não é suicídio, resultar num goban igual ao goban l, da mesma dimensão de g.
+    '''
+
+    # O goban resultante só pode ser igual a l se l tiver a pedra p na interseção i
+    if not obtem_pedra(l, i) == p:
+        return False
+
+    # Caso raro: compara o goban resultante com l, desfazendo depois a jogada
+    registo = faz_jogada(g, i, p)
+    igual = not l is g and gobans_iguais_sem_verificacao(g, l)
+    desfaz_jogada(g, registo)
+
+    return igual
+
+def _eh_jogada_legal_incremental(g, i, p, l):
+    '''
+    _eh_jogada_legal_incremental: goban x intersecao x pedra x (goban ou historico) → booleano
+
+    Esta função auxiliar verifica a legalidade da jogada da pedra p na interseção livre i
+    de um goban incremental, consultando apenas as liberdades das cadeias adjacentes.
+    '''
+
+    k = indice_da_intersecao(i, g['n'])
+    tem_liberdade, capturadas = avalia_jogada_incremental(g, k, p)
+
+    # Regra do suicídio
+    if not tem_liberdade:
+        return False
+
+    # Com um histórico, a repetição é verificada pelo hash do goban resultante
+    if eh_historico(l):
+        return not eh_posicao_proibida(l, hash_apos_jogada_incremental(g, k, p, capturadas))
+
+    return not _repete_goban_anterior(g, i, p, l)
+
+# ROTULAGEM DE COMPONENTES
+
+'''
+O TAD rotulagem guarda as componentes ligadas de um goban, calculadas numa única passagem iterativa:
+as cadeias de pedras de cada jogador e os territórios (regiões de interseções livres).
+
+-Cada rotulagem é representada por um dicionário com a dimensão do goban ('n'), o número da componente
+de cada índice ('rotulos'), a lista ordenada dos índices de cada componente ('componentes'), a pedra de
+cada componente ('pedras') e o conjunto dos índices adjacentes diferentes de cada componente ('fronteiras'):
+as liberdades de uma cadeia ou as pedras que rodeiam um território.
+As componentes estão numeradas pela ordem de leitura da sua primeira interseção.
+'''
+
+def _preenche_componente(colunas, n, k, rotulos, rotulo):
+    '''
+    _preenche_componente: lista x int x int x lista x int → tuplo
+
+    Esta função auxiliar marca com o rótulo dado, na lista rotulos (onde -1 indica um índice por marcar),
+    os índices da componente que contém o índice k, através de uma pesquisa iterativa. Devolve um tuplo
+    com a lista ordenada dos índices da componente e o conjunto dos seus índices adjacentes diferentes.
+    '''
+
+    vizinhos = obtem_vizinhos(n)
+    pedra = colunas[k % n][k // n]
+    jogador = eh_pedra_jogador(pedra)
+
+    rotulos[k] = rotulo
+    membros = [k]
+    fronteira = set()
+
+    for membro in membros:
+        for adjacente in vizinhos[membro]:
+            pedra_adjacente = colunas[adjacente % n][adjacente // n]
+            if pedra_adjacente == pedra:
+                if rotulos[adjacente] < 0:
+                    rotulos[adjacente] = rotulo
+                    membros += [adjacente]
+            elif not jogador or not eh_pedra_jogador(pedra_adjacente):
+                # Liberdades de uma cadeia ou pedras que rodeiam um território
+                fronteira.add(adjacente)
+
+    membros.sort()
+
+    return (membros, fronteira)
+
+def rotula_goban(g):
+    '''
+    rotula_goban: goban → rotulagem
+
+    Esta função devolve a rotulagem de todas as cadeias e territórios do goban g,
+    calculada numa única passagem pelo goban.
+    '''
+
+    n = obtem_tamanho(g)
+    colunas = obtem_colunas(g)
+    rotulos = [-1] * (n * n)
+    componentes = []
+    pedras = []
+    fronteiras = []
+
+    for k in range(n * n):
+        if rotulos[k] < 0:
+            membros, fronteira = _preenche_componente(colunas, n, k, rotulos, len(componentes))
+            componentes += [membros]
+            pedras += [colunas[k % n][k // n]]
+            fronteiras += [fronteira]
+
+    return {'n': n, 'rotulos': rotulos, 'componentes': componentes, 'pedras': pedras, 'fronteiras': fronteiras}
+
+# GOBAN EM BITS
+
+# Máscaras de cada dimensão do goban: todas as interseções, sem a primeira coluna e sem a última coluna
+_MASCARAS = {}
+
+def eh_goban_bits(arg):
+    '''
+    eh_goban_bits: universal → booleano
+
+    Esta função devolve True caso o seu argumento seja um goban na representação em bits
+    e False caso contrário.
+    '''
+
+    return isinstance(arg, dict) and arg.get('tipo') == 'bits'
+
+def _obtem_mascaras(n):
+    '''
+    _obtem_mascaras: int → tuplo
+
+    Esta função auxiliar devolve o tuplo com as máscaras de um goban nxn: todas as interseções,
+    todas menos as da primeira coluna e todas menos as da última coluna.
+    '''
+
+    if not n in _MASCARAS:
+        total = (1 << n * n) - 1
+        primeira_coluna = 0
+        for lin in range(n):
+            primeira_coluna |= 1 << lin * n
+        _MASCARAS[n] = (total, total & ~primeira_coluna, total & ~(primeira_coluna << n - 1))
+
+    return _MASCARAS[n]
+
+def _expande_bits(b, n):
+    '''
+    _expande_bits: int x int → int
+
+    Esta função auxiliar devolve o conjunto de bits das interseções adjacentes a alguma
+    interseção do conjunto de bits b num goban nxn.
+    '''
+
+    total, sem_primeira, sem_ultima = _obtem_mascaras(n)
+
+    return ((b & sem_ultima) << 1 | (b & sem_primeira) >> 1 | b << n | b >> n) & total
+
+def _preenche_bits(semente, dentro, n):
+    '''
+    _preenche_bits: int x int x int → int
+
+    Esta função auxiliar devolve o conjunto de bits das interseções de dentro ligadas às
+    interseções da semente, expandindo a região com deslocamentos até deixar de crescer.
+    '''
+
+    regiao = semente & dentro
+
+    while True:
+        nova_regiao = (regiao | _expande_bits(regiao, n)) & dentro
+        if nova_regiao == regiao:
+            return regiao
+        regiao = nova_regiao
+
+def indices_dos_bits(b):
+    '''
+    indices_dos_bits: int → lista
+
+    Esta função devolve a lista crescente (pela ordem de leitura) dos índices
+    dos bits a 1 de b.
+    '''
+
+    indices = []
+
+    while b:
+        menor = b & -b
+        indices += [menor.bit_length() - 1]
+        b ^= menor
+
+    return indices
+
+def _bits_para_intersecoes(b, n):
+    '''
+    _bits_para_intersecoes: int x int → tuplo
+
+    Esta função auxiliar devolve o tuplo, em ordem de leitura, das interseções do conjunto de bits b.
+    '''
+
+    return tuple(intersecao_do_indice(k, n) for k in indices_dos_bits(b))
+
+def _intersecoes_para_bits(t, n):
+    '''
+    _intersecoes_para_bits: tuplo x int → int
+
+    Esta função auxiliar devolve o conjunto de bits das interseções do tuplo t.
+    '''
+
+    b = 0
+    for intersecao in t:
+        b |= 1 << indice_da_intersecao(intersecao, n)
+
+    return b
+
+def _hash_dos_bits(b, n, p):
+    '''
+    _hash_dos_bits: int x int x pedra → int
+
+    Esta função auxiliar devolve a combinação das chaves de Zobrist da pedra p nas
+    interseções do conjunto de bits b.
+    '''
+
+    chaves = obtem_chaves_zobrist(n)
+    valor = 0
+    for k in indices_dos_bits(b):
+        valor ^= chaves[k][p]
+
+    return valor
+
+def _cria_goban_bits(colunas):
+    '''
+    _cria_goban_bits: lista → goban
+
+    Esta função auxiliar devolve o goban em bits com as pedras das colunas dadas.
+    '''
+
+    n = len(colunas)
+    brancas = 0
+    pretas = 0
+
+    for k in range(n * n):
+        if eh_pedra_branca(colunas[k % n][k // n]):
+            brancas |= 1 << k
+        elif eh_pedra_preta(colunas[k % n][k // n]):
+            pretas |= 1 << k
+
+    return {'tipo': 'bits', 'n': n, 'brancas': brancas, 'pretas': pretas,
+            'vazias': _obtem_mascaras(n)[0] & ~(brancas | pretas), 'hash': obtem_hash(colunas)}
+
+def _bits_para_colunas(g):
+    '''
+    _bits_para_colunas: goban → lista
+
+    Esta função auxiliar devolve uma nova lista de colunas com as pedras do goban em bits g.
+    '''
+
+    n = g['n']
+    colunas = cria_goban_vazio(n)
+
+    for k in indices_dos_bits(g['brancas']):
+        colunas[k % n][k // n] = cria_pedra_branca()
+    for k in indices_dos_bits(g['pretas']):
+        colunas[k % n][k // n] = cria_pedra_preta()
+
+    return colunas
+
+def _pedra_bits(g, k):
+    '''
+    _pedra_bits: goban x int → pedra
+
+    Esta função auxiliar devolve a pedra no índice k do goban em bits g.
+    '''
+
+    if g['brancas'] >> k & 1:
+        return cria_pedra_branca()
+    if g['pretas'] >> k & 1:
+        return cria_pedra_preta()
+
+    return cria_pedra_neutra()
+
+def _bits_da_pedra(g, p):
+    '''
+    _bits_da_pedra: goban x pedra → int
+
+    Esta função auxiliar devolve o conjunto de bits das interseções do goban em bits g
+    ocupadas pela pedra p (as interseções livres se p for neutra).
+    '''
+
+    if eh_pedra_branca(p):
+        return g['brancas']
+    if eh_pedra_preta(p):
+        return g['pretas']
+
+    return g['vazias']
+
+def _altera_ponto_bits(g, k, p):
+    '''
+    _altera_ponto_bits: goban x int x pedra → goban
+
+    Esta função auxiliar coloca a pedra p (possivelmente neutra) no índice k do goban em bits g,
+    sem capturas, e devolve o próprio goban.
+    '''
+
+    bit = 1 << k
+    chaves = obtem_chaves_zobrist(g['n'])[k]
+    g['hash'] ^= chaves.get(_pedra_bits(g, k), 0) ^ chaves.get(p, 0)
+
+    g['brancas'] &= ~bit
+    g['pretas'] &= ~bit
+    g['vazias'] |= bit
+
+    if eh_pedra_branca(p):
+        g['brancas'] |= bit
+        g['vazias'] &= ~bit
+    elif eh_pedra_preta(p):
+        g['pretas'] |= bit
+        g['vazias'] &= ~bit
+
+    return g
+
+def _capturas_bits(bit, adversarias, vazias, n):
+    '''
+    _capturas_bits: int x int x int x int → int
+
+    Esta função auxiliar devolve o conjunto de bits das cadeias adversárias adjacentes ao bit
+    dado que não têm nenhuma liberdade no conjunto de interseções livres vazias.
+    '''
+
+    capturadas = 0
+    vizinhas = _expande_bits(bit, n) & adversarias
+
+    while vizinhas:
+        cadeia = _preenche_bits(vizinhas & -vizinhas, adversarias, n)
+        if not _expande_bits(cadeia, n) & vazias:
+            capturadas |= cadeia
+        vizinhas &= ~cadeia
+
+    return capturadas
+
+def _joga_bits(g, k, p):
+    '''
+    _joga_bits: goban x int x pedra → int
+
+    Esta função auxiliar coloca a pedra p no índice k do goban em bits g, remove as cadeias
+    adversárias adjacentes sem liberdades e devolve o conjunto de bits das pedras capturadas.
+    '''
+
+    n = g['n']
+    _altera_ponto_bits(g, k, p)
+
+    cor_adversaria = obtem_pedra_adversaria(p)
+    chave_adversaria = 'pretas' if eh_pedra_branca(p) else 'brancas'
+
+    capturadas = _capturas_bits(1 << k, g[chave_adversaria], g['vazias'], n)
+
+    if capturadas:
+        g[chave_adversaria] &= ~capturadas
+        g['vazias'] |= capturadas
+        g['hash'] ^= _hash_dos_bits(capturadas, n, cor_adversaria)
+
+    return capturadas
+
+def _eh_jogada_legal_bits(g, i, p, l):
+    '''
+    _eh_jogada_legal_bits: goban x intersecao x pedra x (goban ou historico) → booleano
+
+    Esta função auxiliar verifica a legalidade da jogada da pedra p na interseção livre i
+    de um goban em bits, calculando o goban resultante apenas com operações sobre bits.
+    '''
+
+    n = g['n']
+    k = indice_da_intersecao(i, n)
+    bit = 1 << k
+
+    proprias = _bits_da_pedra(g, p) | bit
+    cor_adversaria = obtem_pedra_adversaria(p)
+    adversarias = _bits_da_pedra(g, cor_adversaria)
+
+    vazias = g['vazias'] & ~bit
+    capturadas = _capturas_bits(bit, adversarias, vazias, n)
+    vazias |= capturadas
+
+    # Regra do suicídio
+    if not _expande_bits(_preenche_bits(bit, proprias, n), n) & vazias:
+        return False
+
+    # Com um histórico, a repetição é verificada pelo hash do goban resultante
+    if eh_historico(l):
+        valor = g['hash'] ^ obtem_chaves_zobrist(n)[k][p] ^ _hash_dos_bits(capturadas, n, cor_adversaria)
+        return not eh_posicao_proibida(l, valor)
+
+    return not _repete_goban_anterior(g, i, p, l)
+
+def _calcula_pontos_bits(g):
+    '''
+    _calcula_pontos_bits: goban → tuplo
+
+    Esta função auxiliar devolve as pontuações dos jogadores branco e preto do goban em bits g.
+    Cada território livre conta para um jogador se todas as pedras que o rodeiam forem desse jogador.
+    '''
+
+    n = g['n']
+    brancas = g['brancas']
+    pretas = g['pretas']
+    pontos_branco = brancas.bit_count()
+    pontos_preto = pretas.bit_count()
+
+    # Caso o goban esteja vazio
+    if not brancas | pretas:
+        return (0, 0)
+
+    livres = g['vazias']
+    while livres:
+        territorio = _preenche_bits(livres & -livres, g['vazias'], n)
+        fronteira = _expande_bits(territorio, n)
+        if not fronteira & pretas:
+            pontos_branco += territorio.bit_count()
+        elif not fronteira & brancas:
+            pontos_preto += territorio.bit_count()
+        livres &= ~territorio
+
+    return (pontos_branco, pontos_preto)
+
+def _obtem_territorios_bits(g):
+    '''
+    _obtem_territorios_bits: goban → tuplo
+
+    Esta função auxiliar devolve os territórios do goban em bits g, com a mesma ordem de obtem_territorios.
+    '''
+
+    n = g['n']
+    territorios = ()
+    livres = g['vazias']
+
+    # Cada território começa no menor índice livre ainda não visitado, pela ordem de leitura
+    while livres:
+        territorio = _preenche_bits(livres & -livres, g['vazias'], n)
+        territorios += (_bits_para_intersecoes(territorio, n)),
+        livres &= ~territorio
+
+    return territorios
+
+def _obtem_adjacentes_diferentes_bits(g, t):
+    '''
+    _obtem_adjacentes_diferentes_bits: goban x tuplo → tuplo
+
+    Esta função auxiliar devolve o resultado de obtem_adjacentes_diferentes para o goban em bits g.
+    '''
+
+    n = g['n']
+    conjunto = _intersecoes_para_bits(t, n)
+    ocupadas = g['brancas'] | g['pretas']
+
+    # As pedras de t fazem fronteira com as livres e as livres de t com as pedras
+    diferentes = _expande_bits(conjunto & ocupadas, n) & g['vazias'] | _expande_bits(conjunto & g['vazias'], n) & ocupadas
+
+    return _bits_para_intersecoes(diferentes, n)
+
+# HASH DE ZOBRIST E HISTÓRICO DE POSIÇÕES
+
+# Chaves de Zobrist de cada índice, calculadas uma única vez por dimensão do goban
+_ZOBRIST = {}
+
+def obtem_chaves_zobrist(n):
+    '''
+    obtem_chaves_zobrist: int → lista
+
+    Esta função devolve a lista que associa a cada índice de um goban nxn um dicionário
+    com as chaves de Zobrist (inteiros de 64 bits) das pedras branca e preta nesse índice.
+    As chaves são geradas com uma semente fixa, pelo que são iguais em todas as execuções.
+    '''
+
+    if not n in _ZOBRIST:
+        gerador = random.Random(n)
+        _ZOBRIST[n] = [{cria_pedra_branca(): gerador.getrandbits(64), cria_pedra_preta(): gerador.getrandbits(64)}
+                       for k in range(n * n)]
+
+    return _ZOBRIST[n]
+
+def obtem_hash(g):
+    '''
+    obtem_hash: goban → int
+
+    Esta função devolve o hash de Zobrist do goban g. Num goban incremental, em bits ou persistente
+    o hash é mantido a cada jogada; num goban de listas é calculado percorrendo o goban.
+    '''
+
+    if eh_goban_incremental(g) or eh_goban_bits(g) or eh_goban_persistente(g):
+        return g['hash']
+
+    n = obtem_tamanho(g)
+    colunas = obtem_colunas(g)
+    chaves = obtem_chaves_zobrist(n)
+    valor = 0
+
+    for k in range(n * n):
+        pedra = colunas[k % n][k // n]
+        if eh_pedra_jogador(pedra):
+            valor ^= chaves[k][pedra]
+
+    return valor
+
+'''
+O TAD historico é usado para guardar as posições do goban que já ocorreram num jogo
+e decidir se uma jogada repete uma posição proibida.
+
+-Cada histórico é representado por um dicionário com a sequência dos hashes das posições ('sequencia'),
+o número de vezes que cada hash ocorreu ('vistas') e a regra de repetição usada ('superko').
+Sem superko, uma jogada não pode repetir a posição anterior à última jogada do adversário;
+com superko, não pode repetir nenhuma posição do histórico.
+'''
+
+def cria_historico(superko=False):
+    '''
+    cria_historico: booleano → historico
+
+    Esta função devolve um histórico vazio que usa a regra de superko se superko for True.
+    '''
+
+    return {'sequencia': [], 'vistas': {}, 'superko': superko}
+
+def eh_historico(arg):
+    '''
+    eh_historico: universal → booleano
+
+    Esta função devolve True caso o seu argumento seja um TAD historico e False caso contrário.
+    '''
+
+    return isinstance(arg, dict) and 'sequencia' in arg and 'vistas' in arg and 'superko' in arg
+
+def regista_goban(h, g):
+    '''
+    regista_goban: historico x goban → historico
+
+    Esta função modifica destrutivamente o histórico h acrescentando-lhe a posição do goban g,
+    e devolve o próprio histórico.
+    '''
+
+    valor = obtem_hash(g)
+    h['sequencia'] += [valor]
+    h['vistas'][valor] = h['vistas'].get(valor, 0) + 1
+
+    return h
+
+def remove_ultima_posicao(h):
+    '''
+    remove_ultima_posicao: historico → historico
+
+    Esta função modifica destrutivamente o histórico h removendo-lhe a última posição registada,
+    e devolve o próprio histórico.
+    '''
+
+    valor = h['sequencia'].pop()
+    h['vistas'][valor] -= 1
+    if h['vistas'][valor] == 0:
+        del h['vistas'][valor]
+
+    return h
+
+def eh_posicao_proibida(h, valor):
+    '''
+    eh_posicao_proibida: historico x int → booleano
+
+    Esta função devolve True se uma jogada que produza a posição com o hash valor
+    repetir uma posição proibida pelo histórico h e False caso contrário.
+    '''
+
+    if h['superko']:
+        return valor in h['vistas']
+
+    return len(h['sequencia']) >= 2 and h['sequencia'][-2] == valor
+
+def copia_historico(l, g=None, superko=None):
+    '''
+    copia_historico: (goban ou historico) x goban x booleano → historico
+
+    Esta função devolve um novo histórico, sem modificar l, com as posições do histórico l ou com o goban
+    anterior l (nenhuma se l for None), seguidas da posição do goban g, se for dado e não for já a última.
+    O histórico usa a regra de superko se superko for True, ou a de l se superko for None. Sem superko,
+    só as duas últimas posições decidem a legalidade das jogadas, pelo que só essas são copiadas.
+    '''
+
+    if superko is None:
+        superko = eh_historico(l) and l['superko']
+
+    h = cria_historico(superko)
+    if eh_historico(l):
+        if superko:
+            h['sequencia'] = l['sequencia'][:]
+            h['vistas'] = dict(l['vistas'])
+        else:
+            for valor in l['sequencia'][-2:]:
+                h['sequencia'] += [valor]
+                h['vistas'][valor] = h['vistas'].get(valor, 0) + 1
+    elif not l is None:
+        regista_goban(h, l)
+
+    if not g is None and (not h['sequencia'] or not h['sequencia'][-1] == obtem_hash(g)):
+        regista_goban(h, g)
+
+    return h
+
+# JOGADAS REVERSÍVEIS
+
+'''
+O TAD registo é usado para guardar o necessário para desfazer uma jogada feita com faz_jogada,
+repondo exatamente o goban e o histórico anteriores sem copiar o goban.
+
+-Cada registo é representado por um dicionário com a interseção e a pedra jogadas ('intersecao', 'pedra'),
+a dimensão do goban ('n'), os índices das pedras capturadas ('capturadas'), o histórico onde a posição foi registada ('historico')
+e o estado anterior da representação do goban: a pedra anterior da interseção num goban de listas,
+os conjuntos de bits e o hash anteriores num goban em bits ('anterior'), ou o diário das alterações
+das cadeias e o hash anterior num goban incremental ('diario', 'hash').
+'''
+
+def faz_jogada(g, i, p, h=None):
+    '''
+    faz_jogada: goban x intersecao x pedra x historico → registo
+
+    Esta função modifica destrutivamente o goban g tal como a função jogada e devolve o registo
+    que permite desfazer a jogada. Se for dado um histórico h, a nova posição é registada em h.
+    '''
+
+    n = obtem_tamanho(g)
+    k = indice_da_intersecao(i, n)
+    registo = {'n': n, 'intersecao': i, 'pedra': p, 'historico': h}
+
+    if eh_goban_bits(g):
+        registo['anterior'] = (g['brancas'], g['pretas'], g['vazias'], g['hash'])
+        registo['capturadas'] = indices_dos_bits(_joga_bits(g, k, p))
+    elif eh_goban_incremental(g):
+        registo['hash'] = g['hash']
+        if g['cadeia'][k] >= 0 or not eh_pedra_jogador(p):
+            # Numa interseção ocupada guarda-se uma cópia do goban
+            registo['anterior'] = _copia_goban_incremental(g)
+            registo['capturadas'] = joga_incremental(g, k, p)
+        else:
+            registo['diario'] = []
+            registo['capturadas'] = joga_incremental(g, k, p, registo['diario'])
+    else:
+        registo['anterior'] = obtem_pedra(g, i)
+        registo['capturadas'] = _joga_listas(g, i, p)
+
+    if h is not None:
+        regista_goban(h, g)
+
+    return registo
+
+def obtem_capturadas(r):
+    '''
+    obtem_capturadas: registo → tuplo
+
+    Esta função devolve o tuplo, em ordem de leitura, das interseções das pedras capturadas
+    pela jogada do registo r.
+    '''
+
+    return tuple(intersecao_do_indice(k, r['n']) for k in sorted(r['capturadas']))
+
+def desfaz_jogada(g, r):
+    '''
+    desfaz_jogada: goban x registo → goban
+
+    Esta função modifica destrutivamente o goban g desfazendo a jogada do registo r (que tem de ser
+    a última jogada feita em g), repõe o histórico usado pela jogada e devolve o próprio goban.
+    '''
+
+    if r['historico'] is not None:
+        remove_ultima_posicao(r['historico'])
+
+    if eh_goban_bits(g):
+        g['brancas'], g['pretas'], g['vazias'], g['hash'] = r['anterior']
+    elif eh_goban_incremental(g):
+        if 'diario' in r:
+            _desfaz_diario(g, r['diario'])
+            g['hash'] = r['hash']
+        else:
+            g.update(r['anterior'])
+    else:
+        n = len(g)
+        if eh_pedra_branca(r['pedra']):
+            cor_capturadas = cria_pedra_preta()
+        else:
+            cor_capturadas = cria_pedra_branca()
+        for k in r['capturadas']:
+            g[k % n][k // n] = cor_capturadas
+        coloca_pedra(g, r['intersecao'], r['anterior'])
+
+    return g
+
+def _desfaz_diario(g, diario):
+    '''
+    _desfaz_diario: goban x lista → goban
+
+    Esta função auxiliar desfaz, pela ordem inversa, as alterações do diário de um goban incremental.
+    '''
+
+    n = g['n']
+    colunas = g['colunas']
+    cadeia = g['cadeia']
+    pedras = g['pedras']
+    liberdades = g['liberdades']
+
+    for alteracao, chave, valor in reversed(diario):
+        if alteracao == 'ponto':
+            _regista_alteracao(g, chave, colunas[chave % n][chave // n], valor)
+            colunas[chave % n][chave // n] = valor
+        elif alteracao == 'cadeia':
+            cadeia[chave] = valor
+        elif alteracao == 'liberdade_adiciona':
+            liberdades[chave].discard(valor)
+        elif alteracao == 'liberdade_remove':
+            liberdades[chave].add(valor)
+        elif alteracao == 'pedras_tamanho':
+            del pedras[chave][valor:]
+        elif alteracao == 'pedras_remove':
+            pedras[chave] = valor
+        elif alteracao == 'liberdades_remove':
+            liberdades[chave] = valor
+        elif alteracao == 'pedras_cria':
+            del pedras[chave]
+        elif alteracao == 'liberdades_cria':
+            del liberdades[chave]
+
+    return g
+
+# GERAÇÃO DE JOGADAS LEGAIS
+
+def mascara_jogadas_legais(g, p, l):
+    '''
+    mascara_jogadas_legais: goban x pedra x (goban ou historico) → int
+
+    Esta função devolve o inteiro cujos bits a 1 (pelo índice de cada interseção em ordem de leitura)
+    correspondem às interseções onde a jogada da pedra p é legal, de acordo com eh_jogada_legal.
+    As cadeias e liberdades do goban são analisadas uma única vez; só as jogadas que possam repetir
+    o goban l são verificadas fazendo e desfazendo a jogada.
+    '''
+
+    n = obtem_tamanho(g)
+
+    # Os gobans que não são incrementais são analisados uma única vez
+    if not eh_goban_incremental(g):
+        g = converte_goban(g, 'incremental')
+
+    cadeia = g['cadeia']
+    historico = eh_historico(l)
+
+    # Sem histórico, o goban resultante só pode ser igual a l onde l tiver a pedra p
+    candidatas = set()
+    if not historico and eh_goban(l) and obtem_tamanho(l) == n:
+        candidatas = {k for k in range(n * n) if obtem_pedra(l, intersecao_do_indice(k, n)) == p}
+
+    mascara = 0
+    for k in range(n * n):
+        if cadeia[k] >= 0:
+            continue
+
+        tem_liberdade, capturadas = avalia_jogada_incremental(g, k, p)
+        if not tem_liberdade:
+            continue
+
+        if historico:
+            if eh_posicao_proibida(l, hash_apos_jogada_incremental(g, k, p, capturadas)):
+                continue
+        elif k in candidatas and _repete_goban_anterior(g, intersecao_do_indice(k, n), p, l):
+            continue
+
+        mascara |= 1 << k
+
+    return mascara
+
+def jogadas_legais(g, p, l):
+    '''
+    jogadas_legais: goban x pedra x (goban ou historico) → tuplo
+
+    Esta função devolve o tuplo, em ordem de leitura, das interseções onde a jogada da pedra p
+    é legal, de acordo com eh_jogada_legal.
+    '''
+
+    return _bits_para_intersecoes(mascara_jogadas_legais(g, p, l), obtem_tamanho(g))
+
+# SIMULAÇÕES ALEATÓRIAS
+
+def cria_gerador(semente, fluxo=0):
+    '''
+    cria_gerador: int x int → gerador
+
+    Esta função devolve um gerador de números aleatórios reprodutível para a semente dada.
+    Fluxos diferentes da mesma semente dão sequências independentes, por exemplo uma por processo.
+    '''
+
+    return random.Random(f'{semente}:{fluxo}')
+
+def eh_olho(g, k, p):
+    '''
+    eh_olho: goban x int x pedra → booleano
+
+    Esta função devolve True se o índice livre k de um goban incremental for um olho do
+    jogador com pedras p: todas as interseções adjacentes são pedras de p e as diagonais têm no máximo
+    uma pedra adversária (nenhuma se k estiver na margem do goban).
+    '''
+
+    n = g['n']
+    colunas = g['colunas']
+
+    vizinhos = obtem_vizinhos(n)[k]
+    for adjacente in vizinhos:
+        if not colunas[adjacente % n][adjacente // n] == p:
+            return False
+
+    adversarias = 0
+    for diagonal in _obtem_tabelas(n)['diagonais'][k]:
+        pedra = colunas[diagonal % n][diagonal // n]
+        if eh_pedra_jogador(pedra) and not pedra == p:
+            adversarias += 1
+
+    return adversarias < (2 if len(vizinhos) == 4 else 1)
+
+def simula_partida(g, p, l, gerador, max_jogadas=None):
+    '''
+    simula_partida: goban x pedra x (goban ou historico) x gerador x int → tuplo
+
+    Esta função joga, a partir de uma cópia do goban g, uma partida aleatória até os dois jogadores
+    passarem (ou até max_jogadas jogadas, 3 * n * n por omissão), começando o jogador com pedras p,
+    e devolve a pontuação final (branco, preto). l é o goban anterior ou o histórico da partida.
+    Cada jogador escolhe ao acaso, com o gerador dado, uma jogada legal que não preencha um olho
+    próprio, e passa se não houver nenhuma. As interseções livres são guardadas numa lista e as
+    capturas são feitas de forma incremental, sem modificar g nem l.
+    '''
+
+    n = obtem_tamanho(g)
+    if max_jogadas is None:
+        max_jogadas = 3 * n * n
+
+    # A simulação é feita numa cópia incremental do goban, com uma cópia do histórico
+    g = cria_copia_goban(g) if eh_goban_incremental(g) else converte_goban(g, 'incremental')
+    h = copia_historico(l, g)
+
+    # Lista das interseções livres e posição de cada uma na lista
+    cadeia = g['cadeia']
+    livres = [k for k in range(n * n) if cadeia[k] < 0]
+    posicao = [0] * (n * n)
+    for j in range(len(livres)):
+        posicao[livres[j]] = j
+
+    pedras = {cria_pedra_preta(): cria_pedra_branca(), cria_pedra_branca(): cria_pedra_preta()}
+    passagens = 0
+    jogadas = 0
+
+    while passagens < 2 and jogadas < max_jogadas:
+        # Sorteia interseções livres; as rejeitadas passam para o fim da lista até haver uma legal
+        candidatas = len(livres)
+        escolhida = -1
+        while candidatas > 0:
+            j = gerador.randrange(candidatas)
+            k = livres[j]
+            if not eh_olho(g, k, p):
+                tem_liberdade, capturadas = avalia_jogada_incremental(g, k, p)
+                if tem_liberdade and not eh_posicao_proibida(h, hash_apos_jogada_incremental(g, k, p, capturadas)):
+                    escolhida = k
+                    break
+            candidatas -= 1
+            livres[j], livres[candidatas] = livres[candidatas], livres[j]
+            posicao[livres[j]] = j
+            posicao[livres[candidatas]] = candidatas
+
+        if escolhida < 0:
+            passagens += 1
+        else:
+            passagens = 0
+            # Remove a interseção jogada da lista trocando-a com a última
+            j = posicao[escolhida]
+            ultima = livres.pop()
+            if not ultima == escolhida:
+                livres[j] = ultima
+                posicao[ultima] = j
+            # As pedras capturadas voltam a ser interseções livres
+            for capturada in joga_incremental(g, escolhida, p):
+                posicao[capturada] = len(livres)
+                livres += [capturada]
+
+        regista_goban(h, g)
+        jogadas += 1
+        p = pedras[p]
+
+    return calcula_pontos(g)
+
+def mede_simulacoes(g, p, l, numero, semente=0):
+    '''
+    mede_simulacoes: goban x pedra x (goban ou historico) x int x int → dicionário
+
+    Esta função faz numero simulações a partir do goban g, cada uma com o seu fluxo da semente dada,
+    e devolve um dicionário com o número de simulações ('simulacoes'), o tempo total em segundos
+    ('segundos'), as simulações por segundo ('simulacoes_por_segundo') e o número de vitórias do
+    jogador branco ('vitorias_branco').
+    '''
+
+    vitorias_branco = 0
+    inicio = time.perf_counter()
+    for fluxo in range(numero):
+        pontuacao = simula_partida(g, p, l, cria_gerador(semente, fluxo))
+        if pontuacao[0] > pontuacao[1]:
+            vitorias_branco += 1
+    segundos = time.perf_counter() - inicio
+
+    return {'simulacoes': numero,
+            'segundos': segundos,
+            'simulacoes_por_segundo': numero / segundos if segundos > 0 else float('inf'),
+            'vitorias_branco': vitorias_branco}
+
+# CODIFICAÇÃO COMPACTA
+
+'''
+Um goban pode ser codificado numa sequência de bytes compacta: um byte com a dimensão n do goban
+seguido de 2 bits por interseção, pela ordem dos índices (ordem de leitura), quatro interseções por
+byte a começar pelos bits menos significativos. Cada interseção livre tem o código 0, cada pedra preta
+o código 1 e cada pedra branca o código 2; os bits que sobram no último byte são 0.
+'''
+
+# Código de 2 bits de cada pedra
+CODIGOS = {cria_pedra_neutra(): 0, cria_pedra_preta(): 1, cria_pedra_branca(): 2}
+
+# Tabelas de conversão entre cada grupo de quatro pedras e o byte que as codifica, calculadas uma única vez
+_BYTES = {}
+_GRUPOS = []
+
+def _obtem_tabelas_bytes():
+    '''
+    _obtem_tabelas_bytes: {} → tuplo
+
+    Esta função auxiliar devolve o dicionário que associa cada cadeia de quatro pedras ao byte que
+    as codifica e a lista que associa cada byte válido às quatro pedras que codifica (None se inválido).
+    '''
+
+    if not _BYTES:
+        pedras = tuple(CODIGOS)
+        _GRUPOS.extend([None] * 256)
+        for grupo in range(81):
+            cadeia = ''
+            byte = 0
+            for posicao in range(4):
+                codigo = grupo // 3 ** posicao % 3
+                cadeia += pedras[codigo]
+                byte |= CODIGOS[pedras[codigo]] << 2 * posicao
+            _BYTES[cadeia] = byte
+            _GRUPOS[byte] = cadeia
+
+    return _BYTES, _GRUPOS
+
+def tamanho_codificacao(n):
+    '''
+    tamanho_codificacao: int → int
+
+    Esta função devolve o número de bytes da codificação compacta de um goban nxn.
+    '''
+
+    return 1 + (n * n + 3) // 4
+
+def goban_para_bytes(g):
+    '''
+    goban_para_bytes: goban → bytes
+
+    Esta função devolve a codificação compacta do goban g, qualquer que seja a sua representação.
+    '''
+
+    n = obtem_tamanho(g)
+    colunas = obtem_colunas(g)
+    tabela, _ = _obtem_tabelas_bytes()
+
+    # As pedras pela ordem dos índices, completadas com pedras neutras até um múltiplo de quatro
+    pedras = ''.join(colunas[k % n][k // n] for k in range(n * n))
+    pedras += cria_pedra_neutra() * (-len(pedras) % 4)
+
+    return bytes([n]) + bytes(tabela[pedras[inicio:inicio + 4]] for inicio in range(0, len(pedras), 4))
+
+def bytes_para_goban(b, representacao='listas'):
+    '''
+    bytes_para_goban: bytes x str → goban
+
+    Esta função devolve o goban, na representação indicada, com a codificação compacta b
+    (bytes, bytearray ou memoryview). Levanta um ValueError se b não for uma codificação válida.
+    '''
+
+    if not len(b) > 0 or not b[0] in (9, 13, 19) or not len(b) == tamanho_codificacao(b[0]):
+        raise ValueError('bytes_para_goban: argumentos invalidos')
+
+    n = b[0]
+    _, grupos = _obtem_tabelas_bytes()
+    try:
+        pedras = ''.join([grupos[byte] for byte in b[1:]])
+    except TypeError:
+        raise ValueError('bytes_para_goban: argumentos invalidos')
+    if pedras[n * n:].strip(cria_pedra_neutra()):
+        raise ValueError('bytes_para_goban: argumentos invalidos')
+
+    colunas = [list(pedras[coluna:n * n:n]) for coluna in range(n)]
+    if not representacao == 'listas':
+        return converte_goban(colunas, representacao)
+
+    return colunas
+
+# DESENHO DO GOBAN
+
+# Partes fixas do desenho de cada dimensão do goban, calculadas uma única vez
+_DESENHOS = {}
+
+# Carácter que representa cada pedra
+_SIMBOLOS = {pedra: pedra_para_str(pedra) for pedra in _PEDRAS}
+
+def _obtem_desenho(n):
+    '''
+    _obtem_desenho: int → dicionário
+
+    Esta função auxiliar devolve um dicionário com as partes fixas do desenho de um goban nxn:
+    a linha com as letras das colunas ('letras') e o início e o fim do desenho de cada linha
+    do goban, com o número da linha ('inicios', 'fins'), indexados por linha - 1.
+    '''
+
+    if not n in _DESENHOS:
+        _DESENHOS[n] = {'letras': '   ' + ' '.join(chr(coluna + ord("A")) for coluna in range(n)),
+                        'inicios': tuple(f'{linha:>2} ' for linha in range(1, n + 1)),
+                        'fins': tuple(f' {linha:>2}' for linha in range(1, n + 1))}
+
+    return _DESENHOS[n]
+
+def _desenha_linha(colunas, linha, n, desenho):
+    '''
+    _desenha_linha: lista x int x int x dicionário → str
+
+    Esta função auxiliar devolve o desenho da linha linha + 1 do goban nxn com as colunas dadas.
+    '''
+
+    return desenho['inicios'][linha] + ' '.join([_SIMBOLOS[colunas[coluna][linha]] for coluna in range(n)]) + \
+        desenho['fins'][linha]
+
+'''
+O TAD desenho é usado para desenhar muitas vezes um goban que vai sendo jogado, como nos jogos
+transmitidos ou nos registos, redesenhando apenas as linhas que mudaram desde o último desenho.
+
+-Cada desenho é representado por um dicionário com a dimensão do goban ('n'), uma cópia das colunas
+desenhadas ('colunas'), o desenho de cada linha, indexado por linha - 1 ('linhas'), o desenho completo,
+ou None se tiver de ser juntado de novo ('texto'), e o número de linhas desenhadas ('desenhadas').
+'''
+
+def cria_desenho(g):
+    '''
+    cria_desenho: goban → desenho
+
+    Esta função devolve o desenho do goban g, em qualquer representação.
+    '''
+
+    n = obtem_tamanho(g)
+    colunas = [list(coluna) for coluna in obtem_colunas(g)]
+    desenho = _obtem_desenho(n)
+
+    return {'n': n, 'colunas': colunas, 'linhas': [_desenha_linha(colunas, linha, n, desenho) for linha in range(n)],
+            'texto': None, 'desenhadas': n}
+
+def desenha_goban(d, g, alteradas=None):
+    '''
+    desenha_goban: desenho x goban x iterável → str
+
+    Esta função modifica destrutivamente o desenho d para o goban g, com a mesma dimensão, e devolve
+    a cadeia de caracteres que representa o goban, igual à de goban_para_str. Se alteradas for dado,
+    só as linhas das interseções de alteradas (por exemplo a da jogada e as das pedras capturadas,
+    ver obtem_capturadas) são redesenhadas; caso contrário são redesenhadas as linhas que mudaram.
+    '''
+
+    n = d['n']
+    if not obtem_tamanho(g) == n:
+        raise ValueError('desenha_goban: argumentos invalidos')
+
+    colunas = obtem_colunas(g)
+    anteriores = d['colunas']
+
+    # As linhas a redesenhar são as das interseções alteradas ou, nas colunas que mudaram, as que mudaram
+    linhas = set()
+    if alteradas is None:
+        for coluna in range(n):
+            if not colunas[coluna] == anteriores[coluna]:
+                linhas.update(linha for linha in range(n) if not colunas[coluna][linha] == anteriores[coluna][linha])
+                anteriores[coluna] = list(colunas[coluna])
+    else:
+        for intersecao in alteradas:
+            linhas.add(obtem_lin(intersecao) - 1)
+        for linha in linhas:
+            for coluna in range(n):
+                anteriores[coluna][linha] = colunas[coluna][linha]
+
+    desenho = _obtem_desenho(n)
+    if linhas:
+        for linha in linhas:
+            d['linhas'][linha] = _desenha_linha(anteriores, linha, n, desenho)
+        d['desenhadas'] += len(linhas)
+        d['texto'] = None
+
+    if d['texto'] is None:
+        d['texto'] = '\n'.join([desenho['letras']] + d['linhas'][::-1] + [desenho['letras']])
+
+    return d['texto']
+
+def escreve_gobans(gobans, ficheiro, separador='\n'):
+    '''
+    escreve_gobans: iterável x ficheiro x str → int
+
+    Esta função escreve no ficheiro (aberto em modo de texto) a representação de cada um dos gobans,
+    igual à de goban_para_str, seguida do separador, linha a linha sem construir a representação
+    completa de cada goban, e devolve o número de gobans escritos.
+    '''
+
+    escritos = 0
+    for g in gobans:
+        n = obtem_tamanho(g)
+        colunas = obtem_colunas(g)
+        desenho = _obtem_desenho(n)
+
+        ficheiro.write(desenho['letras'])
+        for linha in range(n - 1, -1, -1):
+            ficheiro.write('\n')
+            ficheiro.write(_desenha_linha(colunas, linha, n, desenho))
+        ficheiro.write('\n')
+        ficheiro.write(desenho['letras'])
+        ficheiro.write(separador)
+        escritos += 1
+
+    return escritos
+
+# GOBAN PERSISTENTE
+
+'''
+O TAD goban_persistente é usado para guardar muitas posições de uma partida, por exemplo o seu
+histórico completo, sem copiar o goban a cada jogada. Um goban persistente nunca é modificado:
+cada jogada devolve um novo goban persistente que partilha com o anterior todas as colunas que a
+jogada não alterou, pelo que só são criadas as colunas da jogada e das pedras capturadas. Como
+nunca é modificado, pode ser lido por várias threads ao mesmo tempo.
+
+-Cada goban persistente é representado por um dicionário com a dimensão do goban ('n'), o tuplo dos
+tuplos das pedras de cada coluna ('colunas') e o hash de Zobrist da posição ('hash').
+
+As funções que apenas leem um goban, como obtem_pedra, obtem_cadeia, obtem_territorios, calcula_pontos,
+goban_para_str, goban_para_bytes e obtem_hash, aceitam gobans persistentes; para as restantes, um goban
+persistente pode ser convertido com converte_goban.
+'''
+
+def cria_goban_persistente(g):
+    '''
+    cria_goban_persistente: goban → goban_persistente
+
+    Esta função devolve o goban persistente com as mesmas pedras do goban g, em qualquer representação.
+    '''
+
+    return {'tipo': 'persistente', 'n': obtem_tamanho(g), 'colunas': tuple(tuple(coluna) for coluna in obtem_colunas(g)),
+            'hash': obtem_hash(g)}
+
+def eh_goban_persistente(arg):
+    '''
+    eh_goban_persistente: universal → booleano
+
+    Esta função devolve True caso o seu argumento seja um goban persistente e False caso contrário.
+    '''
+
+    return isinstance(arg, dict) and arg.get('tipo') == 'persistente'
+
+def joga_persistente(g, i, p):
+    '''
+    joga_persistente: goban_persistente x intersecao x pedra → goban_persistente
+
+    Esta função devolve o goban persistente que resulta de colocar a pedra do jogador p na interseção i
+    do goban persistente g e remover as cadeias adversárias adjacentes sem liberdades, como jogada,
+    sem modificar g.
+    '''
+
+    n = g['n']
+    k = indice_da_intersecao(i, n)
+    chaves = obtem_chaves_zobrist(n)
+
+    # Só as colunas alteradas são copiadas; as restantes continuam a ser as de g
+    colunas = list(g['colunas'])
+    alteradas = {k % n: list(colunas[k % n])}
+    valor = g['hash']
+    if eh_pedra_jogador(alteradas[k % n][k // n]):
+        valor ^= chaves[k][alteradas[k % n][k // n]]
+    alteradas[k % n][k // n] = p
+    colunas[k % n] = alteradas[k % n]
+    valor ^= chaves[k][p]
+
+    # As cadeias adversárias adjacentes sem liberdades são capturadas
+    rotulos = [-1] * (n * n)
+    capturadas = []
+    for adjacente in obtem_vizinhos(n)[k]:
+        pedra_adjacente = colunas[adjacente % n][adjacente // n]
+        if eh_pedra_jogador(pedra_adjacente) and not pedra_adjacente == p and rotulos[adjacente] < 0:
+            membros, liberdades = _preenche_componente(colunas, n, adjacente, rotulos, 0)
+            if not liberdades:
+                capturadas += membros
+
+    for capturada in capturadas:
+        coluna = capturada % n
+        if not coluna in alteradas:
+            alteradas[coluna] = list(colunas[coluna])
+        valor ^= chaves[capturada][alteradas[coluna][capturada // n]]
+        alteradas[coluna][capturada // n] = cria_pedra_neutra()
+
+    for coluna in alteradas:
+        colunas[coluna] = tuple(alteradas[coluna])
+
+    return {'tipo': 'persistente', 'n': n, 'colunas': tuple(colunas), 'hash': valor}
+
+def reproduz_persistente(g, jogadas, p=None):
+    '''
+    reproduz_persistente: goban x iterável x pedra → lista
+
+    Esta função devolve a lista dos gobans persistentes de cada posição de uma partida: a do goban g
+    e a de depois de cada uma das jogadas (interseções, ou None para passar), feitas alternadamente
+    pelos dois jogadores a começar pela pedra p (por omissão a preta). As jogadas não são verificadas.
+    Uma passagem repete o goban persistente anterior, sem criar um novo.
+    '''
+
+    posicoes = [g if eh_goban_persistente(g) else cria_goban_persistente(g)]
+    p = cria_pedra_preta() if p is None else p
+
+    for intersecao in jogadas:
+        if intersecao is None:
+            posicoes += [posicoes[-1]]
+        else:
+            posicoes += [joga_persistente(posicoes[-1], intersecao, p)]
+        p = obtem_pedra_adversaria(p)
+
+    return posicoes
+
+# PROCURAS
+
+'''
+As procuras sobre gobans incrementais (como as de mcts.py, tatica.py e final.py) representam as jogadas
+pelo índice da interseção e a passagem por PASSAGEM, e limitam o seu trabalho com um orçamento.
+
+O TAD orcamento é usado para limitar uma procura a um número máximo de nós ou de segundos.
+
+-Cada orçamento é representado por um dicionário com o número de nós contados ('nos'), o número máximo
+de nós ('max_nos'), o instante em que a procura tem de terminar ('limite'), ambos None se não houver
+limite, e se o orçamento se esgotou ('esgotada'). Uma procura pode guardar o seu estado no próprio
+dicionário do orçamento.
+'''
+
+# Índice que representa a passagem
+PASSAGEM = -1
+
+# Número de nós entre cada verificação do tempo
+NOS_POR_VERIFICACAO = 256
+
+def cria_orcamento(max_nos=None, segundos=None):
+    '''
+    cria_orcamento: int x float → orcamento
+
+    Esta função devolve um orçamento de no máximo max_nos nós e segundos segundos, a contar de agora.
+    '''
+
+    return {'nos': 0, 'max_nos': max_nos, 'limite': None if segundos is None else time.perf_counter() + segundos,
+            'esgotada': False}
+
+def conta_no(o):
+    '''
+    conta_no: orcamento → booleano
+
+    Esta função modifica destrutivamente o orçamento o contando mais um nó e devolve False se o número
+    de nós ou o tempo se esgotaram (o tempo só é verificado a cada NOS_POR_VERIFICACAO nós).
+    '''
+
+    o['nos'] += 1
+    if not o['max_nos'] is None and o['nos'] > o['max_nos']:
+        o['esgotada'] = True
+    elif not o['limite'] is None and o['nos'] % NOS_POR_VERIFICACAO == 0 and time.perf_counter() > o['limite']:
+        o['esgotada'] = True
+
+    return not o['esgotada']
+
+# FUNÇÕES ADICIONAIS
+
+def calcula_pontos(g):
+    '''
+    calcula_pontos: goban → tuple
+
+    Esta função ́e uma função auxiliar que recebe um goban e devolve o tuplo de dois
+    inteiros com as pontuações dos jogadores branco e preto, respetivamente.
+    '''
+
+    if eh_goban_bits(g):
+        return _calcula_pontos_bits(g)
+    if eh_goban_incremental(g):
+        return _calcula_pontos_incremental(g)
+
+    pontos_branco = 0
+    pontos_preto = 0
+
+    # Uma única rotulagem dá as cadeias e os territórios com as respetivas fronteiras
+    rotulagem = rotula_goban(g)
+    pedras = rotulagem['pedras']
+    rotulos = rotulagem['rotulos']
+
+    for componente in range(len(rotulagem['componentes'])):
+        tamanho = len(rotulagem['componentes'][componente])
+        if eh_pedra_branca(pedras[componente]):
+            pontos_branco += tamanho
+        elif eh_pedra_preta(pedras[componente]):
+            pontos_preto += tamanho
+        elif rotulagem['fronteiras'][componente]:
+            # Contabiliza os territórios rodeados apenas por pedras de um jogador
+            # (um território sem fronteira só existe no goban vazio, que não dá pontos)
+            cores = {pedras[rotulos[adjacente]] for adjacente in rotulagem['fronteiras'][componente]}
+            if cores == {cria_pedra_branca()}:
+                pontos_branco += tamanho
+            elif cores == {cria_pedra_preta()}:
+                pontos_preto += tamanho
+
+    return (pontos_branco, pontos_preto)
+
+def eh_jogada_legal(g, i, p, l):
+    '''
+    eh_jogada_legal: goban x intersecao x pedra x (goban ou historico) → booleano
+
+    Esta função ́e uma função auxiliar que recebe um goban g, uma interseção
+    i, uma pedra de jogador p e um outro goban l e devolve True se a jogada for legal ou
+    False caso contrário, sem modificar g ou l.
+    Se l for um histórico, a jogada é ilegal se repetir uma posição proibida pelo histórico.
+    '''
+    
+    # Verifica se a interseção i é válida e vazia
+    if not eh_intersecao_valida(g, i) or eh_pedra_jogador(obtem_pedra(g, i)):
+        return False
+
+    # Um l que não seja um histórico nem um goban da dimensão de g não proíbe nenhuma posição
+    if not eh_historico(l) and not (eh_goban(l) and obtem_tamanho(l) == obtem_tamanho(g)):
+        l = cria_historico()
+
+    return eh_jogada_legal_sem_verificacao(g, i, p, l)
+
+def eh_jogada_legal_sem_verificacao(g, i, p, l):
+    '''
+    eh_jogada_legal_sem_verificacao: goban x intersecao x pedra x (goban ou historico) → booleano
+
+    Esta função devolve o mesmo que eh_jogada_legal sem verificar os argumentos: a interseção i
+    tem de ser uma interseção livre do goban g e l tem de ser um histórico ou um goban da dimensão de g.
+    '''
+
+    if eh_goban_incremental(g):
+        return _eh_jogada_legal_incremental(g, i, p, l)
+    if eh_goban_bits(g):
+        return _eh_jogada_legal_bits(g, i, p, l)
+
+    # Realiza a jogada no próprio goban, desfazendo-a no fim
+    registo = faz_jogada(g, i, p)
+
+    # Verifica se a jogada cumpre a regra do suícidio e não repete o estado do goban
+    # (o goban l só pode ser o próprio g se for o goban anterior à jogada, que é diferente)
+    legal = tem_liberdades(g, i)
+    if legal and eh_historico(l):
+        legal = not eh_posicao_proibida(l, obtem_hash(g))
+    elif legal and not l is g:
+        legal = not gobans_iguais_sem_verificacao(g, l)
+
+    desfaz_jogada(g, registo)
+
+    return legal
+
+def turno_jogador(g, p, l):
+    '''
+    turno_jogador: goban x pedra x (goban ou historico) → booleano
+
+    Esta função é uma função auxiliar que oferece ao jogador que joga com pedras p
+    a opção de passar a jogada ou de colocar uma pedra própria numa interseção.
+    Se o jogador passar, a função devolve False sem modificar os argumentos.
+    Se o jogador fizer uma jogada ilegal, ele terá que repetir a jogada até ser legal.
+    Caso contrário, a função devolve True e modifica destrutivamente o tabuleiro g de acordo com a jogada realizada.
+    '''
+    
+    pedra = pedra_para_str(p)
+
+    while True: # Caso o input não seja a representação externa de uma intercesão do goban ou "P", repete o input
+        jogada_realizada = input(f"Escreva uma intersecao ou 'P' para passar [{pedra}]:")
+
+        if jogada_realizada == 'P':
+            return False # O jogador passa a vez
+        else:
+            if str_intersecao_valida(jogada_realizada):
+                jogada_realizada = str_para_intersecao(jogada_realizada)
+                # Só a interseção escrita é verificada; o goban e o histórico já foram validados
+                if eh_intersecao_valida(g, jogada_realizada) and not eh_pedra_jogador(obtem_pedra(g, jogada_realizada)) and \
+                    eh_jogada_legal_sem_verificacao(g, jogada_realizada, p, l):
+                    jogada(g, jogada_realizada, p)
+                    return True # Se a jogada for legal, executa-a e passa a vez
+
+def go(n, tb, tp, superko=False, fonte_preto=None, fonte_branco=None):
+    '''
+    go: int x tuple x tuple x booleano x fonte x fonte → booleano
+
+    Esta função permite jogar um jogo completo do Go de dois jogadores.
+    A função recebe um inteiro correspondente à dimensão do tabuleiro, e dois
+    tuplos (potencialmente vazios) com a representação externa das interseções ocupadas
+    por pedras brancas (tb) e pretas (tp) inicialmente. A função devolve True se o jogador
+    com pedras brancas conseguir ganhar o jogo, ou False caso contrário.
+    Se superko for True, nenhuma jogada pode repetir uma posição que já tenha ocorrido no jogo.
+    As jogadas de um jogador com uma fonte (como em joga_partida) são obtidas dessa fonte em vez de input.
+    '''
+
+    def fazer_jogada(goban, pedra, ultimo_goban, fonte):
+        '''
+        fazer_jogada: goban x pedra x historico x fonte → booleano
+
+        Esta função retorna True caso o jogador passe a jogada,
+        caso contrário executa a jogada no goban e retorna False.
+        '''
+
+        pontuacao = calcula_pontos(goban)
+        print(f'Branco (O) tem {pontuacao[0]} pontos')
+        print(f'Preto (X) tem {pontuacao[1]} pontos')
+        print(desenha_goban(desenho, goban))
+
+        if fonte is None:
+            return not turno_jogador(goban, pedra, ultimo_goban) # Retorna se o jogador passou ou não
+
+        intersecao = _obtem_jogada_legal(goban, pedra, ultimo_goban, fonte)
+        if intersecao is None:
+            return True
+        jogada(goban, intersecao, pedra)
+        return False
+
+    # Verifica a validade dos argumentos e cria o goban e o histórico
+    goban, historico = prepara_partida(n, tb, tp, superko, 'go')
+    desenho = cria_desenho(goban)
+    fontes = []
+    for fonte in (fonte_preto, fonte_branco):
+        if fonte is None or callable(fonte):
+            fontes += [fonte]
+        else:
+            fontes += [_fonte_do_iteravel(fonte, 'go')]
+    
+    # O jogo acaba quando estas duas variaveis valerem True
+    branco_passou = False
+    preto_passou = False
+
+    # Enquanto não passarem os dois o jogo continua
+    while True:
+        # Jogada do preto
+        preto_passou = fazer_jogada(goban, cria_pedra_preta(), historico, fontes[0])
+        regista_goban(historico, goban)
+        if preto_passou and branco_passou:
+            break
+
+        # Jogada do branco
+        branco_passou = fazer_jogada(goban, cria_pedra_branca(), historico, fontes[1])
+        regista_goban(historico, goban)
+        if preto_passou and branco_passou:
+            break
+    
+    # Mostra o tabuleiro e a pontuação final
+    pontuacao = calcula_pontos(goban)
+    print(f'Branco (O) tem {pontuacao[0]} pontos')
+    print(f'Preto (X) tem {pontuacao[1]} pontos')
+    print(desenha_goban(desenho, goban))
+
+    return pontuacao[0] > pontuacao[1]
+
+def prepara_partida(n, tb, tp, superko, nome):
+    '''
+    prepara_partida: int x tuple x tuple x booleano x str → tuplo
+
+    Esta função verifica os argumentos de uma partida, levantando um ValueError com
+    o nome da função que a iniciou se forem inválidos, e devolve o goban incremental inicial e
+    o histórico da partida.
+    '''
+
+    # Verifica a validade dos argumentos
+    if not n in (9, 13, 19) or not isinstance(n, int):
+        raise ValueError(f'{nome}: argumentos invalidos')
+
+    if not isinstance(tb, tuple) or not isinstance(tp, tuple):
+        raise ValueError(f'{nome}: argumentos invalidos')
+
+    # Transforma a representação externa em interseções se os argumentos forem válidos
+    vazio = cria_goban_vazio(n)
+    tbranco = ()
+    tpreto = ()
+    for intercesao in tb:
+        if not str_intersecao_valida(intercesao) or not eh_intersecao_valida(vazio, str_para_intersecao(intercesao)) or str_para_intersecao(intercesao) in (tbranco, tpreto):
+            raise ValueError(f'{nome}: argumentos invalidos')
+        tbranco += (str_para_intersecao(intercesao)),
+    for intercesao in tp:
+        if not str_intersecao_valida(intercesao) or not eh_intersecao_valida(vazio, str_para_intersecao(intercesao)) or str_para_intersecao(intercesao) in (tbranco, tpreto):
+            raise ValueError(f'{nome}: argumentos invalidos')
+        tpreto += (str_para_intersecao(intercesao)),
+    
+    # Se os argumentos forem válidos cria o goban
+    goban = cria_goban(n,tbranco,tpreto,'incremental')
+
+    return goban, _cria_historico_partida(goban, superko)
+
+def _cria_historico_partida(g, superko):
+    '''
+    _cria_historico_partida: goban x booleano → historico
+
+    Esta função auxiliar devolve o histórico do início de uma partida com o goban inicial g.
+    '''
+
+    # O histórico verifica que não se repete o estado do goban. Sem superko, cada jogada
+    # é comparada com o goban anterior à última jogada do adversário (o goban vazio no início)
+    historico = cria_historico(superko)
+    if not superko:
+        regista_goban(historico, cria_goban_vazio(obtem_tamanho(g)))
+    regista_goban(historico, g)
+
+    return historico
+
+def joga_partida(n, tb, tp, fonte_preto, fonte_branco, superko=False):
+    '''
+    joga_partida: int x tuple x tuple x fonte x fonte x booleano → tuplo
+
+    Esta função joga uma partida completa de Go sem interação, com as mesmas regras da função go,
+    e devolve o tuplo com o goban final, a pontuação (branco, preto) e o registo das jogadas.
+    As jogadas de cada jogador são obtidas da sua fonte: um iterável de jogadas ou uma função que
+    recebe o goban, a pedra do jogador e o histórico e devolve uma jogada. Uma jogada é uma interseção,
+    a sua representação externa ou 'P' (ou None) para passar; uma jogada ilegal ou inválida é ignorada
+    e é pedida a seguinte, e um iterável esgotado passa. O registo é a lista dos pares (pedra, intersecao),
+    com intersecao None nas passagens.
+    '''
+
+    goban, historico = prepara_partida(n, tb, tp, superko, 'joga_partida')
+
+    # Cada fonte é transformada numa função que devolve a próxima jogada
+    fontes = []
+    for fonte in (fonte_preto, fonte_branco):
+        fontes += [fonte if callable(fonte) else _fonte_do_iteravel(fonte, 'joga_partida')]
+
+    pedras = (cria_pedra_preta(), cria_pedra_branca())
+    jogadas = []
+    passou = [False, False]
+    jogador = 0
+
+    # Enquanto não passarem os dois o jogo continua
+    while not (passou[0] and passou[1]):
+        pedra = pedras[jogador]
+        intersecao = _obtem_jogada_legal(goban, pedra, historico, fontes[jogador])
+
+        passou[jogador] = intersecao is None
+        if not passou[jogador]:
+            jogada(goban, intersecao, pedra)
+        regista_goban(historico, goban)
+        jogadas += [(pedra, intersecao)]
+        jogador = 1 - jogador
+
+    return goban, calcula_pontos(goban), jogadas
+
+def reproduz_partida(n, ib, ip, jogadas, superko=False):
+    '''
+    reproduz_partida: int x tuplo x tuplo x iterável x booleano → tuplo
+
+    Esta função reproduz, com as regras da função go, as jogadas de uma partida num goban nxn com as
+    interseções do tuplo ib ocupadas por pedras brancas e as do tuplo ip ocupadas por pedras pretas
+    (como em cria_goban), jogando alternadamente o preto e o branco. Cada jogada é uma interseção,
+    a sua representação externa ou 'P' (ou None) para passar. Devolve o tuplo com o goban final,
+    a pontuação (branco, preto) e None, ou, se uma jogada for inválida ou ilegal, o par com a posição
+    dessa jogada (a partir de 0) e a própria jogada, parando a reprodução antes dela.
+    '''
+
+    goban = cria_goban(n, ib, ip, 'incremental')
+    historico = _cria_historico_partida(goban, superko)
+    pedras = (cria_pedra_preta(), cria_pedra_branca())
+
+    numero = 0
+    for jogada_feita in jogadas:
+        pedra = pedras[numero % 2]
+        if not (jogada_feita is None or jogada_feita == 'P'):
+            intersecao = intersecao_legal(goban, pedra, historico, jogada_feita)
+            if intersecao is None:
+                return goban, calcula_pontos(goban), (numero, jogada_feita)
+            jogada(goban, intersecao, pedra)
+        regista_goban(historico, goban)
+        numero += 1
+
+    return goban, calcula_pontos(goban), None
+
+def _fonte_do_iteravel(fonte, nome):
+    '''
+    _fonte_do_iteravel: iterável x str → função
+
+    Esta função auxiliar transforma um iterável de jogadas numa fonte que devolve a próxima jogada
+    (ou None, para passar, quando o iterável se esgotar), levantando um ValueError com o nome da
+    função que a pediu se fonte não for iterável.
+    '''
+
+    try:
+        iterador = iter(fonte)
+    except TypeError:
+        raise ValueError(f'{nome}: argumentos invalidos')
+
+    return lambda goban, pedra, historico: next(iterador, None)
+
+def _obtem_jogada_legal(g, p, h, fonte):
+    '''
+    _obtem_jogada_legal: goban x pedra x historico x função → intersecao
+
+    Esta função auxiliar pede jogadas à fonte até obter uma jogada legal da pedra p no goban g,
+    devolvendo a sua interseção, ou None se o jogador passar.
+    '''
+
+    while True:
+        jogada_pedida = fonte(g, p, h)
+        if jogada_pedida is None or jogada_pedida == 'P':
+            return None
+
+        intersecao = intersecao_legal(g, p, h, jogada_pedida)
+        if not intersecao is None:
+            return intersecao
+
+def intersecao_legal(g, p, h, jogada_pedida):
+    '''
+    intersecao_legal: goban x pedra x historico x universal → intersecao
+
+    Esta função devolve a interseção da jogada pedida (uma interseção ou a sua representação
+    externa) se for uma jogada legal da pedra p no goban g, ou None caso contrário.
+    '''
+
+    # A representação externa é transformada numa interseção
+    if str_intersecao_valida(jogada_pedida):
+        jogada_pedida = str_para_intersecao(jogada_pedida)
+    elif not eh_intersecao(jogada_pedida):
+        return None
+
+    # Só a interseção é verificada; o goban e o histórico já foram validados
+    if eh_intersecao_valida(g, jogada_pedida) and not eh_pedra_jogador(obtem_pedra(g, jogada_pedida)) and \
+        eh_jogada_legal_sem_verificacao(g, jogada_pedida, p, h):
+        return jogada_pedida
+
+    return None
+
+#FUNÇÕES EXTRA
+
+def tem_liberdades(g, i):
+        '''
+        tem_liberdades: goban x intersecao → bool
+
+        Esta função auxiliar verifica se uma cadeia de pedras tem pelo menos uma liberdade.
+        '''
+
+        # Num goban em bits as liberdades são as livres adjacentes à cadeia
+        if eh_goban_bits(g):
+            n = g['n']
+            pedra = obtem_pedra(g, i)
+            if not eh_pedra_jogador(pedra):
+                return False
+            cadeia = _preenche_bits(1 << indice_da_intersecao(i, n), _bits_da_pedra(g, pedra), n)
+            return _expande_bits(cadeia, n) & g['vazias'] != 0
+
+        # Num goban incremental as liberdades de cada cadeia já são conhecidas
+        if eh_goban_incremental(g) and g['cadeia'][indice_da_intersecao(i, g['n'])] >= 0:
+            return len(g['liberdades'][g['cadeia'][indice_da_intersecao(i, g['n'])]]) > 0
 
         # Verifica se pelo menos uma fronteira da cadeia é uma pedra neutra
         for adjacente in obtem_adjacentes_diferentes(g, obtem_cadeia(g, i)):
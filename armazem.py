@@ -0,0 +1,175 @@
+'''
+Armazém de posições: um ficheiro onde só se acrescentam posições, na codificação compacta de Go.py,
+que é lido através de um mapeamento em memória sem copiar nem descodificar as posições.
+
+-Cada ficheiro começa por um cabeçalho de 8 bytes: a assinatura b'GOPOS', a versão do formato,
+a dimensão n dos gobans e um byte a 0. Seguem-se as posições, todas com o mesmo número de bytes,
+tamanho_codificacao(n), cada uma com a codificação compacta de um goban nxn. Uma posição incompleta
+no fim do ficheiro, deixada por uma interrupção, é ignorada na leitura e removida ao acrescentar.
+
+-O TAD armazem é representado por um dicionário com o caminho do ficheiro ('caminho'), a dimensão
+dos gobans ('n'), o número de bytes de cada posição ('tamanho') e o ficheiro aberto para acrescentar
+('ficheiro') ou o mapeamento do ficheiro e a sua vista ('mapa', 'vista'), conforme o modo em que foi aberto.
+'''
+
+import mmap
+import os
+
+import Go
+
+# Assinatura, versão e tamanho do cabeçalho dos ficheiros de posições
+ASSINATURA = b'GOPOS'
+VERSAO = 1
+TAMANHO_CABECALHO = 8
+
+# Número de pedras brancas e pretas codificadas em cada byte, calculado uma única vez
+_PEDRAS_DO_BYTE = tuple(tuple(sum(1 for posicao in range(4) if byte >> 2 * posicao & 3 == Go.CODIGOS[pedra])
+                              for pedra in (Go.cria_pedra_branca(), Go.cria_pedra_preta())) for byte in range(256))
+
+def _le_cabecalho(caminho):
+    '''
+    _le_cabecalho: str → int
+
+    Esta função auxiliar devolve a dimensão dos gobans do ficheiro de posições caminho,
+    levantando um ValueError se o cabeçalho for inválido.
+    '''
+
+    with open(caminho, 'rb') as ficheiro:
+        cabecalho = ficheiro.read(TAMANHO_CABECALHO)
+
+    if not len(cabecalho) == TAMANHO_CABECALHO or not cabecalho[:5] == ASSINATURA or not cabecalho[5] == VERSAO \
+            or not cabecalho[6] in (9, 13, 19):
+        raise ValueError('armazem: ficheiro invalido')
+
+    return cabecalho[6]
+
+def abre_para_acrescentar(caminho, n):
+    '''
+    abre_para_acrescentar: str x int → armazem
+
+    Esta função abre o ficheiro de posições caminho de gobans nxn para lhe acrescentar posições,
+    criando-o se não existir, e devolve o armazem correspondente.
+    '''
+
+    if not n in (9, 13, 19):
+        raise ValueError('abre_para_acrescentar: argumentos invalidos')
+
+    tamanho = Go.tamanho_codificacao(n)
+    if not os.path.exists(caminho) or os.path.getsize(caminho) == 0:
+        with open(caminho, 'wb') as ficheiro:
+            ficheiro.write(ASSINATURA + bytes([VERSAO, n, 0]))
+    elif not _le_cabecalho(caminho) == n:
+        raise ValueError('abre_para_acrescentar: argumentos invalidos')
+
+    # Remove uma posição incompleta deixada por uma interrupção
+    excesso = (os.path.getsize(caminho) - TAMANHO_CABECALHO) % tamanho
+    if excesso:
+        with open(caminho, 'r+b') as ficheiro:
+            ficheiro.truncate(os.path.getsize(caminho) - excesso)
+
+    return {'caminho': caminho, 'n': n, 'tamanho': tamanho, 'ficheiro': open(caminho, 'ab')}
+
+def acrescenta_posicao(armazem, g):
+    '''
+    acrescenta_posicao: armazem x goban → armazem
+
+    Esta função acrescenta a posição do goban g ao fim do ficheiro do armazem e devolve o armazem.
+    '''
+
+    if not Go.obtem_tamanho(g) == armazem['n']:
+        raise ValueError('acrescenta_posicao: argumentos invalidos')
+
+    armazem['ficheiro'].write(Go.goban_para_bytes(g))
+
+    return armazem
+
+def abre_para_ler(caminho):
+    '''
+    abre_para_ler: str → armazem
+
+    Esta função abre o ficheiro de posições caminho para leitura, mapeando-o em memória,
+    e devolve o armazem correspondente.
+    '''
+
+    n = _le_cabecalho(caminho)
+    with open(caminho, 'rb') as ficheiro:
+        mapa = mmap.mmap(ficheiro.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return {'caminho': caminho, 'n': n, 'tamanho': Go.tamanho_codificacao(n), 'mapa': mapa, 'vista': memoryview(mapa)}
+
+def fecha_armazem(armazem):
+    '''
+    fecha_armazem: armazem → {}
+
+    Esta função fecha o ficheiro ou o mapeamento do armazem. As vistas devolvidas por
+    obtem_codificacao e percorre_codificacoes têm de deixar de existir (ou ser libertadas) antes,
+    caso contrário o mapeamento não pode ser fechado e é levantado um BufferError.
+    '''
+
+    if 'ficheiro' in armazem:
+        armazem['ficheiro'].close()
+    else:
+        armazem['vista'].release()
+        armazem['mapa'].close()
+
+def numero_posicoes(armazem):
+    '''
+    numero_posicoes: armazem → int
+
+    Esta função devolve o número de posições completas do armazem aberto para leitura.
+    '''
+
+    return (len(armazem['mapa']) - TAMANHO_CABECALHO) // armazem['tamanho']
+
+def obtem_codificacao(armazem, indice):
+    '''
+    obtem_codificacao: armazem x int → memoryview
+
+    Esta função devolve a codificação compacta da posição indice do armazem aberto para leitura,
+    como uma vista sobre o mapeamento do ficheiro, sem a copiar.
+    '''
+
+    if not 0 <= indice < numero_posicoes(armazem):
+        raise IndexError('obtem_codificacao: indice invalido')
+
+    inicio = TAMANHO_CABECALHO + indice * armazem['tamanho']
+
+    return armazem['vista'][inicio:inicio + armazem['tamanho']]
+
+def obtem_goban(armazem, indice, representacao='listas'):
+    '''
+    obtem_goban: armazem x int x str → goban
+
+    Esta função devolve o goban da posição indice do armazem aberto para leitura, na representação indicada.
+    '''
+
+    return Go.bytes_para_goban(obtem_codificacao(armazem, indice), representacao)
+
+def percorre_codificacoes(armazem):
+    '''
+    percorre_codificacoes: armazem → gerador
+
+    Esta função produz, pela ordem do ficheiro, as codificações compactas das posições do armazem
+    aberto para leitura, cada uma uma vista sobre o mapeamento do ficheiro, sem as copiar.
+    '''
+
+    tamanho = armazem['tamanho']
+    for inicio in range(TAMANHO_CABECALHO, TAMANHO_CABECALHO + numero_posicoes(armazem) * tamanho, tamanho):
+        yield armazem['vista'][inicio:inicio + tamanho]
+
+def conta_pedras(codificacao):
+    '''
+    conta_pedras: bytes → tuplo
+
+    Esta função devolve o tuplo com o número de pedras brancas e pretas de uma codificação compacta,
+    sem a descodificar.
+    '''
+
+    brancas = 0
+    pretas = 0
+    for byte in codificacao[1:]:
+        contagem = _PEDRAS_DO_BYTE[byte]
+        brancas += contagem[0]
+        pretas += contagem[1]
+
+    return brancas, pretas
@@ -0,0 +1,248 @@
+'''
+Medição do desempenho das operações principais do TAD goban.
+
+As posições são geradas de forma reprodutível (com uma semente fixa) para gobans 9x9, 13x13 e 19x19
+com várias densidades de pedras, uma única cadeia gigante (o pior caso de obtem_cadeia e das capturas)
+e uma grande região livre (o pior caso de obtem_territorios). Para cada operação são medidas as
+operações por segundo e a memória alocada por operação, e ainda as simulações aleatórias por segundo
+a partir do goban vazio. Os resultados podem ser guardados num ficheiro JSON e comparados com uma
+medição anterior.
+
+Utilização:
+    python desempenho.py [--repeticoes N] [--representacoes listas,incremental,bits] [--simulacoes N]
+                         [--guardar base.json] [--comparar base.json] [--tolerancia 0.2]
+'''
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import Go
+
+# Dimensões dos gobans, densidades das posições aleatórias e semente das posições
+DIMENSOES = (9, 13, 19)
+DENSIDADES = (0.25, 0.5, 0.75)
+SEMENTE = 2024
+
+# Versão do formato dos ficheiros de resultados
+VERSAO = 1
+
+def gera_posicoes(n):
+    '''
+    gera_posicoes: int → dicionário
+
+    Esta função devolve um dicionário que associa o nome de cada posição de teste de um goban nxn
+    ao par de tuplos (brancas, pretas) com as interseções ocupadas por cada jogador.
+    '''
+
+    intersecoes = [Go.cria_intersecao(chr(ord("A") + col), lin) for lin in range(1, n + 1) for col in range(n)]
+    posicoes = {}
+
+    # Posições aleatórias com pedras dos dois jogadores alternadas
+    gerador = random.Random(SEMENTE + n)
+    for densidade in DENSIDADES:
+        ocupadas = gerador.sample(intersecoes, int(densidade * n * n))
+        posicoes[f'densidade-{densidade:.2f}'] = (tuple(ocupadas[::2]), tuple(ocupadas[1::2]))
+
+    # Uma única cadeia preta em pente: as colunas pares completas unidas pela primeira linha
+    pente = tuple(i for i in intersecoes if (ord(Go.obtem_col(i)) - ord("A")) % 2 == 0 or Go.obtem_lin(i) == 1)
+    posicoes['cadeia-gigante'] = ((), pente)
+
+    # Uma grande região livre rodeada por uma única pedra de cada jogador num canto
+    posicoes['regiao-livre'] = ((Go.cria_intersecao("A", 1),), (Go.cria_intersecao(chr(ord("A") + n - 1), n),))
+
+    return posicoes
+
+def _escolhe_intersecoes(g, n):
+    '''
+    _escolhe_intersecoes: goban x int → tuplo
+
+    Esta função auxiliar devolve uma interseção ocupada (ou livre, se não houver pedras) e uma
+    interseção livre onde a jogada da pedra preta é legal, escolhidas de forma reprodutível.
+    '''
+
+    intersecoes = [Go.cria_intersecao(chr(ord("A") + col), lin) for lin in range(1, n + 1) for col in range(n)]
+    gerador = random.Random(SEMENTE)
+    gerador.shuffle(intersecoes)
+
+    ocupada = next((i for i in intersecoes if Go.eh_pedra_jogador(Go.obtem_pedra(g, i))), intersecoes[0])
+    livre = next((i for i in intersecoes if Go.eh_jogada_legal(g, i, Go.cria_pedra_preta(), Go.cria_goban_vazio(n))), None)
+
+    return ocupada, livre
+
+def _altera_posicao(g, i, p):
+    '''
+    _altera_posicao: goban x intersecao x pedra → tuplo
+
+    Esta função auxiliar faz e desfaz a jogada da pedra p na interseção i do goban g, se i não for None,
+    e devolve o tuplo (g,). Num goban incremental, a pontuação seguinte tem de voltar a calcular as
+    regiões tocadas pela jogada, em vez de devolver a pontuação guardada da repetição anterior.
+    '''
+
+    if not i is None:
+        Go.desfaz_jogada(g, Go.faz_jogada(g, i, p))
+
+    return g,
+
+def _operacoes(g, n):
+    '''
+    _operacoes: goban x int → dicionário
+
+    Esta função auxiliar devolve um dicionário que associa o nome de cada operação medida ao par
+    (preparacao, operacao): preparacao devolve os argumentos (sem ser medida) e operacao é a função medida.
+    '''
+
+    ocupada, livre = _escolhe_intersecoes(g, n)
+    anterior = Go.cria_copia_goban(g)
+    preta = Go.cria_pedra_preta()
+
+    operacoes = {
+        'obtem_cadeia': (lambda: (g, ocupada), Go.obtem_cadeia),
+        'obtem_territorios': (lambda: _altera_posicao(g, livre, preta), Go.obtem_territorios),
+        'calcula_pontos': (lambda: _altera_posicao(g, livre, preta), Go.calcula_pontos),
+        'gobans_iguais': (lambda: (g, anterior), Go.gobans_iguais),
+        'goban_para_str': (lambda: (g,), Go.goban_para_str),
+    }
+
+    # Só há jogadas a medir se existir uma interseção livre legal
+    if not livre is None:
+        operacoes['eh_jogada_legal'] = (lambda: (g, livre, preta, anterior), Go.eh_jogada_legal)
+        operacoes['jogada'] = (lambda: (Go.cria_copia_goban(g), livre, preta), Go.jogada)
+
+    return operacoes
+
+def mede(preparacao, operacao, repeticoes):
+    '''
+    mede: função x função x int → tuplo
+
+    Esta função devolve o tuplo com as operações por segundo e a memória máxima alocada por operação,
+    em bytes, de operacao aplicada repeticoes vezes aos argumentos devolvidos por preparacao.
+    '''
+
+    # Tempo: só a operação é medida, cada repetição com argumentos novos
+    total = 0
+    for _ in range(repeticoes):
+        argumentos = preparacao()
+        inicio = time.perf_counter_ns()
+        operacao(*argumentos)
+        total += time.perf_counter_ns() - inicio
+
+    # Memória: pico de alocação de algumas repetições, descontando a memória já alocada
+    picos = []
+    tracemalloc.start()
+    for _ in range(min(repeticoes, 5)):
+        argumentos = preparacao()
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+        operacao(*argumentos)
+        picos += [tracemalloc.get_traced_memory()[1] - antes]
+        del argumentos
+    tracemalloc.stop()
+
+    return repeticoes * 1e9 / max(total, 1), sum(picos) // len(picos)
+
+def executa(representacoes, repeticoes, simulacoes=0, saida=sys.stdout):
+    '''
+    executa: tuplo x int x int x ficheiro → dicionário
+
+    Esta função mede todas as operações em todas as posições de teste, para cada representação
+    do goban, e o número de simulações por segundo de cada dimensão (se simulacoes for positivo),
+    escreve uma linha por medição em saida e devolve os resultados.
+    '''
+
+    resultados = {}
+    for representacao in representacoes:
+        for n in DIMENSOES:
+            for nome, (brancas, pretas) in gera_posicoes(n).items():
+                g = Go.cria_goban(n, brancas, pretas, representacao)
+                for operacao, (preparacao, funcao) in _operacoes(g, n).items():
+                    ops, memoria = mede(preparacao, funcao, repeticoes)
+                    chave = f'{representacao}/{n}/{nome}/{operacao}'
+                    resultados[chave] = {'ops_por_segundo': ops, 'bytes_por_operacao': memoria}
+                    print(f'{chave:<50} {ops:>14.1f} ops/s {memoria:>10} B/op', file=saida)
+
+    # As simulações por segundo são comparadas como as operações por segundo
+    for n in DIMENSOES if simulacoes > 0 else ():
+        vazio = Go.cria_goban_vazio(n)
+        medicao = Go.mede_simulacoes(vazio, Go.cria_pedra_preta(), vazio, simulacoes, SEMENTE)
+        chave = f'simulacoes/{n}'
+        resultados[chave] = {'ops_por_segundo': medicao['simulacoes_por_segundo']}
+        print(f'{chave:<50} {medicao["simulacoes_por_segundo"]:>14.1f} simulacoes/s', file=saida)
+
+    return resultados
+
+def guarda(resultados, caminho):
+    '''
+    guarda: dicionário x str → {}
+
+    Esta função guarda os resultados no ficheiro JSON caminho, com a descrição do ambiente.
+    '''
+
+    dados = {'versao': VERSAO,
+             'python': platform.python_version(),
+             'plataforma': platform.platform(),
+             'resultados': resultados}
+    with open(caminho, 'w') as ficheiro:
+        json.dump(dados, ficheiro, indent=2, sort_keys=True)
+
+def compara(resultados, caminho, tolerancia, saida=sys.stdout):
+    '''
+    compara: dicionário x str x float x ficheiro → lista
+
+    Esta função compara os resultados com os guardados no ficheiro JSON caminho, escreve a razão
+    entre as operações por segundo de cada medição e devolve a lista das medições que ficaram mais
+    lentas do que a tolerância permite.
+    '''
+
+    with open(caminho) as ficheiro:
+        base = json.load(ficheiro)
+    if not base.get('versao') == VERSAO:
+        raise ValueError('compara: versao do ficheiro de resultados invalida')
+
+    regressoes = []
+    for chave, medicao in resultados.items():
+        if not chave in base['resultados']:
+            continue
+        razao = medicao['ops_por_segundo'] / base['resultados'][chave]['ops_por_segundo']
+        lenta = razao < 1 - tolerancia
+        if lenta:
+            regressoes += [chave]
+        print(f'{chave:<50} {razao:>6.2f}x{"  REGRESSAO" if lenta else ""}', file=saida)
+
+    return regressoes
+
+def main(argumentos=None):
+    '''
+    main: lista → int
+
+    Esta função executa as medições com os argumentos da linha de comandos e devolve o código de
+    saída: 1 se alguma medição tiver ficado mais lenta do que a medição comparada e 0 caso contrário.
+    '''
+
+    parser = argparse.ArgumentParser(description='Mede o desempenho das operações do TAD goban.')
+    parser.add_argument('--repeticoes', type=int, default=50)
+    parser.add_argument('--representacoes', default=','.join(Go.REPRESENTACOES))
+    parser.add_argument('--guardar', help='ficheiro JSON onde guardar os resultados')
+    parser.add_argument('--comparar', help='ficheiro JSON com os resultados a comparar')
+    parser.add_argument('--simulacoes', type=int, default=0, help='simulações aleatórias por dimensão')
+    parser.add_argument('--tolerancia', type=float, default=0.2)
+    opcoes = parser.parse_args(argumentos)
+
+    representacoes = tuple(opcoes.representacoes.split(','))
+    if not all(representacao in Go.REPRESENTACOES for representacao in representacoes) or opcoes.repeticoes < 1:
+        parser.error('argumentos invalidos')
+
+    resultados = executa(representacoes, opcoes.repeticoes, opcoes.simulacoes)
+    if opcoes.guardar:
+        guarda(resultados, opcoes.guardar)
+    if opcoes.comparar:
+        return 1 if compara(resultados, opcoes.comparar, opcoes.tolerancia) else 0
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+'''
+Resolução exata de finais de partida com poucas interseções livres, com a pontuação de calcula_pontos.
+
+O valor de uma posição para o jogador a jogar é a diferença entre os seus pontos e os do adversário
+no fim da partida, com os dois a jogar da melhor forma. As regras são as de go: os jogadores jogam
+alternadamente, qualquer jogador pode passar, a partida termina quando os dois passam seguidos e uma
+jogada não pode repetir a posição anterior à última jogada do adversário (ou nenhuma posição
+anterior, com um histórico com superko).
+
+A procura é alfa-beta (negamax) com aprofundamento iterativo: cada iteração procura até uma
+profundidade maior, e as posições a essa profundidade são avaliadas com a pontuação atual. Quando uma
+iteração termina sem chegar à profundidade máxima em nenhuma posição, o valor é exato. As posições já
+procuradas são guardadas numa tabela de transposições de transposicoes.py, com o hash da posição,
+o jogador a jogar, se o adversário passou e a posição proibida pelo ko, e a sua melhor jogada é a primeira
+a ser procurada; seguem-se a passagem, as jogadas que capturam pedras e as restantes. Um jogador nunca
+joga num olho seu (ver eh_olho), o que evita as linhas em que os grupos vivos se matam a si próprios.
+Com superko, a tabela não distingue as posições pelo caminho que levou a elas.
+
+O valor só é exato quando todas as linhas de jogo terminam com duas passagens, o que acontece nos finais
+em que os grupos já estão vivos ou mortos e restam poucas interseções livres; nos restantes, o valor é
+o da última iteração completa, com 'exato' False.
+
+A procura termina ao fim de segundos segundos ou de max_nos nós, devolvendo o resultado da última
+iteração completa, e a tabela tem no máximo max_entradas entradas, o que limita a memória usada.
+'''
+
+import math
+import time
+
+import Go
+import transposicoes
+
+# Tipos dos valores guardados na tabela: exato, limite inferior e limite superior
+EXATO = 0
+INFERIOR = 1
+SUPERIOR = 2
+
+def _diferenca(pontuacao, p):
+    '''
+    _diferenca: tuplo x pedra → int
+
+    Esta função auxiliar devolve a diferença entre os pontos do jogador p e os do adversário
+    na pontuação (branco, preto).
+    '''
+
+    return pontuacao[0] - pontuacao[1] if Go.eh_pedra_branca(p) else pontuacao[1] - pontuacao[0]
+
+def _ordena_jogadas(g, p, h, primeira):
+    '''
+    _ordena_jogadas: goban x pedra x historico x int → lista
+
+    Esta função auxiliar devolve a lista das jogadas legais da pedra p (índices, e PASSAGEM),
+    pela ordem em que são procuradas: a jogada primeira, a passagem, as que capturam e as restantes.
+    As jogadas nos olhos de p não são devolvidas.
+    '''
+
+    capturas = []
+    restantes = []
+    for k in Go.indices_dos_bits(Go.mascara_jogadas_legais(g, p, h)):
+        if Go.eh_olho(g, k, p):
+            continue
+        if Go.avalia_jogada_incremental(g, k, p)[1]:
+            capturas += [k]
+        else:
+            restantes += [k]
+
+    jogadas = [Go.PASSAGEM] + capturas + restantes
+    if primeira in jogadas:
+        jogadas.remove(primeira)
+        jogadas.insert(0, primeira)
+
+    return jogadas
+
+def _negamax(procura, profundidade, alfa, beta, p, passou):
+    '''
+    _negamax: dicionário x int x num x num x pedra x booleano → tuplo
+
+    Esta função auxiliar devolve o tuplo com o valor da posição do goban da procura para o jogador p,
+    a jogar, procurada até à profundidade dada (entre alfa e beta), True se nenhuma posição chegou a essa
+    profundidade, e a melhor jogada, ou None se a procura se esgotou.
+    '''
+
+    if not Go.conta_no(procura):
+        return None
+
+    g = procura['goban']
+    h = procura['historico']
+    tabela = procura['tabela']
+
+    # A chave distingue as posições em que as jogadas legais ou o fim da partida são diferentes
+    proibida = h['sequencia'][-2] if len(h['sequencia']) >= 2 else None
+    chave = ('final', Go.obtem_hash(g), p, passou, proibida)
+    primeira = None
+    entrada = transposicoes.obtem_entrada(tabela, chave)
+    if not entrada is None:
+        profundidade_entrada, valor, tipo, jogada, completa = entrada
+        if completa or profundidade_entrada >= profundidade:
+            if tipo == EXATO or (tipo == INFERIOR and valor >= beta) or (tipo == SUPERIOR and valor <= alfa):
+                return valor, completa, jogada
+        primeira = jogada
+
+    if profundidade == 0:
+        return _diferenca(Go.calcula_pontos(g), p), False, None
+
+    alfa_inicial = alfa
+    melhor = -math.inf
+    melhor_jogada = None
+    completa = True
+    adversario = Go.obtem_pedra_adversaria(p)
+
+    for k in _ordena_jogadas(g, p, h, primeira):
+        if k == Go.PASSAGEM and passou:
+            # Os dois jogadores passaram seguidos e a partida termina
+            valor, completa_jogada = _diferenca(Go.calcula_pontos(g), p), True
+        else:
+            if k == Go.PASSAGEM:
+                Go.regista_goban(h, g)
+                resultado = _negamax(procura, profundidade - 1, -beta, -alfa, adversario, True)
+                Go.remove_ultima_posicao(h)
+            else:
+                registo = Go.faz_jogada(g, Go.intersecao_do_indice(k, g['n']), p, h)
+                resultado = _negamax(procura, profundidade - 1, -beta, -alfa, adversario, False)
+                Go.desfaz_jogada(g, registo)
+            if resultado is None:
+                return None
+            valor, completa_jogada = -resultado[0], resultado[1]
+
+        completa = completa and completa_jogada
+        if valor > melhor:
+            melhor, melhor_jogada = valor, k
+        alfa = max(alfa, valor)
+        if alfa >= beta:
+            break
+
+    tipo = SUPERIOR if melhor <= alfa_inicial else INFERIOR if melhor >= beta else EXATO
+    transposicoes.guarda_entrada(tabela, chave, (profundidade, melhor, tipo, melhor_jogada, completa))
+
+    return melhor, completa, melhor_jogada
+
+def resolve_final(g, p, l=None, adversario_passou=False, segundos=None, max_nos=None, max_entradas=1000000,
+                  tabela=None):
+    '''
+    resolve_final: goban x pedra x (goban ou historico) x booleano x float x int x int x tabela → dicionário
+
+    Esta função procura o valor da posição do goban g para o jogador p, a jogar, com l o goban anterior
+    ou o histórico da partida e adversario_passou True se o adversário passou na última jogada, durante
+    no máximo segundos segundos ou max_nos nós (pelo menos um dos limites tem de ser dado). A tabela de
+    transposições é criada com max_entradas entradas, ou é a tabela dada, para a reutilizar entre procuras.
+
+    Devolve um dicionário com o valor ('valor', os pontos de p menos os do adversário), a melhor jogada
+    ('jogada', uma interseção, ou None para passar), se o valor é exato ('exato'), a profundidade da
+    última iteração completa ('profundidade'), o número de nós ('nos'), os segundos ('segundos'), os nós
+    por segundo ('nos_por_segundo') e as estatísticas da tabela ('tabela', ver estatisticas_tabela).
+    O valor e a jogada são None se nenhuma iteração terminou.
+    '''
+
+    if not Go.eh_goban(g) or not Go.eh_pedra_jogador(p) or (segundos is None and max_nos is None):
+        raise ValueError('resolve_final: argumentos invalidos')
+
+    inicio = time.perf_counter()
+    g = Go.cria_copia_goban(g) if Go.eh_goban_incremental(g) else Go.converte_goban(g, 'incremental')
+
+    # O histórico da procura começa com as posições já ocorridas
+    h = Go.copia_historico(l, g)
+
+    if tabela is None:
+        tabela = transposicoes.cria_tabela(max_entradas)
+    procura = {'goban': g, 'historico': h, 'tabela': tabela, **Go.cria_orcamento(max_nos, segundos)}
+
+    # Aprofundamento iterativo até o valor ser exato ou a procura se esgotar
+    resultado = None
+    profundidade = 0
+    while True:
+        iteracao = _negamax(procura, profundidade + 1, -math.inf, math.inf, p, adversario_passou)
+        if iteracao is None:
+            break
+        resultado = iteracao
+        profundidade += 1
+        if iteracao[1]:
+            break
+
+    segundos = time.perf_counter() - inicio
+    valor, exato, jogada = (None, False, None) if resultado is None else resultado
+
+    return {'valor': valor,
+            'jogada': None if jogada is None or jogada == Go.PASSAGEM else Go.intersecao_do_indice(jogada, g['n']),
+            'exato': exato, 'profundidade': profundidade, 'nos': procura['nos'], 'segundos': segundos,
+            'nos_por_segundo': procura['nos'] / segundos if segundos > 0 else 0.0,
+            'tabela': transposicoes.estatisticas_tabela(tabela)}
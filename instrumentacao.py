@@ -0,0 +1,214 @@
+'''
+Instrumentação das funções principais de Go.py: número de chamadas, tempo acumulado e tamanho das
+cadeias e territórios devolvidos.
+
+Quando a instrumentação está ativa, as funções de INSTRUMENTADAS são substituídas no módulo Go por
+versões que contam as chamadas e medem o seu tempo (o de uma chamada inclui o das funções que chama,
+mas não é contado duas vezes numa chamada recursiva da mesma função). Como as funções de Go.py se
+chamam pelo nome do módulo, as chamadas internas também são contadas. Quando está desativada, as
+funções originais são repostas e a instrumentação não tem qualquer custo.
+
+As contagens são um dicionário que associa o nome de cada função chamada a um dicionário com o número
+de chamadas ('chamadas'), o tempo acumulado em nanossegundos ('tempo_ns') e, nas funções que devolvem
+cadeias ou territórios (obtem_cadeia e obtem_territorios), o número de conjuntos devolvidos ('conjuntos'),
+a soma ('intersecoes') e o máximo ('maximo') do número de interseções de cada conjunto. As liberdades
+e fronteiras devolvidas por obtem_adjacentes_diferentes não são cadeias nem territórios, pelo que
+só as suas chamadas e o seu tempo são contados.
+
+Utilização:
+    instrumentacao.ativa('relatorio.json')   # o relatório é escrito no fim de cada go
+    Go.go(9, (), ())
+    print(instrumentacao.relatorio_texto())
+    instrumentacao.desativa()
+'''
+
+import functools
+import json
+import time
+
+import Go
+
+# Funções instrumentadas e a forma de obter os conjuntos de interseções que devolvem
+_CONJUNTO = lambda resultado: (resultado,)
+_CONJUNTOS = lambda resultado: resultado
+INSTRUMENTADAS = {'obtem_cadeia': _CONJUNTO, 'obtem_territorios': _CONJUNTOS,
+                  'obtem_adjacentes_diferentes': None, 'remove_cadeia': None,
+                  'gobans_iguais': None, 'gobans_iguais_sem_verificacao': None, 'eh_goban': None,
+                  'cria_copia_goban': None, 'converte_goban': None, 'goban_para_str': None,
+                  'jogada': None, 'eh_jogada_legal': None, 'eh_jogada_legal_sem_verificacao': None,
+                  'mascara_jogadas_legais': None, 'faz_jogada': None, 'desfaz_jogada': None,
+                  'obtem_hash': None, 'calcula_pontos': None}
+
+# Funções originais substituídas, contagens e estado da instrumentação
+_ORIGINAIS = {}
+_CONTAGENS = {}
+_ESTADO = {'relatorio': None, 'profundidade': {}}
+
+def _cria_contagem():
+    '''
+    _cria_contagem: {} → dicionário
+
+    Esta função auxiliar devolve a contagem de uma função ainda não chamada.
+    '''
+
+    return {'chamadas': 0, 'tempo_ns': 0, 'conjuntos': 0, 'intersecoes': 0, 'maximo': 0}
+
+def _instrumenta(nome, funcao, conjuntos):
+    '''
+    _instrumenta: str x função x função → função
+
+    Esta função auxiliar devolve a versão instrumentada da função de Go.py com o nome dado, que obtém
+    os conjuntos de interseções do resultado com a função conjuntos, se não for None.
+    '''
+
+    contagem = _CONTAGENS.setdefault(nome, _cria_contagem())
+    profundidade = _ESTADO['profundidade']
+    profundidade[nome] = 0
+
+    @functools.wraps(funcao)
+    def instrumentada(*args, **kwargs):
+        contagem['chamadas'] += 1
+        profundidade[nome] += 1
+        inicio = time.perf_counter_ns()
+        try:
+            resultado = funcao(*args, **kwargs)
+        finally:
+            profundidade[nome] -= 1
+            # Numa chamada recursiva só a chamada exterior conta o tempo
+            if profundidade[nome] == 0:
+                contagem['tempo_ns'] += time.perf_counter_ns() - inicio
+
+        if not conjuntos is None:
+            for conjunto in conjuntos(resultado):
+                contagem['conjuntos'] += 1
+                contagem['intersecoes'] += len(conjunto)
+                contagem['maximo'] = max(contagem['maximo'], len(conjunto))
+
+        return resultado
+
+    return instrumentada
+
+def _go_instrumentado(funcao):
+    '''
+    _go_instrumentado: função → função
+
+    Esta função auxiliar devolve a versão da função go que escreve o relatório no fim de cada jogo.
+    '''
+
+    @functools.wraps(funcao)
+    def go(*args, **kwargs):
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            if not _ESTADO['relatorio'] is None:
+                escreve_relatorio(_ESTADO['relatorio'])
+
+    return go
+
+def esta_ativa():
+    '''
+    esta_ativa: {} → booleano
+
+    Esta função devolve True se a instrumentação estiver ativa e False caso contrário.
+    '''
+
+    return bool(_ORIGINAIS)
+
+def ativa(relatorio=None):
+    '''
+    ativa: str → {}
+
+    Esta função ativa a instrumentação, substituindo as funções de INSTRUMENTADAS no módulo Go.
+    Se relatorio for o caminho de um ficheiro, as contagens são escritas nele em JSON no fim de cada go.
+    As contagens anteriores são mantidas (ver reinicia).
+    '''
+
+    _ESTADO['relatorio'] = relatorio
+    if esta_ativa():
+        return
+
+    for nome, conjuntos in INSTRUMENTADAS.items():
+        _ORIGINAIS[nome] = getattr(Go, nome)
+        setattr(Go, nome, _instrumenta(nome, _ORIGINAIS[nome], conjuntos))
+    _ORIGINAIS['go'] = Go.go
+    Go.go = _go_instrumentado(Go.go)
+
+def desativa():
+    '''
+    desativa: {} → {}
+
+    Esta função desativa a instrumentação, repondo as funções originais no módulo Go.
+    As contagens são mantidas.
+    '''
+
+    for nome, funcao in _ORIGINAIS.items():
+        setattr(Go, nome, funcao)
+    _ORIGINAIS.clear()
+    _ESTADO['relatorio'] = None
+
+def reinicia():
+    '''
+    reinicia: {} → {}
+
+    Esta função põe a zero as contagens de todas as funções.
+    '''
+
+    for contagem in _CONTAGENS.values():
+        contagem.update(_cria_contagem())
+
+def obtem_contagens():
+    '''
+    obtem_contagens: {} → dicionário
+
+    Esta função devolve uma cópia das contagens das funções já chamadas.
+    '''
+
+    return {nome: dict(contagem) for nome, contagem in _CONTAGENS.items() if contagem['chamadas'] > 0}
+
+def acumula(contagens):
+    '''
+    acumula: dicionário → {}
+
+    Esta função soma às contagens atuais as contagens dadas, por exemplo as obtidas noutro processo.
+    '''
+
+    for nome, outra in contagens.items():
+        contagem = _CONTAGENS.setdefault(nome, _cria_contagem())
+        for campo in ('chamadas', 'tempo_ns', 'conjuntos', 'intersecoes'):
+            contagem[campo] += outra[campo]
+        contagem['maximo'] = max(contagem['maximo'], outra['maximo'])
+
+def relatorio_texto(contagens=None):
+    '''
+    relatorio_texto: dicionário → str
+
+    Esta função devolve a cadeia de caracteres com uma tabela das contagens dadas (por omissão as
+    atuais), das funções com mais tempo acumulado para as com menos.
+    '''
+
+    if contagens is None:
+        contagens = obtem_contagens()
+
+    linhas = [f'{"funcao":<34}{"chamadas":>11}{"tempo (ms)":>12}{"us/chamada":>12}{"tamanho medio":>15}{"maximo":>8}']
+    for nome, contagem in sorted(contagens.items(), key=lambda item: -item[1]['tempo_ns']):
+        por_chamada = contagem['tempo_ns'] / contagem['chamadas'] / 1e3 if contagem['chamadas'] else 0.0
+        if contagem['conjuntos']:
+            tamanhos = f'{contagem["intersecoes"] / contagem["conjuntos"]:>15.1f}{contagem["maximo"]:>8}'
+        else:
+            tamanhos = f'{"-":>15}{"-":>8}'
+        linhas += [f'{nome:<34}{contagem["chamadas"]:>11}{contagem["tempo_ns"] / 1e6:>12.1f}{por_chamada:>12.2f}{tamanhos}']
+
+    return '\n'.join(linhas)
+
+def escreve_relatorio(caminho, contagens=None):
+    '''
+    escreve_relatorio: str x dicionário → {}
+
+    Esta função escreve no ficheiro caminho, em JSON, as contagens dadas (por omissão as atuais).
+    '''
+
+    if contagens is None:
+        contagens = obtem_contagens()
+
+    with open(caminho, 'w') as ficheiro:
+        json.dump(contagens, ficheiro, indent=2, sort_keys=True)
@@ -0,0 +1,293 @@
+'''
+Reprodução e pontuação de grandes conjuntos de partidas num conjunto de processos.
+
+Cada partida é um dicionário com a dimensão do goban ('n'), os tuplos das interseções inicialmente
+ocupadas por pedras brancas e pretas, como em cria_goban ('ib', 'ip'), a lista das jogadas
+('jogadas', como em reproduz_partida) e, opcionalmente, a regra do superko ('superko').
+Cada partida é identificada pela sua posição na sequência de partidas ('indice'). Uma partida que não
+pôde ser lida é o dicionário com a mensagem de erro ('erro'), e o seu resultado tem essa mensagem,
+como o de uma partida inválida, sem interromper a execução.
+
+As partidas são lidas à medida que são precisas, divididas em lotes e distribuídas pelos processos,
+com um número máximo de lotes pendentes, pelo que a memória usada não depende do número de partidas.
+Os resultados podem ser devolvidos pela ordem das partidas ou à medida que ficam prontos.
+Escritos num ficheiro, um resultado por linha em JSON, permitem retomar a execução depois de uma
+interrupção, saltando as partidas que já têm resultado.
+
+Utilização:
+    python lote.py partidas.jsonl resultados.jsonl [--trabalhadores N] [--tamanho-lote N] [--ordenado]
+    python lote.py partidas.sgf resultados.jsonl ... [--instrumentacao relatorio.json]
+'''
+
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import sys
+
+import Go
+import instrumentacao
+import sgf
+
+def reproduz(indice, jogo):
+    '''
+    reproduz: int x dicionário → dicionário
+
+    Esta função reproduz a partida jogo e devolve o seu resultado: o índice da partida ('indice'),
+    a pontuação final (branco, preto) ('pontuacao'), a pedra do vencedor pela regra de go ('vencedor'),
+    a posição e a representação externa da primeira jogada ilegal, ou None ('jogada_ilegal'), e a
+    mensagem de erro se a partida for inválida, ou None ('erro').
+    '''
+
+    resultado = {'indice': indice, 'pontuacao': None, 'vencedor': None, 'jogada_ilegal': None, 'erro': None}
+    if 'erro' in jogo:
+        resultado['erro'] = jogo['erro']
+        return resultado
+
+    try:
+        goban, pontuacao, ilegal = Go.reproduz_partida(jogo['n'], jogo['ib'], jogo['ip'], jogo['jogadas'],
+                                                       jogo.get('superko', False))
+    except (ValueError, TypeError, KeyError) as erro:
+        resultado['erro'] = str(erro)
+        return resultado
+
+    resultado['pontuacao'] = pontuacao
+    resultado['vencedor'] = Go.pedra_para_str(Go.cria_pedra_branca() if pontuacao[0] > pontuacao[1] else Go.cria_pedra_preta())
+    if not ilegal is None:
+        numero, jogada = ilegal
+        resultado['jogada_ilegal'] = (numero, Go.intersecao_para_str(jogada) if Go.eh_intersecao(jogada) else repr(jogada))
+
+    return resultado
+
+def _reproduz_lote(lote, instrumentado=False):
+    '''
+    _reproduz_lote: lista x booleano → tuplo
+
+    Esta função auxiliar reproduz as partidas do lote, uma lista de pares (indice, jogo), e devolve
+    o tuplo com a lista dos seus resultados e, se instrumentado for True, as contagens da
+    instrumentação durante o lote (ou None). É a função executada por cada processo.
+    '''
+
+    if not instrumentado:
+        return [reproduz(indice, jogo) for indice, jogo in lote], None
+
+    instrumentacao.ativa()
+    instrumentacao.reinicia()
+    try:
+        resultados = [reproduz(indice, jogo) for indice, jogo in lote]
+    finally:
+        instrumentacao.desativa()
+
+    return resultados, instrumentacao.obtem_contagens()
+
+def _divide_em_lotes(jogos, tamanho_lote, concluidos):
+    '''
+    _divide_em_lotes: iterável x int x conjunto → gerador
+
+    Esta função auxiliar produz as listas de até tamanho_lote pares (indice, jogo) das partidas,
+    saltando as partidas cujo índice está em concluidos.
+    '''
+
+    lote = []
+    indice = 0
+    for jogo in jogos:
+        if not indice in concluidos:
+            lote += [(indice, jogo)]
+            if len(lote) == tamanho_lote:
+                yield lote
+                lote = []
+        indice += 1
+
+    if lote:
+        yield lote
+
+def _recolhe(pendentes, ordenado):
+    '''
+    _recolhe: deque x booleano → lista
+
+    Esta função auxiliar espera pelos lotes pendentes e devolve os seus resultados: o do lote mais
+    antigo, se ordenado for True, ou os de todos os lotes já terminados, caso contrário.
+    As contagens da instrumentação de cada lote são somadas às deste processo.
+    '''
+
+    if ordenado:
+        terminados = [pendentes.popleft()]
+    else:
+        terminados, _ = concurrent.futures.wait(pendentes, return_when=concurrent.futures.FIRST_COMPLETED)
+        terminados = [futuro for futuro in pendentes if futuro in terminados]
+        for futuro in terminados:
+            pendentes.remove(futuro)
+
+    resultados = []
+    for futuro in terminados:
+        resultados_lote, contagens = futuro.result()
+        resultados += resultados_lote
+        if not contagens is None:
+            instrumentacao.acumula(contagens)
+
+    return resultados
+
+def executa_lote(jogos, trabalhadores=None, tamanho_lote=64, ordenado=True, max_pendentes=None, concluidos=()):
+    '''
+    executa_lote: iterável x int x int x booleano x int x conjunto → gerador
+
+    Esta função reproduz as partidas em trabalhadores processos (tantos quantos os processadores,
+    por omissão), em lotes de tamanho_lote partidas, e produz o resultado de cada partida (ver reproduz),
+    pela ordem das partidas se ordenado for True. No máximo max_pendentes lotes (por omissão o dobro
+    dos trabalhadores) são lidos antes de os seus resultados serem produzidos. As partidas cujo índice
+    está em concluidos são saltadas. Se a instrumentação estiver ativa, as contagens de todos os
+    processos são somadas às deste processo.
+    '''
+
+    if trabalhadores is None:
+        trabalhadores = os.cpu_count() or 1
+    if trabalhadores < 1 or tamanho_lote < 1:
+        raise ValueError('executa_lote: argumentos invalidos')
+    if max_pendentes is None:
+        max_pendentes = 2 * trabalhadores
+
+    lotes = _divide_em_lotes(jogos, tamanho_lote, set(concluidos))
+
+    # Com um único trabalhador as partidas são reproduzidas no próprio processo
+    if trabalhadores == 1:
+        for lote in lotes:
+            yield from _reproduz_lote(lote)[0]
+        return
+
+    instrumentado = instrumentacao.esta_ativa()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        pendentes = collections.deque()
+        for lote in lotes:
+            pendentes.append(executor.submit(_reproduz_lote, lote, instrumentado))
+            while len(pendentes) >= max_pendentes:
+                yield from _recolhe(pendentes, ordenado)
+        while pendentes:
+            yield from _recolhe(pendentes, ordenado)
+
+def le_concluidos(caminho):
+    '''
+    le_concluidos: str → conjunto
+
+    Esta função devolve o conjunto dos índices das partidas com resultado no ficheiro caminho e
+    remove do fim do ficheiro uma linha incompleta, deixada por uma interrupção.
+    '''
+
+    concluidos = set()
+    if not os.path.exists(caminho):
+        return concluidos
+
+    completo = 0
+    with open(caminho, 'rb') as ficheiro:
+        for linha in ficheiro:
+            if not linha.endswith(b'\n'):
+                break
+            try:
+                concluidos.add(json.loads(linha)['indice'])
+            except (ValueError, KeyError, TypeError):
+                break
+            completo += len(linha)
+
+    # O que estiver depois da última linha completa é descartado
+    if completo < os.path.getsize(caminho):
+        with open(caminho, 'r+b') as ficheiro:
+            ficheiro.truncate(completo)
+
+    return concluidos
+
+def executa_lote_para_ficheiro(jogos, caminho, trabalhadores=None, tamanho_lote=64, ordenado=False):
+    '''
+    executa_lote_para_ficheiro: iterável x str x int x int x booleano → int
+
+    Esta função acrescenta ao ficheiro caminho, uma linha em JSON por partida, os resultados das
+    partidas que ainda não têm resultado nesse ficheiro, e devolve o número de resultados escritos.
+    Se a execução for interrompida, basta repeti-la com as mesmas partidas para a retomar.
+    '''
+
+    concluidos = le_concluidos(caminho)
+    escritos = 0
+    with open(caminho, 'a') as ficheiro:
+        for resultado in executa_lote(jogos, trabalhadores, tamanho_lote, ordenado, concluidos=concluidos):
+            ficheiro.write(json.dumps(resultado) + '\n')
+            escritos += 1
+            # Cada lote terminado fica no disco antes de se continuar
+            if escritos % tamanho_lote == 0:
+                ficheiro.flush()
+
+    return escritos
+
+def _intersecao_do_json(valor):
+    '''
+    _intersecao_do_json: universal → universal
+
+    Esta função auxiliar devolve a interseção representada em JSON por valor, a sua representação
+    externa ou a lista [coluna, linha], ou o próprio valor se não for nenhuma das duas.
+    '''
+
+    if Go.str_intersecao_valida(valor):
+        return Go.str_para_intersecao(valor)
+    if isinstance(valor, list) and len(valor) == 2:
+        return Go.cria_intersecao(valor[0], valor[1]) if Go.eh_intersecao(tuple(valor)) else tuple(valor)
+
+    return valor
+
+def le_jogos(caminho):
+    '''
+    le_jogos: str → gerador
+
+    Esta função produz, uma de cada vez, as partidas do ficheiro caminho, com uma partida por linha
+    em JSON, em que as interseções são representações externas ou listas [coluna, linha]. Uma linha
+    inválida é substituída pelo dicionário com a mensagem de erro ('erro').
+    '''
+
+    with open(caminho) as ficheiro:
+        numero = 0
+        for linha in ficheiro:
+            numero += 1
+            if not linha.strip():
+                continue
+            try:
+                dados = json.loads(linha)
+                yield {'n': dados.get('n'),
+                       'ib': tuple(_intersecao_do_json(i) for i in dados.get('ib', ())),
+                       'ip': tuple(_intersecao_do_json(i) for i in dados.get('ip', ())),
+                       'jogadas': [_intersecao_do_json(jogada) for jogada in dados.get('jogadas', ())],
+                       'superko': dados.get('superko', False)}
+            except (ValueError, TypeError, AttributeError) as erro:
+                yield {'erro': f'linha {numero}: {erro}'}
+
+def main(argumentos=None):
+    '''
+    main: lista → int
+
+    Esta função reproduz as partidas de um ficheiro com os argumentos da linha de comandos,
+    acrescentando os resultados ao ficheiro de resultados, e devolve o código de saída.
+    '''
+
+    parser = argparse.ArgumentParser(description='Reproduz e pontua partidas num conjunto de processos.')
+    parser.add_argument('partidas', help='ficheiro com uma partida por linha em JSON, ou ficheiro SGF (.sgf)')
+    parser.add_argument('resultados', help='ficheiro onde acrescentar os resultados (retomado se existir)')
+    parser.add_argument('--trabalhadores', type=int, default=None)
+    parser.add_argument('--tamanho-lote', type=int, default=64)
+    parser.add_argument('--ordenado', action='store_true', help='escreve os resultados pela ordem das partidas')
+    parser.add_argument('--instrumentacao', default=None, metavar='RELATORIO',
+                        help='conta as chamadas das funções de Go.py e escreve o relatório em JSON')
+    opcoes = parser.parse_args(argumentos)
+
+    if not opcoes.instrumentacao is None:
+        instrumentacao.ativa()
+
+    jogos = sgf.le_partidas(opcoes.partidas, erros=True) if opcoes.partidas.endswith('.sgf') else le_jogos(opcoes.partidas)
+    escritos = executa_lote_para_ficheiro(jogos, opcoes.resultados, opcoes.trabalhadores,
+                                          opcoes.tamanho_lote, opcoes.ordenado)
+    print(f'{escritos} partidas reproduzidas', file=sys.stderr)
+
+    if not opcoes.instrumentacao is None:
+        instrumentacao.desativa()
+        instrumentacao.escreve_relatorio(opcoes.instrumentacao)
+        print(instrumentacao.relatorio_texto(), file=sys.stderr)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
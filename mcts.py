@@ -0,0 +1,270 @@
+'''
+Jogador de Go por procura em árvore de Monte Carlo (MCTS).
+
+O TAD jogador_mcts é usado para representar um jogador automático que escolhe as suas jogadas
+com uma procura em árvore de Monte Carlo (UCT), com simulações aleatórias até ao fim do jogo.
+
+-Cada jogador_mcts é representado por um dicionário com o número de simulações por jogada ('simulacoes'),
+o tempo máximo por jogada em segundos ('segundos'), o número de processos ('trabalhadores'), a semente
+('semente'), a constante de exploração ('exploracao'), o conjunto de processos, criado na primeira jogada
+('executor'), e as estatísticas da última jogada ('estatisticas').
+
+Com mais do que um trabalhador, cada processo constrói a sua própria árvore a partir da mesma posição
+(paralelismo na raiz) e as visitas e vitórias de cada jogada da raiz são somadas no fim. Cada árvore
+usa o seu fluxo da semente, determinado pela posição e pelo número do trabalhador, pelo que, com um
+limite de simulações e sem limite de tempo, a jogada escolhida só depende da semente e do número de
+trabalhadores. A legalidade das jogadas e a pontuação são as das funções de Go.py.
+
+Utilização como fonte de jogadas:
+    jogador = cria_jogador_mcts(simulacoes=2000, trabalhadores=4, semente=1)
+    Go.go(9, (), (), fonte_branco=fonte_mcts(jogador))
+    termina_jogador_mcts(jogador)
+'''
+
+import concurrent.futures
+import math
+import time
+
+import Go
+
+def cria_jogador_mcts(simulacoes=1000, segundos=None, trabalhadores=1, semente=0, exploracao=1.4):
+    '''
+    cria_jogador_mcts: int x float x int x int x float → jogador_mcts
+
+    Esta função devolve um jogador que faz até simulacoes simulações por jogada (sem limite se for None),
+    durante no máximo segundos segundos (sem limite se for None), repartidas por trabalhadores processos.
+    '''
+
+    if simulacoes is None and segundos is None:
+        raise ValueError('cria_jogador_mcts: argumentos invalidos')
+    if not simulacoes is None and (not isinstance(simulacoes, int) or simulacoes < 1):
+        raise ValueError('cria_jogador_mcts: argumentos invalidos')
+    if not segundos is None and (not isinstance(segundos, (int, float)) or segundos <= 0):
+        raise ValueError('cria_jogador_mcts: argumentos invalidos')
+    if not isinstance(trabalhadores, int) or trabalhadores < 1 or not isinstance(semente, int):
+        raise ValueError('cria_jogador_mcts: argumentos invalidos')
+
+    return {'simulacoes': simulacoes, 'segundos': segundos, 'trabalhadores': trabalhadores,
+            'semente': semente, 'exploracao': exploracao, 'executor': None, 'estatisticas': None}
+
+def termina_jogador_mcts(jogador):
+    '''
+    termina_jogador_mcts: jogador_mcts → {}
+
+    Esta função termina os processos do jogador, se existirem.
+    '''
+
+    if not jogador['executor'] is None:
+        jogador['executor'].shutdown()
+        jogador['executor'] = None
+
+def fonte_mcts(jogador):
+    '''
+    fonte_mcts: jogador_mcts → função
+
+    Esta função devolve a fonte de jogadas do jogador para joga_partida e go: uma função que recebe
+    o goban, a pedra do jogador e o histórico e devolve a interseção escolhida, ou 'P' para passar.
+    O adversário passou se o goban recebido for o goban deixado pela última jogada da fonte.
+    '''
+
+    deixado = [None]
+
+    def fonte(g, p, h):
+        intersecao = escolhe_jogada_mcts(jogador, g, p, h, Go.obtem_hash(g) == deixado[0])
+        if intersecao is None:
+            deixado[0] = Go.obtem_hash(g)
+            return 'P'
+
+        copia = Go.cria_copia_goban(g)
+        Go.jogada(copia, intersecao, p)
+        deixado[0] = Go.obtem_hash(copia)
+        return intersecao
+
+    return fonte
+
+def escolhe_jogada_mcts(jogador, g, p, l, adversario_passou=False):
+    '''
+    escolhe_jogada_mcts: jogador_mcts x goban x pedra x (goban ou historico) x booleano → intersecao
+
+    Esta função devolve a interseção da jogada escolhida pelo jogador para a pedra p no goban g,
+    com l o goban anterior ou o histórico da partida, ou None se o jogador passar. Se o adversário
+    tiver passado na última jogada, uma passagem termina o jogo. As visitas e vitórias de cada jogada
+    da raiz ficam em jogador['estatisticas'].
+    '''
+
+    n = Go.obtem_tamanho(g)
+    g = Go.cria_copia_goban(g) if Go.eh_goban_incremental(g) else Go.converte_goban(g, 'incremental')
+    h = Go.copia_historico(l, g)
+
+    # Se o adversário passou e o jogador está a ganhar, passar termina o jogo
+    if adversario_passou and _vencedor(Go.calcula_pontos(g)) == p:
+        jogador['estatisticas'] = {'simulacoes': 0, 'jogadas': {}}
+        return None
+
+    # As simulações são repartidas pelos trabalhadores, cada um com o seu fluxo da semente
+    trabalhadores = jogador['trabalhadores']
+    tarefas = []
+    for trabalhador in range(trabalhadores):
+        simulacoes = None
+        if not jogador['simulacoes'] is None:
+            simulacoes = jogador['simulacoes'] // trabalhadores + (1 if trabalhador < jogador['simulacoes'] % trabalhadores else 0)
+        fluxo = f'{Go.obtem_hash(g)}:{trabalhadores}:{trabalhador}'
+        tarefas += [(g, h, p, 1 if adversario_passou else 0, simulacoes, jogador['segundos'], jogador['semente'],
+                     fluxo, jogador['exploracao'])]
+
+    if trabalhadores == 1:
+        resultados = [_procura(tarefas[0])]
+    else:
+        if jogador['executor'] is None:
+            jogador['executor'] = concurrent.futures.ProcessPoolExecutor(max_workers=trabalhadores)
+        resultados = list(jogador['executor'].map(_procura, tarefas))
+
+    # Junta as visitas e vitórias de cada jogada da raiz, pela ordem dos trabalhadores
+    jogadas = {}
+    total = 0
+    for simulacoes, estatisticas in resultados:
+        total += simulacoes
+        for k, (visitas, vitorias) in estatisticas.items():
+            anterior = jogadas.get(k, (0, 0))
+            jogadas[k] = (anterior[0] + visitas, anterior[1] + vitorias)
+    jogador['estatisticas'] = {'simulacoes': total, 'jogadas': jogadas}
+
+    # Escolhe a jogada mais visitada (em caso de empate, a de menor índice)
+    if not jogadas:
+        return None
+    escolhida = min(jogadas, key=lambda k: (-jogadas[k][0], k))
+    if escolhida == Go.PASSAGEM:
+        return None
+
+    # A jogada devolvida é sempre confirmada pelas regras de Go.py
+    intersecao = Go.intersecao_do_indice(escolhida, n)
+    if not Go.eh_jogada_legal(g, intersecao, p, h):
+        return None
+
+    return intersecao
+
+def _vencedor(pontuacao):
+    '''
+    _vencedor: tuplo → pedra
+
+    Esta função auxiliar devolve a pedra do jogador que ganha com a pontuação (branco, preto) dada,
+    pela regra da função go: o branco só ganha com mais pontos do que o preto.
+    '''
+
+    return Go.cria_pedra_branca() if pontuacao[0] > pontuacao[1] else Go.cria_pedra_preta()
+
+def _cria_no(jogada, pedra):
+    '''
+    _cria_no: int x pedra → dicionário
+
+    Esta função auxiliar devolve um nó da árvore para a jogada (um índice ou PASSAGEM) feita pela pedra dada.
+    '''
+
+    return {'jogada': jogada, 'pedra': pedra, 'visitas': 0, 'vitorias': 0, 'filhos': [], 'por_expandir': None}
+
+def _jogadas_candidatas(g, p, h, gerador):
+    '''
+    _jogadas_candidatas: goban x pedra x historico x gerador → lista
+
+    Esta função auxiliar devolve, por uma ordem aleatória, os índices das jogadas legais da pedra p
+    que não preenchem um olho próprio, ou só a passagem se não houver nenhuma.
+    '''
+
+    mascara = Go.mascara_jogadas_legais(g, p, h)
+    candidatas = [k for k in Go.indices_dos_bits(mascara) if not Go.eh_olho(g, k, p)]
+    gerador.shuffle(candidatas)
+
+    return candidatas if candidatas else [Go.PASSAGEM]
+
+def _aplica_jogada(g, h, k, p):
+    '''
+    _aplica_jogada: goban x historico x int x pedra → {}
+
+    Esta função auxiliar faz a jogada k (um índice ou PASSAGEM) da pedra p no goban incremental g
+    e regista a posição resultante no histórico h.
+    '''
+
+    if not k == Go.PASSAGEM:
+        Go.joga_incremental(g, k, p)
+    Go.regista_goban(h, g)
+
+def _seleciona(no, exploracao):
+    '''
+    _seleciona: dicionário x float → dicionário
+
+    Esta função auxiliar devolve o filho do nó com o maior valor UCT (em caso de empate, o primeiro).
+    '''
+
+    logaritmo = math.log(no['visitas'])
+    melhor = None
+    melhor_valor = None
+    for filho in no['filhos']:
+        valor = filho['vitorias'] / filho['visitas'] + exploracao * math.sqrt(logaritmo / filho['visitas'])
+        if melhor is None or valor > melhor_valor:
+            melhor = filho
+            melhor_valor = valor
+
+    return melhor
+
+def _procura(tarefa):
+    '''
+    _procura: tuplo → tuplo
+
+    Esta função auxiliar constrói uma árvore de procura a partir do goban e do histórico da tarefa,
+    com o seu fluxo da semente, e devolve o número de simulações feitas e o dicionário que associa
+    cada jogada da raiz às suas visitas e vitórias. Como é executada noutros processos, recebe todos
+    os argumentos num único tuplo.
+    '''
+
+    g_raiz, h_raiz, p, passagens_raiz, simulacoes, segundos, semente, fluxo, exploracao = tarefa
+    gerador = Go.cria_gerador(semente, fluxo)
+    limite = None if segundos is None else time.perf_counter() + segundos
+
+    raiz = _cria_no(None, Go.obtem_pedra_adversaria(p))
+    feitas = 0
+
+    while (simulacoes is None or feitas < simulacoes) and (limite is None or time.perf_counter() < limite):
+        g = Go.cria_copia_goban(g_raiz)
+        h = Go.copia_historico(h_raiz)
+        no = raiz
+        caminho = [raiz]
+        pedra = p
+        passagens = passagens_raiz
+
+        # Seleção: desce pelos nós completamente expandidos
+        while True:
+            if passagens >= 2:
+                no['por_expandir'] = []
+            elif no['por_expandir'] is None:
+                no['por_expandir'] = _jogadas_candidatas(g, pedra, h, gerador)
+            if no['por_expandir'] or not no['filhos']:
+                break
+            no = _seleciona(no, exploracao)
+            _aplica_jogada(g, h, no['jogada'], pedra)
+            passagens = passagens + 1 if no['jogada'] == Go.PASSAGEM else 0
+            caminho += [no]
+            pedra = Go.obtem_pedra_adversaria(pedra)
+
+        # Expansão: acrescenta um filho por uma jogada ainda não experimentada
+        if no['por_expandir']:
+            filho = _cria_no(no['por_expandir'].pop(), pedra)
+            no['filhos'] += [filho]
+            _aplica_jogada(g, h, filho['jogada'], pedra)
+            passagens = passagens + 1 if filho['jogada'] == Go.PASSAGEM else 0
+            caminho += [filho]
+            pedra = Go.obtem_pedra_adversaria(pedra)
+
+        # Simulação até ao fim do jogo (um jogo terminado é pontuado diretamente)
+        if passagens >= 2:
+            vencedor = _vencedor(Go.calcula_pontos(g))
+        else:
+            vencedor = _vencedor(Go.simula_partida(g, pedra, h, gerador))
+
+        # Retropropagação: cada nó conta as vitórias do jogador que fez a sua jogada
+        for no in caminho:
+            no['visitas'] += 1
+            if no['pedra'] == vencedor:
+                no['vitorias'] += 1
+        feitas += 1
+
+    return feitas, {filho['jogada']: (filho['visitas'], filho['vitorias']) for filho in raiz['filhos']}
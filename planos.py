@@ -0,0 +1,159 @@
+'''
+Extração de planos de características de muitos gobans de uma só vez, para treino de modelos.
+
+Para cada goban são preenchidos os planos de PLANOS, cada um uma máscara n x n indexada por
+[linha - 1, coluna], com 1 nas interseções que têm a característica e 0 nas restantes:
+as pedras pretas e brancas, as interseções livres, as pedras das cadeias com 1, 2 e 3 ou mais
+liberdades, as jogadas legais do jogador a jogar, as interseções proibidas apenas pela repetição
+de posições (ko) e os territórios preto e branco, com a regra de obtem_territorios e calcula_pontos.
+
+Os planos são escritos num array (N, len(PLANOS), n, n) dado, ou criado, sem objetos Python por
+interseção: as pedras vêm da codificação compacta, as liberdades do goban incremental (uma operação
+por cadeia), as jogadas legais das máscaras de mascara_jogadas_legais e os territórios de
+pontuacao_numpy. Com simetrias, o array tem a forma (N, 8, len(PLANOS), n, n), com os planos de cada
+goban transformados pelas 8 simetrias do goban (ver aplica_simetria).
+
+Só as pedras, as interseções livres e os territórios são calculados para todos os gobans ao mesmo
+tempo. As liberdades, as jogadas legais e o ko são ainda calculados num ciclo em Python, goban a goban,
+com duas chamadas a mascara_jogadas_legais por goban com goban anterior ou histórico (com e sem as
+repetições proibidas) e uma por goban sem anterior, que não tem ko.
+
+Este módulo precisa do NumPy, que não é necessário para o resto do projeto.
+'''
+
+import numpy as np
+
+import Go
+import pontuacao_numpy
+
+# Nome de cada plano, pela ordem em que aparecem no array
+PLANOS = ('pretas', 'brancas', 'livres', 'liberdades_1', 'liberdades_2', 'liberdades_3',
+          'legais', 'ko', 'territorio_preto', 'territorio_branco')
+
+# Número de simetrias do goban
+SIMETRIAS = 8
+
+def aplica_simetria(planos, simetria):
+    '''
+    aplica_simetria: array x int → array
+
+    Esta função devolve a vista dos planos (as duas últimas dimensões de um array) transformados pela
+    simetria dada: a simetria s roda os planos s % 4 quartos de volta e, se s >= 4, reflete-os
+    depois pela vertical. Serve também para transformar da mesma forma os alvos do treino.
+    '''
+
+    if not simetria in range(SIMETRIAS):
+        raise ValueError('aplica_simetria: argumentos invalidos')
+
+    planos = np.rot90(planos, simetria % 4, axes=(-2, -1))
+    if simetria >= 4:
+        planos = planos[..., ::-1]
+
+    return planos
+
+def _mascara_para_plano(mascara, n):
+    '''
+    _mascara_para_plano: int x int → array
+
+    Esta função auxiliar devolve o plano n x n com os bits da máscara (pelo índice de cada interseção).
+    '''
+
+    dados = np.frombuffer(mascara.to_bytes((n * n + 7) // 8, 'little'), dtype=np.uint8)
+
+    return np.unpackbits(dados, bitorder='little')[:n * n].reshape(n, n)
+
+def _liberdades(g):
+    '''
+    _liberdades: goban → array
+
+    Esta função auxiliar devolve o plano n x n com o número de liberdades da cadeia de cada pedra
+    do goban incremental g (0 nas interseções livres).
+    '''
+
+    n = g['n']
+    contagem = np.zeros(n * n + 1, dtype=np.int32)
+    for representante, liberdades in g['liberdades'].items():
+        contagem[representante] = len(liberdades)
+
+    # As interseções livres (-1) usam a última posição, que fica a 0
+    return contagem[np.asarray(g['cadeia'], dtype=np.int64)].reshape(n, n)
+
+def cria_saida(numero, n, simetrias=False, dtype=np.uint8):
+    '''
+    cria_saida: int x int x booleano x tipo → array
+
+    Esta função devolve um array, a zeros, com a forma usada por extrai_planos para numero gobans nxn.
+    '''
+
+    if simetrias:
+        return np.zeros((numero, SIMETRIAS, len(PLANOS), n, n), dtype=dtype)
+
+    return np.zeros((numero, len(PLANOS), n, n), dtype=dtype)
+
+def extrai_planos(gobans, pedras, anteriores=None, saida=None, simetrias=False):
+    '''
+    extrai_planos: lista x (pedra ou lista) x lista x array x booleano → array
+
+    Esta função escreve no array saida (criado com cria_saida se não for dado) os planos de cada um
+    dos gobans, todos com a mesma dimensão e em qualquer representação, e devolve-o. pedras é a pedra
+    do jogador a jogar, comum a todos os gobans ou uma por goban, e anteriores é a lista com o goban
+    anterior ou o histórico de cada goban, para as jogadas legais e o ko (sem repetições, se for None).
+    '''
+
+    numero = len(gobans)
+    if not numero > 0:
+        raise ValueError('extrai_planos: argumentos invalidos')
+    if Go.eh_pedra_jogador(pedras):
+        pedras = [pedras] * numero
+    if anteriores is None:
+        anteriores = [None] * numero
+    if not len(pedras) == numero or not len(anteriores) == numero:
+        raise ValueError('extrai_planos: argumentos invalidos')
+
+    n = Go.obtem_tamanho(gobans[0])
+    if saida is None:
+        saida = cria_saida(numero, n, simetrias)
+    forma = (numero, SIMETRIAS, len(PLANOS), n, n) if simetrias else (numero, len(PLANOS), n, n)
+    if not saida.shape == forma:
+        raise ValueError('extrai_planos: argumentos invalidos')
+
+    # Os planos sem simetria são escritos na primeira simetria
+    planos = saida[:, 0] if simetrias else saida
+
+    # Pedras, interseções livres e territórios, de todos os gobans ao mesmo tempo
+    codigos = pontuacao_numpy.gobans_para_array(gobans)
+    planos[:, PLANOS.index('pretas')] = codigos == pontuacao_numpy.PRETA
+    planos[:, PLANOS.index('brancas')] = codigos == pontuacao_numpy.BRANCA
+    planos[:, PLANOS.index('livres')] = codigos == pontuacao_numpy.LIVRE
+    territorio_branco, territorio_preto = pontuacao_numpy.territorios_lote(codigos)
+    planos[:, PLANOS.index('territorio_preto')] = territorio_preto
+    planos[:, PLANOS.index('territorio_branco')] = territorio_branco
+
+    # Liberdades, jogadas legais e ko, a partir do goban incremental de cada goban
+    sem_repeticoes = Go.cria_historico()
+    for indice in range(numero):
+        g = gobans[indice]
+        if not Go.eh_goban_incremental(g):
+            g = Go.converte_goban(g, 'incremental')
+        anterior = sem_repeticoes if anteriores[indice] is None else anteriores[indice]
+
+        liberdades = _liberdades(g)
+        planos[indice, PLANOS.index('liberdades_1')] = liberdades == 1
+        planos[indice, PLANOS.index('liberdades_2')] = liberdades == 2
+        planos[indice, PLANOS.index('liberdades_3')] = liberdades >= 3
+
+        legais = Go.mascara_jogadas_legais(g, pedras[indice], anterior)
+        planos[indice, PLANOS.index('legais')] = _mascara_para_plano(legais, n)
+        if anterior is sem_repeticoes:
+            # Sem repetições proibidas não há ko
+            planos[indice, PLANOS.index('ko')] = 0
+        else:
+            sem_ko = Go.mascara_jogadas_legais(g, pedras[indice], sem_repeticoes)
+            planos[indice, PLANOS.index('ko')] = _mascara_para_plano(sem_ko & ~legais, n)
+
+    # As restantes simetrias são transformações dos planos já escritos
+    if simetrias:
+        for simetria in range(1, SIMETRIAS):
+            saida[:, simetria] = aplica_simetria(planos, simetria)
+
+    return saida
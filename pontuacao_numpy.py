@@ -0,0 +1,121 @@
+'''
+Pontuação de muitas posições finais de uma só vez com NumPy.
+
+Os gobans são representados por um array de inteiros (N, n, n), indexado por [goban, linha - 1, coluna],
+com os códigos da codificação compacta de Go.py: 0 para uma interseção livre, 1 para uma pedra preta
+e 2 para uma pedra branca. Cada região de interseções livres é atribuída a um jogador pela mesma regra
+de calcula_pontos: só conta se todas as pedras que a rodeiam forem desse jogador. Uma interseção livre
+alcança uma cor se houver um caminho de interseções livres até uma pedra dessa cor; as interseções
+que alcançam cada cor são obtidas expandindo-as repetidamente às interseções livres adjacentes,
+em todos os gobans ao mesmo tempo.
+
+Este módulo precisa do NumPy, que não é necessário para o resto do projeto.
+'''
+
+import numpy as np
+
+import Go
+
+# Códigos de cada pedra nos arrays de gobans
+LIVRE = Go.CODIGOS[Go.cria_pedra_neutra()]
+PRETA = Go.CODIGOS[Go.cria_pedra_preta()]
+BRANCA = Go.CODIGOS[Go.cria_pedra_branca()]
+
+def gobans_para_array(gobans):
+    '''
+    gobans_para_array: iterável → array
+
+    Esta função devolve o array (N, n, n) dos códigos das interseções dos gobans dados,
+    todos com a mesma dimensão n e em qualquer representação.
+    '''
+
+    codificacoes = [Go.goban_para_bytes(g) for g in gobans]
+    if not codificacoes:
+        raise ValueError('gobans_para_array: argumentos invalidos')
+
+    return codificacoes_para_array(codificacoes)
+
+def codificacoes_para_array(codificacoes):
+    '''
+    codificacoes_para_array: iterável → array
+
+    Esta função devolve o array (N, n, n) dos códigos das interseções das codificações compactas
+    dadas (bytes ou vistas, por exemplo as de um armazem), todas de gobans com a mesma dimensão n.
+    '''
+
+    dados = np.array([np.frombuffer(codificacao, dtype=np.uint8) for codificacao in codificacoes])
+    if not dados.ndim == 2 or not len(dados) > 0 or not np.all(dados[:, 0] == dados[0, 0]):
+        raise ValueError('codificacoes_para_array: argumentos invalidos')
+
+    n = int(dados[0, 0])
+    # Cada byte tem quatro códigos de 2 bits, a começar pelos bits menos significativos
+    codigos = (dados[:, 1:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3
+
+    return codigos.reshape(len(dados), -1)[:, :n * n].reshape(len(dados), n, n).astype(np.int8)
+
+def _adjacentes(mascara):
+    '''
+    _adjacentes: array → array
+
+    Esta função auxiliar devolve a máscara (N, n, n) das interseções adjacentes a alguma interseção
+    da máscara dada, em cada goban.
+    '''
+
+    resultado = np.zeros_like(mascara)
+    resultado[:, 1:, :] |= mascara[:, :-1, :]
+    resultado[:, :-1, :] |= mascara[:, 1:, :]
+    resultado[:, :, 1:] |= mascara[:, :, :-1]
+    resultado[:, :, :-1] |= mascara[:, :, 1:]
+
+    return resultado
+
+def _alcancadas(livres, pedras):
+    '''
+    _alcancadas: array x array → array
+
+    Esta função auxiliar devolve a máscara das interseções livres que alcançam, por um caminho de
+    interseções livres, alguma das pedras da máscara pedras, em cada goban.
+    '''
+
+    alcancadas = livres & _adjacentes(pedras)
+    while True:
+        novas = alcancadas | (livres & _adjacentes(alcancadas))
+        if np.array_equal(novas, alcancadas):
+            return alcancadas
+        alcancadas = novas
+
+def territorios_lote(gobans):
+    '''
+    territorios_lote: array → tuplo
+
+    Esta função devolve o tuplo com as máscaras (N, n, n) do território branco e do território preto
+    de cada um dos gobans do array (N, n, n): as interseções livres das regiões rodeadas apenas por
+    pedras de cada jogador.
+    '''
+
+    livres = gobans == LIVRE
+    alcanca_pretas = _alcancadas(livres, gobans == PRETA)
+    alcanca_brancas = _alcancadas(livres, gobans == BRANCA)
+
+    # Uma região só é território do jogador cujas pedras são as únicas que alcança
+    return alcanca_brancas & ~alcanca_pretas, alcanca_pretas & ~alcanca_brancas
+
+def pontua_lote(gobans):
+    '''
+    pontua_lote: array → array
+
+    Esta função devolve o array (N, 2) com as pontuações (branco, preto) de cada um dos gobans do
+    array (N, n, n), iguais às de calcula_pontos.
+    '''
+
+    gobans = np.asarray(gobans)
+    if not gobans.ndim == 3 or not gobans.shape[1] == gobans.shape[2]:
+        raise ValueError('pontua_lote: argumentos invalidos')
+
+    territorio_branco, territorio_preto = territorios_lote(gobans)
+
+    pontos = np.empty((len(gobans), 2), dtype=np.int64)
+    pontos[:, 0] = ((gobans == BRANCA) | territorio_branco).sum(axis=(1, 2))
+    pontos[:, 1] = ((gobans == PRETA) | territorio_preto).sum(axis=(1, 2))
+
+    return pontos
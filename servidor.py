@@ -0,0 +1,320 @@
+'''
+Servidor de partidas de Go: muitas partidas ao mesmo tempo num único processo, com asyncio.
+
+Os clientes ligam-se por TCP e enviam comandos, um por linha; cada comando tem uma resposta que começa
+por 'OK' ou por 'ERRO <mensagem>'. Qualquer ligação pode jogar em qualquer partida, pelo que uma ligação
+pode ser um jogador, dois jogadores ou um observador.
+
+    NOVA <n> [SUPERKO]        cria uma partida nxn e responde 'OK <partida>'
+    JOGA <partida> <jogada>   joga a interseção (por exemplo C3) ou passa (P) pelo jogador a jogar;
+                              responde 'OK' ou 'OK FIM' se a partida terminou
+    BOT <partida> [simulacoes] o jogador a jogar joga a jogada escolhida pelo jogador automático de mcts.py;
+                              responde 'OK <jogada>' ou 'OK <jogada> FIM'
+    ESTADO <partida>          responde 'OK <pedra a jogar> <numero de jogadas> <EM_CURSO ou FIM>'
+    GOBAN <partida>           responde 'OK <linhas>' seguido das linhas de goban_para_str
+    PONTOS <partida>          responde 'OK <branco> <preto>'
+    LATENCIAS <partida>       responde 'OK comandos=<c> p50=<ms> p90=<ms> p99=<ms> max=<ms>'
+    FECHA <partida>           remove a partida
+    SAI                       fecha a ligação
+
+O TAD partida é usado para guardar o estado de uma partida entre comandos.
+
+-Cada partida é representada por um dicionário com o goban incremental ('goban'), o histórico das
+posições ('historico'), a pedra do jogador a jogar ('vez'), se cada jogador passou na sua última jogada
+('passou', por pedra), o número de jogadas ('jogadas'), se terminou ('terminada'), as latências dos
+últimos comandos em milissegundos ('latencias') e o trinco que impede comandos simultâneos ('trinco').
+
+As regras são as de Go.py: as jogadas são verificadas como em eh_jogada_legal e feitas com jogada, e a
+partida termina quando os dois jogadores passam seguidos, como em go. A pontuação e as jogadas do
+jogador automático, que demoram, são calculadas num conjunto de processos, pelo que uma partida
+ocupada não atrasa as outras.
+
+Utilização:
+    python servidor.py [--anfitriao 127.0.0.1] [--porta 5050] [--trabalhadores N]
+'''
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import sys
+import time
+
+import Go
+import mcts
+
+# Número de latências guardadas por partida e simulações do jogador automático, por omissão
+MAX_LATENCIAS = 10000
+SIMULACOES_BOT = 500
+
+# Comandos que se referem a uma partida existente
+COMANDOS_PARTIDA = ('JOGA', 'BOT', 'ESTADO', 'GOBAN', 'PONTOS', 'LATENCIAS', 'FECHA')
+
+def cria_partida(n, superko=False):
+    '''
+    cria_partida: int x booleano → partida
+
+    Esta função devolve uma partida nova num goban nxn vazio, a começar pelo preto.
+    '''
+
+    goban, historico = Go.prepara_partida(n, (), (), superko, 'cria_partida')
+
+    return {'goban': goban, 'historico': historico, 'vez': Go.cria_pedra_preta(),
+            'passou': {Go.cria_pedra_preta(): False, Go.cria_pedra_branca(): False},
+            'jogadas': 0, 'terminada': False, 'latencias': collections.deque(maxlen=MAX_LATENCIAS),
+            'trinco': asyncio.Lock()}
+
+def joga_na_partida(partida, jogada_pedida):
+    '''
+    joga_na_partida: partida x universal → booleano
+
+    Esta função modifica destrutivamente a partida fazendo a jogada pedida (uma interseção, a sua
+    representação externa, ou 'P' ou None para passar) pelo jogador a jogar, e devolve True se a
+    partida terminou. Levanta um ValueError se a partida já tiver terminado ou a jogada for ilegal.
+    '''
+
+    if partida['terminada']:
+        raise ValueError('partida terminada')
+
+    g, h, p = partida['goban'], partida['historico'], partida['vez']
+    if jogada_pedida is None or jogada_pedida == 'P':
+        partida['passou'][p] = True
+    else:
+        intersecao = Go.intersecao_legal(g, p, h, jogada_pedida)
+        if intersecao is None:
+            raise ValueError('jogada ilegal')
+        Go.jogada(g, intersecao, p)
+        partida['passou'][p] = False
+
+    Go.regista_goban(h, g)
+    partida['jogadas'] += 1
+    partida['vez'] = Go.obtem_pedra_adversaria(p)
+    partida['terminada'] = all(partida['passou'].values())
+
+    return partida['terminada']
+
+def _jogada_do_bot(g, p, h, adversario_passou, simulacoes, semente):
+    '''
+    _jogada_do_bot: goban x pedra x historico x booleano x int x int → str
+
+    Esta função auxiliar devolve a representação externa da jogada escolhida pelo jogador automático
+    para a pedra p, ou 'P' se passar. É a função executada pelos processos.
+    '''
+
+    jogador = mcts.cria_jogador_mcts(simulacoes=simulacoes, semente=semente)
+    intersecao = mcts.escolhe_jogada_mcts(jogador, g, p, h, adversario_passou)
+
+    return 'P' if intersecao is None else Go.intersecao_para_str(intersecao)
+
+def percentis(latencias):
+    '''
+    percentis: iterável → dicionário
+
+    Esta função devolve um dicionário com o número de latências ('comandos') e os percentis 50, 90 e 99
+    e o máximo das latências dadas ('p50', 'p90', 'p99', 'max'), pelo método da ordem mais próxima.
+    '''
+
+    ordenadas = sorted(latencias)
+    resultado = {'comandos': len(ordenadas)}
+    for nome, percentil in (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100)):
+        # O percentil é o menor valor com pelo menos percentil % dos valores menores ou iguais
+        posicao = max(0, -(-percentil * len(ordenadas) // 100) - 1)
+        resultado[nome] = ordenadas[posicao] if ordenadas else 0.0
+
+    return resultado
+
+def cria_servidor(executor=None):
+    '''
+    cria_servidor: executor → dicionário
+
+    Esta função devolve o estado de um servidor sem partidas, que calcula a pontuação e as jogadas
+    do jogador automático no executor dado (por omissão um conjunto de processos).
+    '''
+
+    if executor is None:
+        executor = concurrent.futures.ProcessPoolExecutor()
+
+    return {'partidas': {}, 'identificadores': itertools.count(1), 'executor': executor}
+
+def _obtem_partida(servidor, argumentos):
+    '''
+    _obtem_partida: dicionário x lista → partida
+
+    Esta função auxiliar devolve a partida cujo identificador é o primeiro argumento do comando,
+    levantando um ValueError se não existir.
+    '''
+
+    if not argumentos or not argumentos[0] in servidor['partidas']:
+        raise ValueError('partida inexistente')
+
+    return servidor['partidas'][argumentos[0]]
+
+async def _executa(servidor, funcao, *argumentos):
+    '''
+    _executa: dicionário x função x universal → universal
+
+    Esta função auxiliar devolve o resultado da função aplicada aos argumentos, calculado no executor
+    do servidor sem bloquear o ciclo de eventos. Uma falha do executor ou da função (por exemplo um
+    processo do conjunto que terminou) levanta um ValueError, que é respondido como um erro do comando.
+    '''
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(servidor['executor'], funcao, *argumentos)
+    except Exception as erro:
+        raise ValueError(f'falha no calculo ({type(erro).__name__})') from erro
+
+async def trata_comando(servidor, linha):
+    '''
+    trata_comando: dicionário x str → lista
+
+    Esta função executa o comando da linha e devolve a lista das linhas da resposta.
+    '''
+
+    palavras = linha.split()
+    if not palavras:
+        raise ValueError('comando vazio')
+    comando, argumentos = palavras[0].upper(), palavras[1:]
+
+    if comando == 'NOVA':
+        if not 1 <= len(argumentos) <= 2 or not argumentos[0].isdigit() or not argumentos[1:] in ([], ['SUPERKO']):
+            raise ValueError('argumentos invalidos')
+        partida = cria_partida(int(argumentos[0]), argumentos[1:] == ['SUPERKO'])
+        identificador = str(next(servidor['identificadores']))
+        servidor['partidas'][identificador] = partida
+        return [f'OK {identificador}']
+
+    if not comando in COMANDOS_PARTIDA:
+        raise ValueError('comando desconhecido')
+
+    partida = _obtem_partida(servidor, argumentos)
+
+    # Os comandos de uma partida são executados um de cada vez, pela ordem de chegada
+    async with partida['trinco']:
+        # A partida pode ter sido fechada por um comando que tinha o trinco
+        if not servidor['partidas'].get(argumentos[0]) is partida:
+            raise ValueError('partida inexistente')
+
+        if comando == 'JOGA':
+            if not len(argumentos) == 2:
+                raise ValueError('argumentos invalidos')
+            return ['OK FIM' if joga_na_partida(partida, argumentos[1].upper()) else 'OK']
+
+        if comando == 'BOT':
+            if not len(argumentos) in (1, 2) or not all(argumento.isdigit() for argumento in argumentos[1:]):
+                raise ValueError('argumentos invalidos')
+            if partida['terminada']:
+                raise ValueError('partida terminada')
+            simulacoes = int(argumentos[1]) if len(argumentos) == 2 else SIMULACOES_BOT
+            p = partida['vez']
+            adversario_passou = partida['passou'][Go.obtem_pedra_adversaria(p)]
+            jogada_escolhida = await _executa(servidor, _jogada_do_bot, partida['goban'], p, partida['historico'],
+                                              adversario_passou, max(simulacoes, 1), partida['jogadas'])
+            terminou = joga_na_partida(partida, jogada_escolhida)
+            return [f'OK {jogada_escolhida} FIM' if terminou else f'OK {jogada_escolhida}']
+
+        if comando == 'ESTADO':
+            return [f'OK {Go.pedra_para_str(partida["vez"])} {partida["jogadas"]} '
+                    f'{"FIM" if partida["terminada"] else "EM_CURSO"}']
+
+        if comando == 'GOBAN':
+            linhas = Go.goban_para_str(partida['goban']).split('\n')
+            return [f'OK {len(linhas)}'] + linhas
+
+        if comando == 'PONTOS':
+            pontuacao = await _executa(servidor, Go.calcula_pontos, partida['goban'])
+            return [f'OK {pontuacao[0]} {pontuacao[1]}']
+
+        if comando == 'LATENCIAS':
+            resultado = percentis(partida['latencias'])
+            return [f'OK comandos={resultado["comandos"]} ' +
+                    ' '.join(f'{nome}={resultado[nome]:.3f}' for nome in ('p50', 'p90', 'p99', 'max'))]
+
+        # FECHA: a partida só é removida com o trinco, depois dos comandos que chegaram antes
+        del servidor['partidas'][argumentos[0]]
+        return ['OK']
+
+async def _trata_ligacao(servidor, leitor, escritor):
+    '''
+    _trata_ligacao: dicionário x StreamReader x StreamWriter → {}
+
+    Esta função auxiliar responde aos comandos de uma ligação até ao comando SAI ou ao fim da ligação,
+    registando a latência de cada comando na partida a que se refere.
+    '''
+
+    try:
+        while True:
+            linha = await leitor.readline()
+            if not linha:
+                break
+            inicio = time.perf_counter()
+            linha = linha.decode('utf-8', 'replace').strip()
+            if linha.upper() == 'SAI':
+                escritor.write(b'OK\n')
+                break
+
+            try:
+                resposta = await trata_comando(servidor, linha)
+            except ValueError as erro:
+                resposta = [f'ERRO {erro}']
+            except Exception as erro:
+                # Um erro inesperado num comando é respondido sem fechar a ligação
+                resposta = [f'ERRO erro interno ({type(erro).__name__})']
+            escritor.write(''.join(f'{linha_resposta}\n' for linha_resposta in resposta).encode('utf-8'))
+            await escritor.drain()
+
+            # A latência de um comando de uma partida vai da chegada do comando ao envio da resposta
+            palavras = linha.split()
+            if len(palavras) > 1 and palavras[0].upper() in COMANDOS_PARTIDA and palavras[1] in servidor['partidas']:
+                servidor['partidas'][palavras[1]]['latencias'].append((time.perf_counter() - inicio) * 1000)
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+async def inicia_servidor(servidor, anfitriao='127.0.0.1', porta=5050):
+    '''
+    inicia_servidor: dicionário x str x int → Server
+
+    Esta função começa a aceitar ligações no anfitrião e porta dados (0 para uma porta livre)
+    e devolve o servidor asyncio correspondente.
+    '''
+
+    return await asyncio.start_server(lambda leitor, escritor: _trata_ligacao(servidor, leitor, escritor),
+                                      anfitriao, porta)
+
+async def _serve(anfitriao, porta, trabalhadores):
+    '''
+    _serve: str x int x int → {}
+
+    Esta função auxiliar serve partidas até o processo ser interrompido.
+    '''
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        servidor_asyncio = await inicia_servidor(cria_servidor(executor), anfitriao, porta)
+        print(f'a servir em {anfitriao}:{servidor_asyncio.sockets[0].getsockname()[1]}', file=sys.stderr)
+        async with servidor_asyncio:
+            await servidor_asyncio.serve_forever()
+
+def main(argumentos=None):
+    '''
+    main: lista → int
+
+    Esta função serve partidas com os argumentos da linha de comandos e devolve o código de saída.
+    '''
+
+    parser = argparse.ArgumentParser(description='Servidor de partidas de Go por TCP.')
+    parser.add_argument('--anfitriao', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=5050)
+    parser.add_argument('--trabalhadores', type=int, default=None)
+    opcoes = parser.parse_args(argumentos)
+
+    try:
+        asyncio.run(_serve(opcoes.anfitriao, opcoes.porta, opcoes.trabalhadores))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
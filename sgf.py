@@ -0,0 +1,340 @@
+'''
+Leitura e escrita de partidas no formato SGF (Smart Game Format), sem carregar os ficheiros em memória.
+
+O leitor percorre o ficheiro aos bocados e produz uma partida de cada vez, pelo que uma coleção
+de qualquer tamanho é lida com memória constante (a de uma partida). Cada partida é um dicionário
+como os de lote.py: a dimensão do goban ('n', da propriedade SZ, 19 por omissão), os tuplos das
+interseções inicialmente ocupadas por pedras brancas e pretas, como em cria_goban ('ib', 'ip', das
+propriedades AW e AB), a lista das jogadas, alternadamente do preto e do branco, com 'P' para passar
+('jogadas'), e as restantes propriedades do primeiro nó ('propriedades'). Quando o mesmo jogador
+joga duas vezes seguidas (por exemplo o branco primeiro, numa partida com desvantagem), é acrescentada
+uma passagem do outro jogador. Das variantes só é lida a linha principal.
+
+As coordenadas SGF são duas letras minúsculas, a coluna e a linha a contar do canto superior
+esquerdo: 'aa' corresponde à interseção ('A', n) e a passagem é o valor vazio (ou 'tt').
+
+Uma partida inválida (por exemplo com uma coordenada inválida) não interrompe a leitura de uma
+coleção: é saltada com um aviso ou, se pedido, substituída por um registo com a mensagem de erro.
+O mesmo acontece, ao ler as posições, a uma partida que não pode ser reproduzida.
+'''
+
+import re
+import warnings
+
+import Go
+
+# Tamanho dos bocados lidos do ficheiro
+TAMANHO_BOCADO = 1 << 16
+
+# Caracteres que alteram o estado do leitor e elementos de uma partida
+_ESPECIAIS = re.compile(r'[()\[\]\\]')
+_ELEMENTOS = re.compile(r'\s*(?:([();])|([A-Za-z]+)((?:\s*\[(?:[^\]\\]|\\.)*\])+))', re.S)
+_VALORES = re.compile(r'\[((?:[^\]\\]|\\.)*)\]', re.S)
+_ESCAPES = re.compile(r'\\(\r\n|\n\r|\n|\r|.)', re.S)
+
+def _textos_das_partidas(ficheiro):
+    '''
+    _textos_das_partidas: ficheiro → gerador
+
+    Esta função auxiliar lê o ficheiro aos bocados e produz o texto de cada partida, desde o
+    parêntese inicial até ao parêntese que o fecha, ignorando os parênteses dentro dos valores.
+    '''
+
+    profundidade = 0
+    dentro_valor = False
+    escapado = False
+    partes = []
+
+    while True:
+        bocado = ficheiro.read(TAMANHO_BOCADO)
+        if not bocado:
+            return
+
+        inicio = 0
+        ignora = 0 if escapado else -1
+        escapado = False
+        for especial in _ESPECIAIS.finditer(bocado):
+            posicao = especial.start()
+            caracter = especial.group()
+            if posicao == ignora:
+                continue
+            if dentro_valor:
+                if caracter == '\\':
+                    # O caracter seguinte pode estar já no próximo bocado
+                    ignora = posicao + 1
+                    escapado = ignora == len(bocado)
+                elif caracter == ']':
+                    dentro_valor = False
+            elif caracter == '[':
+                dentro_valor = True
+            elif caracter == '(':
+                if profundidade == 0:
+                    inicio = posicao
+                    partes = []
+                profundidade += 1
+            elif caracter == ')' and profundidade > 0:
+                profundidade -= 1
+                if profundidade == 0:
+                    yield ''.join(partes) + bocado[inicio:posicao + 1]
+                    partes = []
+
+        # O texto de uma partida incompleta continua no próximo bocado
+        if profundidade > 0:
+            partes += [bocado[inicio:]]
+
+def _desescapa(valor):
+    '''
+    _desescapa: str → str
+
+    Esta função auxiliar devolve o valor SGF sem os caracteres de escape e sem as quebras de linha escapadas.
+    '''
+
+    return _ESCAPES.sub(lambda escape: '' if escape.group(1) in ('\r\n', '\n\r', '\n', '\r') else escape.group(1), valor)
+
+def _escapa(valor):
+    '''
+    _escapa: str → str
+
+    Esta função auxiliar devolve o valor com os caracteres ']' e '\\' escapados para SGF.
+    '''
+
+    return valor.replace('\\', '\\\\').replace(']', '\\]')
+
+def _nos_da_linha_principal(texto):
+    '''
+    _nos_da_linha_principal: str → lista
+
+    Esta função auxiliar devolve a lista dos nós da linha principal do texto de uma partida, cada nó
+    uma lista de pares (propriedade, valores). Das variantes de cada árvore só a primeira é seguida.
+    '''
+
+    nos = []
+    # Para cada árvore aberta: se está na linha principal e se já teve uma variante
+    principal = []
+    com_variante = []
+
+    for elemento in _ELEMENTOS.finditer(texto):
+        simbolo, propriedade, valores = elemento.groups()
+        if simbolo == '(':
+            # Só a primeira variante de uma árvore da linha principal pertence à linha principal
+            if principal:
+                principal += [principal[-1] and not com_variante[-1]]
+                com_variante[-1] = True
+            else:
+                principal += [True]
+            com_variante += [False]
+        elif simbolo == ')':
+            if principal:
+                principal.pop()
+                com_variante.pop()
+        elif principal and principal[-1]:
+            if simbolo == ';':
+                nos += [[]]
+            elif nos:
+                nos[-1] += [(propriedade.upper(), [_desescapa(valor) for valor in _VALORES.findall(valores)])]
+
+    return nos
+
+def _intersecao_sgf(coordenada, n):
+    '''
+    _intersecao_sgf: str x int → intersecao
+
+    Esta função auxiliar devolve a interseção do goban nxn com a coordenada SGF dada, ou None se a
+    coordenada for uma passagem.
+    '''
+
+    if coordenada == '' or coordenada == 'tt' and n <= 19:
+        return None
+    if not len(coordenada) == 2 or not coordenada.isalpha() or not coordenada.islower():
+        raise ValueError('sgf: coordenada invalida')
+
+    return Go.cria_intersecao(chr(ord('A') + ord(coordenada[0]) - ord('a')), n - (ord(coordenada[1]) - ord('a')))
+
+def _coordenada_sgf(i, n):
+    '''
+    _coordenada_sgf: intersecao x int → str
+
+    Esta função auxiliar devolve a coordenada SGF da interseção i de um goban nxn.
+    '''
+
+    return chr(ord('a') + ord(Go.obtem_col(i)) - ord('A')) + chr(ord('a') + n - Go.obtem_lin(i))
+
+def _intersecoes_sgf(valores, n):
+    '''
+    _intersecoes_sgf: lista x int → tuplo
+
+    Esta função auxiliar devolve o tuplo das interseções de uma lista de pontos SGF, em que cada
+    valor é uma coordenada ou um retângulo comprimido 'aa:cc'.
+    '''
+
+    intersecoes = ()
+    for valor in valores:
+        if ':' in valor:
+            canto1, canto2 = valor.split(':')
+            for coluna in range(min(ord(canto1[0]), ord(canto2[0])), max(ord(canto1[0]), ord(canto2[0])) + 1):
+                for linha in range(min(ord(canto1[1]), ord(canto2[1])), max(ord(canto1[1]), ord(canto2[1])) + 1):
+                    intersecoes += (_intersecao_sgf(chr(coluna) + chr(linha), n),)
+        else:
+            intersecoes += (_intersecao_sgf(valor, n),)
+
+    return intersecoes
+
+def partida_do_texto(texto):
+    '''
+    partida_do_texto: str → dicionário
+
+    Esta função devolve a partida (ver o início do módulo) descrita pelo texto SGF de uma partida.
+    '''
+
+    nos = _nos_da_linha_principal(texto)
+    if not nos:
+        raise ValueError('sgf: partida invalida')
+
+    raiz = dict(nos[0])
+    n = int(raiz.get('SZ', ['19'])[0].split(':')[0])
+    propriedades = {propriedade: tuple(valores) for propriedade, valores in nos[0]
+                    if not propriedade in ('SZ', 'AB', 'AW', 'B', 'W')}
+
+    ib = _intersecoes_sgf(raiz.get('AW', []), n)
+    ip = _intersecoes_sgf(raiz.get('AB', []), n)
+
+    # As jogadas são alternadas, com uma passagem quando o mesmo jogador joga duas vezes seguidas
+    jogadas = []
+    for no in nos:
+        for propriedade, valores in no:
+            if propriedade in ('B', 'W'):
+                if not (propriedade == 'B') == (len(jogadas) % 2 == 0):
+                    jogadas += ['P']
+                intersecao = _intersecao_sgf(valores[0] if valores else '', n)
+                jogadas += ['P' if intersecao is None else intersecao]
+
+    return {'n': n, 'ib': ib, 'ip': ip, 'jogadas': jogadas, 'propriedades': propriedades}
+
+def le_partidas(caminho, erros=False):
+    '''
+    le_partidas: str x booleano → gerador
+
+    Esta função produz, uma de cada vez, as partidas do ficheiro SGF caminho. Cada partida inválida
+    é saltada com um aviso ou, se erros for True, substituída pelo dicionário com a mensagem de erro
+    ('erro'), para que as partidas seguintes mantenham a sua posição na sequência.
+    '''
+
+    with open(caminho, encoding='utf-8', errors='replace') as ficheiro:
+        numero = 0
+        for texto in _textos_das_partidas(ficheiro):
+            try:
+                partida = partida_do_texto(texto)
+            except (ValueError, IndexError) as erro:
+                mensagem = f'partida {numero}: {erro}'
+                if erros:
+                    yield {'erro': mensagem}
+                else:
+                    warnings.warn(f'le_partidas: {mensagem}')
+            else:
+                yield partida
+            numero += 1
+
+def posicoes(partida):
+    '''
+    posicoes: dicionário → gerador
+
+    Esta função reproduz a partida com jogada e produz o goban inicial e o goban depois de cada jogada.
+    É sempre o mesmo goban, modificado a cada jogada, pelo que deve ser copiado para ser guardado.
+    As jogadas são verificadas com eh_jogada_legal, com as regras de go; uma jogada ilegal levanta
+    um ValueError.
+    '''
+
+    goban = Go.cria_goban(partida['n'], partida['ib'], partida['ip'], 'incremental')
+    historico = Go.cria_historico()
+    Go.regista_goban(historico, Go.cria_goban_vazio(partida['n']))
+    Go.regista_goban(historico, goban)
+    pedras = (Go.cria_pedra_preta(), Go.cria_pedra_branca())
+
+    yield goban
+    numero = 0
+    for jogada in partida['jogadas']:
+        pedra = pedras[numero % 2]
+        if not jogada == 'P':
+            if not Go.eh_jogada_legal(goban, jogada, pedra, historico):
+                raise ValueError(f'posicoes: jogada ilegal {numero}')
+            Go.jogada(goban, jogada, pedra)
+        Go.regista_goban(historico, goban)
+        numero += 1
+        yield goban
+
+def le_posicoes(caminho, erros=False):
+    '''
+    le_posicoes: str x booleano → gerador
+
+    Esta função produz, para cada partida do ficheiro SGF caminho, os tuplos (partida, numero, goban)
+    com o goban depois de cada uma das suas jogadas (numero 0 para o goban inicial), como em posicoes.
+    Uma partida inválida ou que não pode ser reproduzida (por exemplo com uma dimensão não suportada
+    ou uma jogada ilegal) termina com um aviso ou, se erros for True, com o tuplo (erro, numero, None),
+    em que erro é o dicionário com a mensagem de erro ('erro') e numero o da posição que falhou.
+    As partidas seguintes são sempre reproduzidas.
+    '''
+
+    indice = 0
+    for partida in le_partidas(caminho, erros=True):
+        numero = 0
+        mensagem = partida.get('erro')
+        if mensagem is None:
+            try:
+                for goban in posicoes(partida):
+                    yield partida, numero, goban
+                    numero += 1
+            except ValueError as erro:
+                mensagem = f'partida {indice}: {erro}'
+
+        if not mensagem is None:
+            if erros:
+                yield {'erro': mensagem}, numero, None
+            else:
+                warnings.warn(f'le_posicoes: {mensagem}')
+        indice += 1
+
+def partida_para_texto(partida):
+    '''
+    partida_para_texto: dicionário → str
+
+    Esta função devolve o texto SGF da partida, com as jogadas alternadas a começar pelo preto.
+    '''
+
+    n = partida['n']
+    raiz = f';GM[1]FF[4]SZ[{n}]'
+    for propriedade, valores in partida.get('propriedades', {}).items():
+        if not propriedade in ('GM', 'FF'):
+            raiz += propriedade + ''.join(f'[{_escapa(valor)}]' for valor in valores)
+    for propriedade, intersecoes in (('AB', partida['ip']), ('AW', partida['ib'])):
+        if intersecoes:
+            raiz += propriedade + ''.join(f'[{_coordenada_sgf(i, n)}]' for i in intersecoes)
+
+    nos = [raiz]
+    numero = 0
+    for jogada in partida['jogadas']:
+        cor = 'B' if numero % 2 == 0 else 'W'
+        if jogada is None or jogada == 'P':
+            nos += [f';{cor}[]']
+        else:
+            if Go.str_intersecao_valida(jogada):
+                jogada = Go.str_para_intersecao(jogada)
+            nos += [f';{cor}[{_coordenada_sgf(jogada, n)}]']
+        numero += 1
+
+    return '(' + '\n'.join(nos) + ')\n'
+
+def escreve_partidas(caminho, partidas):
+    '''
+    escreve_partidas: str x iterável → int
+
+    Esta função escreve as partidas no ficheiro SGF caminho, uma de cada vez, e devolve o número
+    de partidas escritas.
+    '''
+
+    escritas = 0
+    with open(caminho, 'w', encoding='utf-8') as ficheiro:
+        for partida in partidas:
+            ficheiro.write(partida_para_texto(partida))
+            escritas += 1
+
+    return escritas
@@ -0,0 +1,281 @@
+'''
+Leitura tática de Go: escadas e corridas de liberdades a partir de uma cadeia, com um orçamento.
+
+A leitura é feita num goban incremental, fazendo e desfazendo as jogadas com faz_jogada e desfaz_jogada
+e contando as liberdades das cadeias com as liberdades mantidas pelo goban incremental, sem copiar
+o goban. Cada cadeia lida é identificada por uma das suas pedras, pelo que continua a ser a mesma
+cadeia quando se junta a outras. As jogadas que repetem uma posição anterior da leitura, ou da
+partida (se for dado o seu histórico), não são consideradas.
+
+Na leitura de uma escada, o atacante só joga nas liberdades de uma cadeia com duas liberdades e o
+defensor só aumenta as liberdades da cadeia ou captura uma cadeia adjacente em atari: a cadeia
+escapa quando chega a três liberdades. Na leitura de uma corrida de liberdades entre duas cadeias
+de jogadores diferentes, cada jogador joga nas liberdades das duas cadeias ou captura uma cadeia em
+atari adjacente à sua, sem passar, e ganha o jogador que captura a cadeia do adversário.
+
+O TAD leitura é usado para guardar o estado de uma leitura.
+
+-Cada leitura é representada por um dicionário com o goban incremental lido ('goban'), o histórico das
+posições da leitura, com a regra de superko ('historico'), e os campos do orçamento da leitura
+(ver cria_orcamento em Go.py): o número de nós lidos ('nos'), o número máximo de nós ('max_nos'),
+o instante em que a leitura tem de terminar ('limite') e se o orçamento se esgotou ('esgotada').
+
+Os resultados das leituras são dicionários com o resultado (None se o orçamento se esgotou antes de
+haver um resultado), a jogada que o obtém, o número de nós ('nos'), os segundos ('segundos') e os nós
+por segundo ('nos_por_segundo').
+'''
+
+import time
+
+import Go
+
+# Número de liberdades com que uma cadeia escapa a uma escada
+LIBERDADES_ESCAPE = 3
+
+def _cria_leitura(g, l, max_nos, segundos):
+    '''
+    _cria_leitura: goban x (goban ou historico) x int x float → leitura
+
+    Esta função auxiliar devolve uma leitura de uma cópia incremental do goban g, com as posições do
+    histórico ou do goban anterior l proibidas, e no máximo max_nos nós e segundos segundos.
+    '''
+
+    if not Go.eh_goban(g):
+        raise ValueError('tatica: argumentos invalidos')
+    if not max_nos is None and (not isinstance(max_nos, int) or max_nos < 1):
+        raise ValueError('tatica: argumentos invalidos')
+
+    g = Go.cria_copia_goban(g) if Go.eh_goban_incremental(g) else Go.converte_goban(g, 'incremental')
+
+    # A leitura usa o superko, para que termine, e começa com as posições já ocorridas
+    h = Go.copia_historico(l, g, superko=True)
+
+    return {'goban': g, 'historico': h, **Go.cria_orcamento(max_nos, segundos)}
+
+def _liberdades(g, alvo):
+    '''
+    _liberdades: goban x int → conjunto
+
+    Esta função auxiliar devolve o conjunto dos índices das liberdades da cadeia da pedra no índice alvo
+    do goban incremental g (vazio se a cadeia foi capturada).
+    '''
+
+    representante = g['cadeia'][alvo]
+
+    return g['liberdades'][representante] if representante >= 0 else set()
+
+def _existe(g, alvo, pedra):
+    '''
+    _existe: goban x int x pedra → booleano
+
+    Esta função auxiliar devolve True se a cadeia da pedra no índice alvo ainda não foi capturada.
+    '''
+
+    n = g['n']
+
+    return g['colunas'][alvo % n][alvo // n] == pedra
+
+def _capturas_adjacentes(g, alvo):
+    '''
+    _capturas_adjacentes: goban x int → conjunto
+
+    Esta função auxiliar devolve o conjunto dos índices das jogadas que capturam uma cadeia em atari
+    adjacente à cadeia da pedra no índice alvo do goban incremental g.
+    '''
+
+    n = g['n']
+    cadeia = g['cadeia']
+    pedra = g['colunas'][alvo % n][alvo // n]
+    vizinhos = Go.obtem_vizinhos(n)
+    capturas = set()
+
+    for membro in g['pedras'][cadeia[alvo]]:
+        for adjacente in vizinhos[membro]:
+            representante = cadeia[adjacente]
+            if representante >= 0 and not g['colunas'][adjacente % n][adjacente // n] == pedra \
+                    and len(g['liberdades'][representante]) == 1:
+                capturas |= g['liberdades'][representante]
+
+    return capturas
+
+def _joga(leitura, k, p):
+    '''
+    _joga: leitura x int x pedra → registo
+
+    Esta função auxiliar faz a jogada da pedra p no índice livre k do goban da leitura, se for legal,
+    e devolve o registo para a desfazer, ou None se a jogada for ilegal.
+    '''
+
+    g = leitura['goban']
+    tem_liberdade, capturadas = Go.avalia_jogada_incremental(g, k, p)
+    if not tem_liberdade or Go.eh_posicao_proibida(leitura['historico'], Go.hash_apos_jogada_incremental(g, k, p, capturadas)):
+        return None
+
+    return Go.faz_jogada(g, Go.intersecao_do_indice(k, g['n']), p, leitura['historico'])
+
+def _ataca_escada(leitura, alvo, pedra):
+    '''
+    _ataca_escada: leitura x int x pedra → tuplo
+
+    Esta função auxiliar devolve o tuplo com True se o atacante, a jogar, captura a cadeia da pedra no
+    índice alvo (False se não captura, None se o orçamento se esgotou) e o índice da jogada que a captura.
+    '''
+
+    if not Go.conta_no(leitura):
+        return None, None
+
+    g = leitura['goban']
+    liberdades = _liberdades(g, alvo)
+    if len(liberdades) >= LIBERDADES_ESCAPE:
+        return False, None
+
+    atacante = Go.obtem_pedra_adversaria(pedra)
+    for k in sorted(liberdades):
+        registo = _joga(leitura, k, atacante)
+        if registo is None:
+            continue
+        if not _existe(g, alvo, pedra):
+            Go.desfaz_jogada(g, registo)
+            return True, k
+
+        escapa, _ = _defende_escada(leitura, alvo, pedra)
+        Go.desfaz_jogada(g, registo)
+        if escapa is None:
+            return None, None
+        if not escapa:
+            return True, k
+
+    return False, None
+
+def _defende_escada(leitura, alvo, pedra):
+    '''
+    _defende_escada: leitura x int x pedra → tuplo
+
+    Esta função auxiliar devolve o tuplo com True se o defensor, a jogar, salva a cadeia da pedra no
+    índice alvo (False se não a salva, None se o orçamento se esgotou) e o índice da jogada que a salva.
+    '''
+
+    if not Go.conta_no(leitura):
+        return None, None
+
+    g = leitura['goban']
+    liberdades = _liberdades(g, alvo)
+    if len(liberdades) >= LIBERDADES_ESCAPE:
+        return True, None
+
+    # O defensor captura uma cadeia adjacente em atari ou aumenta as liberdades da cadeia
+    for k in sorted(_capturas_adjacentes(g, alvo) | liberdades):
+        registo = _joga(leitura, k, pedra)
+        if registo is None:
+            continue
+        if len(_liberdades(g, alvo)) < 2:
+            Go.desfaz_jogada(g, registo)
+            continue
+
+        capturada, _ = _ataca_escada(leitura, alvo, pedra)
+        Go.desfaz_jogada(g, registo)
+        if capturada is None:
+            return None, None
+        if not capturada:
+            return True, k
+
+    return False, None
+
+def _corrida(leitura, alvos, p):
+    '''
+    _corrida: leitura x tuplo x pedra → tuplo
+
+    Esta função auxiliar devolve o tuplo com True se o jogador p, a jogar, ganha a corrida de liberdades
+    entre as cadeias das pedras dos índices de alvos (False se perde, None se o orçamento se esgotou)
+    e o índice da jogada que a ganha.
+    '''
+
+    if not Go.conta_no(leitura):
+        return None, None
+
+    g = leitura['goban']
+    n = g['n']
+    propria, adversaria = alvos if g['colunas'][alvos[0] % n][alvos[0] // n] == p else alvos[::-1]
+
+    # Primeiro as jogadas nas liberdades do adversário, depois nas próprias e as capturas
+    candidatas = sorted(_liberdades(g, adversaria))
+    candidatas += sorted((_liberdades(g, propria) | _capturas_adjacentes(g, propria)) - set(candidatas))
+
+    for k in candidatas:
+        registo = _joga(leitura, k, p)
+        if registo is None:
+            continue
+        if not _existe(g, adversaria, Go.obtem_pedra_adversaria(p)):
+            Go.desfaz_jogada(g, registo)
+            return True, k
+
+        ganha, _ = _corrida(leitura, alvos, Go.obtem_pedra_adversaria(p))
+        Go.desfaz_jogada(g, registo)
+        if ganha is None:
+            return None, None
+        if not ganha:
+            return True, k
+
+    return False, None
+
+def _resultado(leitura, nome, valor, k, inicio):
+    '''
+    _resultado: leitura x str x universal x int x float → dicionário
+
+    Esta função auxiliar devolve o resultado de uma leitura, com o valor dado no campo nome.
+    '''
+
+    segundos = time.perf_counter() - inicio
+    n = leitura['goban']['n']
+
+    return {nome: None if leitura['esgotada'] else valor,
+            'jogada': None if leitura['esgotada'] or k is None else Go.intersecao_do_indice(k, n),
+            'nos': leitura['nos'], 'segundos': segundos, 'nos_por_segundo': leitura['nos'] / segundos if segundos > 0 else 0.0}
+
+def le_escada(g, i, p, l=None, max_nos=100000, segundos=None):
+    '''
+    le_escada: goban x intersecao x pedra x (goban ou historico) x int x float → dicionário
+
+    Esta função lê a escada da cadeia de pedras que passa pela interseção i do goban g, com o jogador p
+    a jogar, e devolve o resultado com True se a cadeia é capturada ('capturada') e a jogada do jogador p
+    que captura a cadeia, se p for o atacante, ou que a salva, se for o defensor ('jogada').
+    l é o goban anterior ou o histórico da partida, para as repetições.
+    '''
+
+    inicio = time.perf_counter()
+    leitura = _cria_leitura(g, l, max_nos, segundos)
+    g = leitura['goban']
+    alvo = Go.indice_da_intersecao(i, g['n'])
+    pedra = Go.obtem_pedra(g, i)
+    if not Go.eh_pedra_jogador(pedra) or not Go.eh_pedra_jogador(p):
+        raise ValueError('le_escada: argumentos invalidos')
+
+    if p == pedra:
+        escapa, k = _defende_escada(leitura, alvo, pedra)
+        capturada = None if escapa is None else not escapa
+    else:
+        capturada, k = _ataca_escada(leitura, alvo, pedra)
+
+    return _resultado(leitura, 'capturada', capturada, k, inicio)
+
+def le_corrida(g, i1, i2, p, l=None, max_nos=100000, segundos=None):
+    '''
+    le_corrida: goban x intersecao x intersecao x pedra x (goban ou historico) x int x float → dicionário
+
+    Esta função lê a corrida de liberdades entre as cadeias de pedras de jogadores diferentes que passam
+    pelas interseções i1 e i2 do goban g, com o jogador p a jogar, e devolve o resultado com a pedra do
+    jogador que ganha a corrida ('vencedor') e a jogada do jogador p que a ganha, se existir ('jogada').
+    l é o goban anterior ou o histórico da partida, para as repetições.
+    '''
+
+    inicio = time.perf_counter()
+    leitura = _cria_leitura(g, l, max_nos, segundos)
+    g = leitura['goban']
+    pedras = (Go.obtem_pedra(g, i1), Go.obtem_pedra(g, i2))
+    if not all(Go.eh_pedra_jogador(pedra) for pedra in pedras) or pedras[0] == pedras[1] or not Go.eh_pedra_jogador(p):
+        raise ValueError('le_corrida: argumentos invalidos')
+
+    ganha, k = _corrida(leitura, (Go.indice_da_intersecao(i1, g['n']), Go.indice_da_intersecao(i2, g['n'])), p)
+    vencedor = None if ganha is None else (p if ganha else Go.obtem_pedra_adversaria(p))
+
+    return _resultado(leitura, 'vencedor', vencedor, k if ganha else None, inicio)
@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+import Go
+import armazem
+
+
+# Um goban nxn com pedras ao acaso, com a densidade dada, sem verificar capturas nem suicídios
+def _goban_aleatorio(gerador, n, densidade, representacao='listas'):
+    g = Go.cria_goban_vazio(n, representacao)
+    pedras = (Go.cria_pedra_branca(), Go.cria_pedra_preta())
+    for k in range(n * n):
+        if gerador.random() < densidade:
+            Go.coloca_pedra(g, Go.cria_intersecao(chr(ord('A') + k % n), k // n + 1), gerador.choice(pedras))
+    return g
+
+
+def _pedras(g):
+    colunas = Go.obtem_colunas(g)
+    return tuple(sum(coluna.count(pedra) for coluna in colunas)
+                 for pedra in (Go.cria_pedra_branca(), Go.cria_pedra_preta()))
+
+
+@pytest.mark.parametrize('n', [9, 13, 19])
+def test_codificacao_ida_e_volta_em_todas_as_representacoes(n):
+    gerador = random.Random(n)
+
+    for densidade in (0.0, 0.3, 0.7, 1.0):
+        for representacao in Go.REPRESENTACOES:
+            g = _goban_aleatorio(gerador, n, densidade, representacao)
+            codificacao = Go.goban_para_bytes(g)
+            assert len(codificacao) == Go.tamanho_codificacao(n)
+            assert Go.goban_para_bytes(Go.cria_goban_persistente(g)) == codificacao
+
+            for destino in Go.REPRESENTACOES:
+                copia = Go.bytes_para_goban(codificacao, destino)
+                assert Go.gobans_iguais(copia, Go.converte_goban(g, destino))
+                assert Go.obtem_hash(copia) == Go.obtem_hash(g)
+            assert Go.bytes_para_goban(bytearray(codificacao)) == Go.bytes_para_goban(memoryview(codificacao))
+
+
+def test_codificacao_invalida():
+    codificacao = Go.goban_para_bytes(Go.cria_goban_vazio(9))
+    for invalida in (b'', codificacao[:-1], codificacao + b'\x00', bytes([10]) + codificacao[1:]):
+        with pytest.raises(ValueError):
+            Go.bytes_para_goban(invalida)
+
+
+def test_posicao_incompleta_ignorada_e_removida(tmp_path):
+    caminho = str(tmp_path / 'posicoes.bin')
+    gerador = random.Random(0)
+    gobans = [_goban_aleatorio(gerador, 9, 0.4) for _ in range(3)]
+
+    escrita = armazem.abre_para_acrescentar(caminho, 9)
+    for g in gobans[:2]:
+        armazem.acrescenta_posicao(escrita, g)
+    armazem.fecha_armazem(escrita)
+
+    # Uma interrupção deixa metade de uma posição no fim do ficheiro
+    with open(caminho, 'ab') as ficheiro:
+        ficheiro.write(Go.goban_para_bytes(gobans[2])[:5])
+
+    leitura = armazem.abre_para_ler(caminho)
+    assert armazem.numero_posicoes(leitura) == 2
+    assert all(Go.gobans_iguais(armazem.obtem_goban(leitura, indice), gobans[indice]) for indice in range(2))
+    with pytest.raises(IndexError):
+        armazem.obtem_codificacao(leitura, 2)
+    armazem.fecha_armazem(leitura)
+
+    escrita = armazem.abre_para_acrescentar(caminho, 9)
+    armazem.acrescenta_posicao(escrita, gobans[2])
+    armazem.fecha_armazem(escrita)
+
+    leitura = armazem.abre_para_ler(caminho)
+    assert armazem.numero_posicoes(leitura) == 3
+    assert all(Go.gobans_iguais(armazem.obtem_goban(leitura, indice, 'incremental'), Go.converte_goban(g, 'incremental'))
+               for indice, g in enumerate(gobans))
+    armazem.fecha_armazem(leitura)
+
+
+def test_dimensao_diferente_rejeitada(tmp_path):
+    caminho = str(tmp_path / 'posicoes.bin')
+    armazem.fecha_armazem(armazem.abre_para_acrescentar(caminho, 9))
+
+    with pytest.raises(ValueError):
+        armazem.abre_para_acrescentar(caminho, 13)
+    escrita = armazem.abre_para_acrescentar(caminho, 9)
+    with pytest.raises(ValueError):
+        armazem.acrescenta_posicao(escrita, Go.cria_goban_vazio(13))
+    armazem.fecha_armazem(escrita)
+
+
+def test_conta_pedras_numa_vista(tmp_path):
+    caminho = str(tmp_path / 'posicoes.bin')
+    gerador = random.Random(1)
+    gobans = [_goban_aleatorio(gerador, 13, densidade) for densidade in (0.0, 0.2, 0.5, 1.0)]
+
+    escrita = armazem.abre_para_acrescentar(caminho, 13)
+    for g in gobans:
+        armazem.acrescenta_posicao(escrita, g)
+    armazem.fecha_armazem(escrita)
+
+    leitura = armazem.abre_para_ler(caminho)
+    contagens = []
+    for codificacao in armazem.percorre_codificacoes(leitura):
+        assert isinstance(codificacao, memoryview)
+        contagens += [armazem.conta_pedras(codificacao)]
+        codificacao.release()
+    assert contagens == [_pedras(g) for g in gobans]
+    assert armazem.conta_pedras(Go.goban_para_bytes(gobans[1])) == _pedras(gobans[1])
+    armazem.fecha_armazem(leitura)
@@ -0,0 +1,59 @@
+import io
+import json
+
+import pytest
+
+import Go
+import desempenho
+
+
+def test_posicoes_reprodutiveis():
+    for n in desempenho.DIMENSOES:
+        posicoes = desempenho.gera_posicoes(n)
+        assert posicoes == desempenho.gera_posicoes(n)
+        for brancas, pretas in posicoes.values():
+            assert len(set(brancas + pretas)) == len(brancas) + len(pretas)
+
+        # O pente é uma única cadeia
+        _, pente = posicoes['cadeia-gigante']
+        g = Go.cria_goban(n, (), pente)
+        assert len(Go.obtem_cadeia(g, pente[0])) == len(pente)
+
+
+def test_alterar_a_posicao_nao_muda_o_goban():
+    n = 9
+    brancas, pretas = desempenho.gera_posicoes(n)['densidade-0.50']
+    for representacao in Go.REPRESENTACOES:
+        g = Go.cria_goban(n, brancas, pretas, representacao)
+        antes = Go.goban_para_str(g), Go.calcula_pontos(g)
+        _, livre = desempenho._escolhe_intersecoes(g, n)
+        assert desempenho._altera_posicao(g, livre, Go.cria_pedra_preta()) == (g,)
+        assert (Go.goban_para_str(g), Go.calcula_pontos(g)) == antes
+
+
+def test_guardar_e_comparar(tmp_path):
+    base = tmp_path / 'base.json'
+    assert desempenho.main(['--repeticoes', '1', '--representacoes', 'incremental', '--simulacoes', '1',
+                            '--guardar', str(base)]) == 0
+
+    dados = json.loads(base.read_text())
+    assert dados['versao'] == desempenho.VERSAO
+    chaves = set(dados['resultados'])
+    assert 'incremental/19/cadeia-gigante/obtem_cadeia' in chaves and 'simulacoes/9' in chaves
+    assert all(medicao['ops_por_segundo'] > 0 for medicao in dados['resultados'].values())
+
+    saida = io.StringIO()
+    assert desempenho.compara(dados['resultados'], str(base), 0.2, saida) == []
+    assert not 'REGRESSAO' in saida.getvalue()
+
+    # Medições cem vezes mais lentas são todas regressões
+    lentas = {chave: {'ops_por_segundo': medicao['ops_por_segundo'] / 100}
+              for chave, medicao in dados['resultados'].items()}
+    saida = io.StringIO()
+    assert sorted(desempenho.compara(lentas, str(base), 0.2, saida)) == sorted(chaves)
+    assert saida.getvalue().count('REGRESSAO') == len(chaves)
+
+    dados['versao'] = desempenho.VERSAO + 1
+    base.write_text(json.dumps(dados))
+    with pytest.raises(ValueError):
+        desempenho.compara(lentas, str(base), 0.2, io.StringIO())
@@ -0,0 +1,57 @@
+import io
+import random
+
+import pytest
+
+import Go
+
+
+# O desenho de referência, interseção a interseção, como o goban_para_str original
+def _referencia(g):
+    n = Go.obtem_tamanho(g)
+    letras = '   ' + ' '.join(chr(ord('A') + coluna) for coluna in range(n))
+    linhas = [letras]
+    for linha in range(n, 0, -1):
+        pedras = ' '.join(Go.pedra_para_str(Go.obtem_pedra(g, Go.cria_intersecao(chr(ord('A') + coluna), linha)))
+                          for coluna in range(n))
+        linhas += [f'{linha:>2} {pedras} {linha:>2}']
+    return '\n'.join(linhas + [letras])
+
+
+@pytest.mark.parametrize('representacao', Go.REPRESENTACOES)
+def test_desenho_incremental_igual_a_goban_para_str(representacao):
+    gerador = random.Random(11)
+    g = Go.cria_goban_vazio(9, representacao)
+    h = Go.regista_goban(Go.cria_historico(), g)
+    por_linhas, por_alteradas = Go.cria_desenho(g), Go.cria_desenho(g)
+    p = Go.cria_pedra_preta()
+    gobans = []
+    capturas = 0
+
+    for _ in range(150):
+        legais = Go.jogadas_legais(g, p, h)
+        if not legais:
+            break
+        i = gerador.choice(legais)
+        capturadas = Go.obtem_capturadas(Go.faz_jogada(g, i, p, h))
+        capturas += len(capturadas)
+        p = Go.obtem_pedra_adversaria(p)
+
+        texto = Go.goban_para_str(g)
+        assert texto == _referencia(g)
+        assert Go.desenha_goban(por_linhas, g) == texto
+        assert Go.desenha_goban(por_alteradas, g, (i,) + tuple(capturadas)) == texto
+        gobans += [Go.cria_copia_goban(g)]
+
+    # As partidas têm de ter capturas, e só as linhas alteradas são redesenhadas
+    assert capturas > 0
+    assert por_linhas['desenhadas'] < 9 + 9 * len(gobans)
+
+    ficheiro = io.StringIO()
+    assert Go.escreve_gobans(gobans, ficheiro) == len(gobans)
+    assert ficheiro.getvalue() == ''.join(Go.goban_para_str(goban) + '\n' for goban in gobans)
+
+
+def test_desenho_de_outra_dimensao():
+    with pytest.raises(ValueError, match='desenha_goban: argumentos invalidos'):
+        Go.desenha_goban(Go.cria_desenho(Go.cria_goban_vazio(9)), Go.cria_goban_vazio(13))
@@ -0,0 +1,89 @@
+import Go
+import final
+import transposicoes
+
+
+def _goban(linhas):
+    # Uma linha por linha do goban, de cima para baixo: X preta, O branca, . livre
+    n = len(linhas)
+    brancas, pretas = [], []
+    for i, linha in enumerate(linhas):
+        for j, simbolo in enumerate(linha):
+            intersecao = Go.cria_intersecao(chr(ord('A') + j), n - i)
+            if simbolo == 'O':
+                brancas += [intersecao]
+            elif simbolo == 'X':
+                pretas += [intersecao]
+    return Go.cria_goban(n, tuple(brancas), tuple(pretas))
+
+
+# Dois grupos vivos com dois olhos cada e 3 interseções neutras na coluna E; o branco tem mais 2 pontos
+TRES_NEUTRAS = _goban(('XXXXOOOOO',
+                       'XXXXOOOOO',
+                       'X.XXOOO.O',
+                       'XXXXOOOOO',
+                       'XXXX.OOOO',
+                       'XXXX.OOOO',
+                       'X.XX.OO.O',
+                       'XXXXXOOOO',
+                       'XXXXXOOOO'))
+
+# Os mesmos grupos com 5 interseções neutras; o branco tem mais 4 pontos
+CINCO_NEUTRAS = _goban(('XXXXOOOOO',
+                        'XXXXOOOOO',
+                        'X.XXOOO.O',
+                        'XXXXOOOOO',
+                        'XXXX.OOOO',
+                        'XXXX.OOOO',
+                        'X.XX.OO.O',
+                        'XXXX.OOOO',
+                        'XXXX.OOOO'))
+
+
+def test_finais_com_valor_conhecido():
+    # Quem joga ocupa uma interseção neutra a mais do que o adversário
+    preta, branca = Go.cria_pedra_preta(), Go.cria_pedra_branca()
+    casos = ((TRES_NEUTRAS, preta, -1), (TRES_NEUTRAS, branca, 3),
+             (CINCO_NEUTRAS, preta, -3), (CINCO_NEUTRAS, branca, 5))
+
+    for g, p, valor in casos:
+        resultado = final.resolve_final(g, p, None, segundos=30)
+        assert resultado['valor'] == valor
+        assert resultado['exato']
+        assert Go.obtem_col(resultado['jogada']) == 'E'
+        assert resultado['nos'] > 0
+
+        tabela = resultado['tabela']
+        assert 0 < tabela['entradas'] <= tabela['capacidade']
+        assert tabela['acertos'] + tabela['falhas'] == resultado['nos']
+        assert tabela['substituicoes'] == 0
+
+
+def test_tabela_limitada_e_reutilizada():
+    preta = Go.cria_pedra_preta()
+
+    limitada = final.resolve_final(CINCO_NEUTRAS, preta, None, segundos=30, max_entradas=10)
+    assert limitada['valor'] == -3 and limitada['exato']
+    assert limitada['tabela']['entradas'] <= 10
+    assert limitada['tabela']['substituicoes'] > 0
+
+    tabela = transposicoes.cria_tabela(1000)
+    primeira = final.resolve_final(CINCO_NEUTRAS, preta, None, segundos=30, tabela=tabela)
+    segunda = final.resolve_final(CINCO_NEUTRAS, preta, None, segundos=30, tabela=tabela)
+    assert primeira['valor'] == segunda['valor'] == -3
+    assert segunda['nos'] < primeira['nos']
+
+
+def test_orcamento_esgotado():
+    # No goban vazio, a 1 jogada o preto fica com todas as interseções e a 2 jogadas o branco responde
+    g = Go.cria_goban_vazio(9)
+    resultado = final.resolve_final(g, Go.cria_pedra_preta(), None, max_nos=2000)
+
+    assert not resultado['exato']
+    assert resultado['profundidade'] in (1, 2)
+    assert resultado['valor'] == {1: 81, 2: 0}[resultado['profundidade']]
+    assert resultado['nos'] <= 2001
+
+    # Sem nenhuma iteração completa não há valor nem jogada
+    resultado = final.resolve_final(g, Go.cria_pedra_preta(), None, max_nos=10)
+    assert resultado['valor'] is None and resultado['jogada'] is None and resultado['profundidade'] == 0
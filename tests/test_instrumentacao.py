@@ -0,0 +1,51 @@
+import json
+
+import Go
+import instrumentacao
+
+
+def test_ativa_e_desativa_repoem_as_funcoes(tmp_path):
+    originais = {nome: getattr(Go, nome) for nome in list(instrumentacao.INSTRUMENTADAS) + ['go']}
+    relatorio = tmp_path / 'relatorio.json'
+
+    instrumentacao.reinicia()
+    instrumentacao.ativa(str(relatorio))
+    try:
+        assert instrumentacao.esta_ativa()
+        # Ativar outra vez não instrumenta as funções já instrumentadas
+        instrumentacao.ativa(str(relatorio))
+        for nome, funcao in originais.items():
+            assert not getattr(Go, nome) is funcao
+            assert getattr(Go, nome).__wrapped__ is funcao
+
+        g = Go.cria_goban(9, (Go.cria_intersecao('C', 3),), (Go.cria_intersecao('D', 4), Go.cria_intersecao('D', 5)))
+        cadeia = Go.obtem_cadeia(g, Go.cria_intersecao('D', 4))
+        Go.obtem_adjacentes_diferentes(g, cadeia)
+        Go.obtem_territorios(g)
+        Go.go(9, (), (), fonte_preto=['C3', 'P'], fonte_branco=['E5', 'P'])
+
+        contagens = instrumentacao.obtem_contagens()
+        assert contagens['obtem_cadeia']['conjuntos'] >= 1
+        assert contagens['obtem_cadeia']['maximo'] >= 2
+        assert contagens['obtem_territorios']['conjuntos'] >= 1
+        # As liberdades não são contadas como cadeias
+        assert contagens['obtem_adjacentes_diferentes']['chamadas'] >= 1
+        assert contagens['obtem_adjacentes_diferentes']['conjuntos'] == 0
+        assert contagens['jogada']['chamadas'] >= 2
+
+        # O relatório é escrito no fim de cada go
+        assert json.loads(relatorio.read_text()) == json.loads(json.dumps(contagens))
+    finally:
+        instrumentacao.desativa()
+
+    assert not instrumentacao.esta_ativa()
+    for nome, funcao in originais.items():
+        assert getattr(Go, nome) is funcao
+
+    # Desativada, as chamadas já não são contadas
+    chamadas = instrumentacao.obtem_contagens()['obtem_cadeia']['chamadas']
+    Go.obtem_cadeia(Go.cria_goban_vazio(9), Go.cria_intersecao('A', 1))
+    assert instrumentacao.obtem_contagens()['obtem_cadeia']['chamadas'] == chamadas
+
+    instrumentacao.reinicia()
+    assert instrumentacao.obtem_contagens() == {}
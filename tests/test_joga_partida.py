@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+import Go
+
+# Um ko no canto: o preto captura em C2 e o branco não pode recapturar logo em B2
+BRANCAS_KO = ('C3', 'B2', 'D2', 'C1')
+PRETAS_KO = ('B3', 'A2', 'B1')
+
+
+# Uma fonte que escolhe jogadas legais ao acaso e passa depois de max_jogadas jogadas
+def _fonte_aleatoria(semente, max_jogadas):
+    gerador = random.Random(semente)
+    feitas = []
+
+    def fonte(g, p, h):
+        legais = Go.jogadas_legais(g, p, h)
+        if len(feitas) >= max_jogadas or not legais:
+            return 'P'
+        feitas.append(None)
+        return gerador.choice(legais)
+
+    return fonte
+
+
+def test_reproducao_e_go_iguais_a_joga_partida(capsys):
+    for semente in range(3):
+        goban, pontuacao, registo = Go.joga_partida(9, (), (), _fonte_aleatoria(semente, 60),
+                                                    _fonte_aleatoria(semente + 100, 60))
+        # A partida termina com duas passagens seguidas, alternando os jogadores a começar pelo preto
+        assert [intersecao for _, intersecao in registo[-2:]] == [None, None]
+        assert [pedra for pedra, _ in registo] == [(Go.cria_pedra_preta(), Go.cria_pedra_branca())[k % 2]
+                                                  for k in range(len(registo))]
+        assert pontuacao == Go.calcula_pontos(goban)
+
+        # A reprodução das jogadas registadas chega ao mesmo goban
+        jogadas = [intersecao for _, intersecao in registo]
+        final, pontos, ilegal = Go.reproduz_partida(9, (), (), jogadas)
+        assert ilegal is None
+        assert Go.gobans_iguais(final, goban) and pontos == pontuacao
+
+        # E go, com as mesmas jogadas como fontes, termina com a mesma pontuação
+        externas = ['P' if intersecao is None else Go.intersecao_para_str(intersecao) for intersecao in jogadas]
+        capsys.readouterr()
+        assert Go.go(9, (), (), fonte_preto=externas[::2], fonte_branco=externas[1::2]) == (pontuacao[0] > pontuacao[1])
+        assert f'Branco (O) tem {pontuacao[0]} pontos\nPreto (X) tem {pontuacao[1]} pontos\n' in capsys.readouterr().out
+
+
+def test_jogadas_ilegais_sao_ignoradas_ou_reportadas():
+    # O branco tenta recapturar o ko, o que é ignorado, e joga em G7
+    goban, _, registo = Go.joga_partida(9, BRANCAS_KO, PRETAS_KO, ['C2'], ['B2', 'Z9', 'G7'])
+    assert [(Go.pedra_para_str(pedra), None if i is None else Go.intersecao_para_str(i)) for pedra, i in registo] == \
+        [('X', 'C2'), ('O', 'G7'), ('X', None), ('O', None)]
+    assert not Go.eh_pedra_jogador(Go.obtem_pedra(goban, Go.cria_intersecao('B', 2)))
+
+    # A reprodução para antes da primeira jogada ilegal
+    ib, ip = (tuple(Go.str_para_intersecao(i) for i in pedras) for pedras in (BRANCAS_KO, PRETAS_KO))
+    goban, pontuacao, ilegal = Go.reproduz_partida(9, ib, ip, ['C2', 'B2', 'G7'])
+    assert ilegal == (1, 'B2')
+    assert Go.obtem_pedra(goban, Go.cria_intersecao('C', 2)) == Go.cria_pedra_preta()
+    assert pontuacao == Go.calcula_pontos(goban)
+
+    with pytest.raises(ValueError, match='joga_partida: argumentos invalidos'):
+        Go.joga_partida(9, (), (), 3, ())
@@ -0,0 +1,18 @@
+import pytest
+
+import Go
+
+I = Go.cria_intersecao
+
+
+@pytest.mark.parametrize('representacao', Go.REPRESENTACOES)
+def test_cadeia_adjacente_por_dois_lados_capturada_uma_vez(representacao):
+    # A cadeia branca A2-A1-B1 toca a jogada preta em B2 por dois lados
+    g = Go.cria_goban(9, (I('A', 2), I('A', 1), I('B', 1)), (I('A', 3), I('C', 1)), representacao)
+    antes = Go.goban_para_str(g)
+
+    registo = Go.faz_jogada(g, I('B', 2), Go.cria_pedra_preta())
+    assert Go.obtem_capturadas(registo) == (I('A', 1), I('B', 1), I('A', 2))
+
+    Go.desfaz_jogada(g, registo)
+    assert Go.goban_para_str(g) == antes
@@ -0,0 +1,88 @@
+import collections
+import concurrent.futures
+import json
+import random
+
+import Go
+import lote
+
+# Uma linha em JSON inválida e uma partida SGF inválida entre partidas válidas
+JOGOS = '{"n": 9, "jogadas": ["E5", "C3"]}\n{"n": 9, "jogadas": [\n{"n": 9, "jogadas": ["D4"]}\n'
+COLECAO = '(;GM[1]SZ[9];B[ee];W[cc])\n(;GM[1]SZ[9];B[e1];W[cc])\n(;GM[1]SZ[9];B[dd])\n'
+
+
+def _resultados(caminho):
+    with open(caminho) as ficheiro:
+        return sorted((json.loads(linha) for linha in ficheiro), key=lambda resultado: resultado['indice'])
+
+
+def test_registos_invalidos_nao_interrompem_o_lote(tmp_path):
+    for nome, texto in (('partidas.jsonl', JOGOS), ('partidas.sgf', COLECAO)):
+        partidas = tmp_path / nome
+        partidas.write_text(texto)
+        resultados = tmp_path / (nome + '.resultados')
+
+        assert lote.main([str(partidas), str(resultados), '--trabalhadores', '1']) == 0
+
+        obtidos = _resultados(resultados)
+        assert [resultado['indice'] for resultado in obtidos] == [0, 1, 2]
+        assert obtidos[1]['erro'] and obtidos[1]['pontuacao'] is None
+        assert obtidos[0]['erro'] is None and obtidos[2]['erro'] is None
+        assert not obtidos[2]['pontuacao'] is None
+
+
+# Partidas de jogadas ao acaso, algumas ilegais, para que os resultados sejam diferentes
+def _jogos(numero, semente=0):
+    gerador = random.Random(semente)
+    intersecoes = [Go.cria_intersecao(chr(ord('A') + coluna), linha) for linha in range(1, 10) for coluna in range(9)]
+    return [{'n': 9, 'ib': (), 'ip': (), 'jogadas': gerador.sample(intersecoes, gerador.randrange(1, 40))}
+            for _ in range(numero)]
+
+
+def test_varios_processos_dao_os_mesmos_resultados():
+    jogos = _jogos(25)
+    esperados = list(lote.executa_lote(jogos, trabalhadores=1, tamanho_lote=4))
+    assert [resultado['indice'] for resultado in esperados] == list(range(25))
+
+    ordenados = list(lote.executa_lote(iter(jogos), trabalhadores=2, tamanho_lote=3, max_pendentes=2))
+    assert ordenados == esperados
+
+    desordenados = list(lote.executa_lote(iter(jogos), trabalhadores=3, tamanho_lote=2, ordenado=False))
+    assert sorted(desordenados, key=lambda resultado: resultado['indice']) == esperados
+
+    saltados = list(lote.executa_lote(jogos, trabalhadores=2, tamanho_lote=5, concluidos={0, 7, 24}))
+    assert saltados == [resultado for resultado in esperados if not resultado['indice'] in (0, 7, 24)]
+
+
+def _futuro(resultados=None):
+    futuro = concurrent.futures.Future()
+    if not resultados is None:
+        futuro.set_result(([{'indice': indice} for indice in resultados], None))
+    return futuro
+
+
+def test_recolhe_ordenado_e_por_ordem_de_conclusao():
+    # Pela ordem das partidas, só o lote mais antigo é recolhido
+    pendentes = collections.deque([_futuro([0, 1]), _futuro([2, 3])])
+    assert lote._recolhe(pendentes, True) == [{'indice': 0}, {'indice': 1}]
+    assert len(pendentes) == 1
+
+    # Sem ordem, são recolhidos os lotes terminados, mesmo depois de um lote por terminar
+    antigo = _futuro()
+    pendentes = collections.deque([antigo, _futuro([2]), _futuro([3])])
+    assert lote._recolhe(pendentes, False) == [{'indice': 2}, {'indice': 3}]
+    assert list(pendentes) == [antigo]
+
+
+def test_retoma_depois_de_uma_linha_incompleta(tmp_path):
+    jogos = _jogos(12, 1)
+    caminho = tmp_path / 'resultados.jsonl'
+    esperados = list(lote.executa_lote(jogos, trabalhadores=1))
+
+    # Uma interrupção deixa 5 resultados completos e metade do sexto
+    linhas = [json.dumps(resultado) + '\n' for resultado in esperados[:6]]
+    caminho.write_text(''.join(linhas[:5]) + linhas[5][:len(linhas[5]) // 2])
+
+    assert lote.executa_lote_para_ficheiro(jogos, str(caminho), trabalhadores=2, tamanho_lote=2) == 7
+    assert _resultados(caminho) == json.loads(json.dumps(esperados))
+    assert lote.executa_lote_para_ficheiro(jogos, str(caminho), trabalhadores=2) == 0
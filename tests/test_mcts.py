@@ -0,0 +1,54 @@
+import pytest
+
+import Go
+import mcts
+
+# Um ko: o preto acabou de capturar em C2 e o branco não pode recapturar logo em B2
+BRANCAS_KO = tuple(Go.cria_intersecao(*i) for i in (('C', 3), ('B', 2), ('D', 2), ('C', 1)))
+PRETAS_KO = tuple(Go.cria_intersecao(*i) for i in (('B', 3), ('A', 2), ('B', 1)))
+
+
+def _ko():
+    l = Go.cria_goban(9, BRANCAS_KO, PRETAS_KO)
+    g = Go.jogada(Go.cria_copia_goban(l), Go.cria_intersecao('C', 2), Go.cria_pedra_preta())
+    return g, l
+
+
+@pytest.mark.parametrize('trabalhadores', [1, 2])
+def test_jogada_legal_e_reprodutivel(trabalhadores):
+    g, l = _ko()
+    branca = Go.cria_pedra_branca()
+    antes = Go.goban_para_str(g), Go.goban_para_str(l)
+
+    escolhas = []
+    for _ in range(2):
+        jogador = mcts.cria_jogador_mcts(simulacoes=60, trabalhadores=trabalhadores, semente=3)
+        try:
+            escolhas += [(mcts.escolhe_jogada_mcts(jogador, g, branca, l), jogador['estatisticas'])]
+        finally:
+            mcts.termina_jogador_mcts(jogador)
+
+    # A mesma semente e o mesmo número de trabalhadores dão a mesma procura
+    assert escolhas[0] == escolhas[1]
+    intersecao, estatisticas = escolhas[0]
+    assert not intersecao is None and Go.eh_jogada_legal(g, intersecao, branca, l)
+    assert not intersecao == Go.cria_intersecao('B', 2)
+
+    # Cada simulação visita uma jogada da raiz
+    assert estatisticas['simulacoes'] == 60
+    assert sum(visitas for visitas, _ in estatisticas['jogadas'].values()) == 60
+    assert (Go.goban_para_str(g), Go.goban_para_str(l)) == antes
+
+
+def test_passa_quando_o_adversario_passou_e_esta_a_ganhar():
+    g = Go.cria_goban(9, (), (Go.cria_intersecao('E', 5),))
+    jogador = mcts.cria_jogador_mcts(simulacoes=10)
+
+    assert mcts.escolhe_jogada_mcts(jogador, g, Go.cria_pedra_preta(), g, adversario_passou=True) is None
+    assert jogador['estatisticas'] == {'simulacoes': 0, 'jogadas': {}}
+
+
+def test_argumentos_invalidos():
+    for argumentos in ({'simulacoes': None}, {'simulacoes': 0}, {'trabalhadores': 0}, {'segundos': -1}):
+        with pytest.raises(ValueError, match='cria_jogador_mcts: argumentos invalidos'):
+            mcts.cria_jogador_mcts(**argumentos)
@@ -0,0 +1,51 @@
+import random
+
+import Go
+
+
+def test_gobans_persistentes_partilham_as_colunas_iguais():
+    gerador = random.Random(4)
+    g = Go.cria_goban_vazio(9)
+    h = Go.regista_goban(Go.cria_historico(), g)
+    persistentes = [Go.cria_goban_persistente(g)]
+    jogadas = []
+    p = Go.cria_pedra_preta()
+    capturas = 0
+
+    for numero in range(160):
+        legais = Go.jogadas_legais(g, p, h)
+        # Algumas passagens pelo meio
+        i = None if not legais or numero % 37 == 36 else gerador.choice(legais)
+        antes = [list(coluna) for coluna in Go.obtem_colunas(g)]
+        anterior = persistentes[-1]
+        if i is None:
+            persistentes += [anterior]
+        else:
+            capturas += len(Go.obtem_capturadas(Go.faz_jogada(g, i, p, h)))
+            persistentes += [Go.joga_persistente(anterior, i, p)]
+        jogadas += [i]
+        p = Go.obtem_pedra_adversaria(p)
+
+        atual = persistentes[-1]
+        assert Go.gobans_iguais(Go.converte_goban(atual, 'listas'), g)
+        assert Go.obtem_hash(atual) == Go.obtem_hash(g)
+        assert Go.goban_para_str(atual) == Go.goban_para_str(g)
+        # Só as colunas com interseções alteradas (a jogada e as capturas) são novas
+        for coluna in range(9):
+            if antes[coluna] == Go.obtem_colunas(g)[coluna]:
+                assert atual['colunas'][coluna] is anterior['colunas'][coluna]
+            else:
+                assert not atual['colunas'][coluna] is anterior['colunas'][coluna]
+
+    assert capturas > 0
+
+    # reproduz_persistente chega às mesmas posições, repetindo o goban nas passagens
+    reproduzidas = Go.reproduz_persistente(Go.cria_goban_vazio(9), jogadas)
+    assert [Go.goban_para_bytes(posicao) for posicao in reproduzidas] == \
+        [Go.goban_para_bytes(posicao) for posicao in persistentes]
+    for k, i in enumerate(jogadas):
+        if i is None:
+            assert reproduzidas[k + 1] is reproduzidas[k]
+
+    # As posições antigas não foram modificadas pelas jogadas seguintes
+    assert not any(Go.eh_pedra_jogador(pedra) for coluna in persistentes[0]['colunas'] for pedra in coluna)
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import Go
+import planos
+
+
+def _intersecoes(n):
+    return [Go.cria_intersecao(chr(ord('A') + coluna), linha) for linha in range(1, n + 1) for coluna in range(n)]
+
+
+def _plano(planos_goban, nome):
+    return planos_goban[planos.PLANOS.index(nome)]
+
+
+# Posições de uma partida ao acaso, cada uma com a pedra a jogar e o goban anterior
+def _posicoes(n, semente, jogadas):
+    gerador = random.Random(semente)
+    g, l, p = Go.cria_goban_vazio(n), Go.cria_goban_vazio(n), Go.cria_pedra_preta()
+    posicoes = []
+    for _ in range(jogadas):
+        legais = Go.jogadas_legais(g, p, l)
+        if not legais:
+            break
+        anterior = Go.cria_copia_goban(g)
+        Go.jogada(g, gerador.choice(legais), p)
+        l, p = anterior, Go.obtem_pedra_adversaria(p)
+        posicoes += [(Go.cria_copia_goban(g), p, l)]
+    return posicoes
+
+
+# Um ko: o preto acabou de capturar em C2 e o branco não pode recapturar logo em B2
+def _ko():
+    brancas = tuple(Go.cria_intersecao(*i) for i in (('C', 3), ('B', 2), ('D', 2), ('C', 1)))
+    pretas = tuple(Go.cria_intersecao(*i) for i in (('B', 3), ('A', 2), ('B', 1)))
+    l = Go.cria_goban(9, brancas, pretas)
+    g = Go.jogada(Go.cria_copia_goban(l), Go.cria_intersecao('C', 2), Go.cria_pedra_preta())
+    return g, Go.cria_pedra_branca(), l
+
+
+def test_planos_iguais_as_regras():
+    posicoes = _posicoes(9, 1, 120)[::10] + [_ko()]
+    gobans = [g for g, _, _ in posicoes]
+    saida = planos.extrai_planos(gobans, [p for _, p, _ in posicoes], [l for _, _, l in posicoes])
+
+    ko = 0
+    for (g, p, l), planos_goban in zip(posicoes, saida):
+        for i in _intersecoes(9):
+            posicao = (Go.obtem_lin(i) - 1, ord(Go.obtem_col(i)) - ord('A'))
+            pedra = Go.obtem_pedra(g, i)
+
+            liberdades = len(Go.obtem_adjacentes_diferentes(g, Go.obtem_cadeia(g, i))) \
+                if Go.eh_pedra_jogador(pedra) else 0
+            assert _plano(planos_goban, 'liberdades_1')[posicao] == (liberdades == 1)
+            assert _plano(planos_goban, 'liberdades_2')[posicao] == (liberdades == 2)
+            assert _plano(planos_goban, 'liberdades_3')[posicao] == (liberdades >= 3)
+
+            legal = Go.eh_jogada_legal(g, i, p, l)
+            assert _plano(planos_goban, 'legais')[posicao] == legal
+            assert _plano(planos_goban, 'ko')[posicao] == (not legal and Go.eh_jogada_legal(g, i, p, Go.cria_historico()))
+            ko += int(_plano(planos_goban, 'ko')[posicao])
+
+    assert _plano(saida[-1], 'ko')[1, 1] == 1
+    assert ko >= 1
+
+
+def test_sem_anterior_nao_ha_ko():
+    g, p, _ = _ko()
+    saida = planos.extrai_planos([g], p)
+
+    assert not _plano(saida[0], 'ko').any()
+    assert _plano(saida[0], 'legais')[1, 1] == 1
+
+
+# O goban com as pedras dos planos de pedras dados, indexados por [linha - 1, coluna]
+def _goban_dos_planos(planos_goban):
+    n = planos_goban.shape[-1]
+    pedras = []
+    for nome in ('brancas', 'pretas'):
+        linhas, colunas = np.nonzero(_plano(planos_goban, nome))
+        pedras += [tuple(Go.cria_intersecao(chr(ord('A') + int(coluna)), int(linha) + 1)
+                         for linha, coluna in zip(linhas, colunas))]
+    return Go.cria_goban(n, *pedras)
+
+
+def test_simetrias():
+    posicoes = _posicoes(9, 2, 80)[::8]
+    gobans = [g for g, _, _ in posicoes]
+    pedras = [p for _, p, _ in posicoes]
+    base = planos.extrai_planos(gobans, pedras)
+    saida = planos.extrai_planos(gobans, pedras, simetrias=True)
+
+    assert np.array_equal(saida[:, 0], base)
+    for simetria in range(planos.SIMETRIAS):
+        esperado = np.rot90(base, simetria % 4, axes=(-2, -1))
+        if simetria >= 4:
+            esperado = np.flip(esperado, axis=-1)
+        assert np.array_equal(saida[:, simetria], esperado)
+
+        # Os planos do goban transformado são os planos transformados
+        transformados = [_goban_dos_planos(planos_goban) for planos_goban in saida[:, simetria]]
+        assert np.array_equal(planos.extrai_planos(transformados, pedras), saida[:, simetria])
+
+    with pytest.raises(ValueError):
+        planos.aplica_simetria(base, planos.SIMETRIAS)
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import Go
+import pontuacao_numpy
+
+
+# Um goban nxn com pedras ao acaso, com a densidade dada, sem verificar capturas nem suicídios
+def _goban_aleatorio(gerador, n, densidade, representacao):
+    g = Go.cria_goban_vazio(n, representacao)
+    pedras = (Go.cria_pedra_branca(), Go.cria_pedra_preta())
+    for k in range(n * n):
+        if gerador.random() < densidade:
+            Go.coloca_pedra(g, Go.cria_intersecao(chr(ord('A') + k % n), k // n + 1), gerador.choice(pedras))
+    return g
+
+
+@pytest.mark.parametrize('n', [9, 13, 19])
+def test_pontua_lote_igual_a_calcula_pontos(n):
+    gerador = random.Random(n)
+    gobans = [_goban_aleatorio(gerador, n, densidade, representacao)
+              for densidade in (0.0, 0.05, 0.2, 0.5, 0.8, 1.0)
+              for representacao in Go.REPRESENTACOES
+              for _ in range(5)]
+
+    pontos = pontuacao_numpy.pontua_lote(pontuacao_numpy.gobans_para_array(gobans))
+
+    assert pontos.shape == (len(gobans), 2)
+    assert [tuple(int(valor) for valor in linha) for linha in pontos] == [Go.calcula_pontos(g) for g in gobans]
+
+
+def test_codificacoes_e_gobans_dao_o_mesmo_array():
+    gerador = random.Random(0)
+    gobans = [_goban_aleatorio(gerador, 9, 0.4, 'listas') for _ in range(10)]
+
+    assert np.array_equal(pontuacao_numpy.codificacoes_para_array([Go.goban_para_bytes(g) for g in gobans]),
+                          pontuacao_numpy.gobans_para_array(gobans))
+
+
+def test_dimensoes_diferentes_sao_rejeitadas():
+    with pytest.raises(ValueError):
+        pontuacao_numpy.gobans_para_array([Go.cria_goban_vazio(9), Go.cria_goban_vazio(13)])
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+import Go
+
+# A representação em listas é a original; as outras têm de dar sempre os mesmos resultados
+REFERENCIA = 'listas'
+
+
+def _intersecoes(n):
+    return [Go.cria_intersecao(chr(ord('A') + coluna), linha) for linha in range(1, n + 1) for coluna in range(n)]
+
+
+# Tudo o que as regras observam de uma posição, numa forma comparável entre representações
+def _estado(g, p, l):
+    return {'colunas': tuple(tuple(coluna) for coluna in Go.obtem_colunas(g)),
+            'hash': Go.obtem_hash(g),
+            'pontos': Go.calcula_pontos(g),
+            'territorios': Go.obtem_territorios(g),
+            'legais': Go.jogadas_legais(g, p, l)}
+
+
+# Faz e desfaz a jogada da pedra p em i e verifica que o goban e o histórico ficam iguais
+def _verifica_desfazer(g, p, h, i):
+    antes = _estado(g, p, h)
+    sequencia = list(h['sequencia'])
+    registo = Go.faz_jogada(g, i, p, h)
+    Go.desfaz_jogada(g, registo)
+    assert _estado(g, p, h) == antes
+    assert h['sequencia'] == sequencia
+
+
+@pytest.mark.parametrize('n, semente, jogadas, superko', [(9, 1, 160, False), (9, 2, 160, True),
+                                                          (9, 3, 220, False), (13, 4, 120, False)])
+def test_partidas_aleatorias_iguais_em_todas_as_representacoes(n, semente, jogadas, superko):
+    gerador = random.Random(semente)
+    intersecoes = _intersecoes(n)
+    gobans = {representacao: Go.cria_goban_vazio(n, representacao) for representacao in Go.REPRESENTACOES}
+    historicos = {representacao: Go.regista_goban(Go.cria_historico(superko), gobans[representacao])
+                  for representacao in Go.REPRESENTACOES}
+    pedras = (Go.cria_pedra_preta(), Go.cria_pedra_branca())
+    capturas = 0
+
+    for numero in range(jogadas):
+        p = pedras[numero % 2]
+        estados = {r: _estado(gobans[r], p, historicos[r]) for r in Go.REPRESENTACOES}
+        for representacao in Go.REPRESENTACOES:
+            assert estados[representacao] == estados[REFERENCIA], representacao
+
+        # A legalidade de interseções ao acaso, livres ou ocupadas, com e sem verificação
+        for i in gerador.sample(intersecoes, 8):
+            legal = Go.eh_jogada_legal(gobans[REFERENCIA], i, p, historicos[REFERENCIA])
+            assert legal == (i in estados[REFERENCIA]['legais'])
+            for representacao in Go.REPRESENTACOES:
+                g, h = gobans[representacao], historicos[representacao]
+                assert Go.eh_jogada_legal(g, i, p, h) == legal
+                if not Go.eh_pedra_jogador(Go.obtem_pedra(g, i)):
+                    assert Go.eh_jogada_legal_sem_verificacao(g, i, p, h) == legal
+
+        legais = estados[REFERENCIA]['legais']
+        if not legais or gerador.random() < 0.05:
+            for representacao in Go.REPRESENTACOES:
+                Go.regista_goban(historicos[representacao], gobans[representacao])
+        else:
+            # Uma jogada desfeita e depois a jogada da partida, com as mesmas capturas em todas as representações
+            desfeita, i = gerador.choice(legais), gerador.choice(legais)
+            capturadas = {}
+            for representacao in Go.REPRESENTACOES:
+                g, h = gobans[representacao], historicos[representacao]
+                _verifica_desfazer(g, p, h, desfeita)
+                capturadas[representacao] = Go.obtem_capturadas(Go.faz_jogada(g, i, p, h))
+            for representacao in Go.REPRESENTACOES:
+                assert capturadas[representacao] == capturadas[REFERENCIA], representacao
+            capturas += len(capturadas[REFERENCIA])
+
+    # As partidas têm de ter capturas para que a comparação as cubra
+    assert capturas > 0
+
+
+def test_faz_jogada_incremental_igual_a_jogada_em_listas():
+    gerador = random.Random(5)
+    intersecoes = _intersecoes(9)
+    g1 = Go.cria_goban_vazio(9)
+    g2 = Go.cria_goban_vazio(9, 'incremental')
+    anterior = Go.cria_goban_vazio(9)
+    pedras = (Go.cria_pedra_preta(), Go.cria_pedra_branca())
+
+    for numero in range(200):
+        p = pedras[numero % 2]
+        legais = [i for i in intersecoes if Go.eh_jogada_legal(g1, i, p, anterior)]
+        anterior = Go.cria_copia_goban(g1)
+        if legais:
+            i = gerador.choice(legais)
+            Go.jogada(g1, i, p)
+            Go.faz_jogada(g2, i, p)
+            assert Go.gobans_iguais(g1, Go.converte_goban(g2, 'listas'))
+            assert Go.gobans_iguais_sem_verificacao(g1, Go.converte_goban(g2, 'listas'))
+            assert Go.obtem_hash(g1) == Go.obtem_hash(g2)
+            for j in gerador.sample(intersecoes, 4):
+                assert Go.obtem_cadeia(g1, j) == Go.obtem_cadeia(g2, j)
+
+
+def test_goban_anterior_de_outra_dimensao_nao_proibe_jogadas():
+    # O ko de C2 só proíbe B2 com o goban anterior da mesma dimensão
+    brancas = tuple(Go.cria_intersecao(*i) for i in (('C', 3), ('B', 2), ('D', 2), ('C', 1)))
+    pretas = tuple(Go.cria_intersecao(*i) for i in (('B', 3), ('A', 2), ('B', 1)))
+    retoma = Go.cria_intersecao('B', 2)
+
+    for representacao in Go.REPRESENTACOES:
+        anterior = Go.converte_goban(Go.cria_goban(9, brancas, pretas), representacao)
+        g = Go.jogada(Go.cria_copia_goban(anterior), Go.cria_intersecao('C', 2), Go.cria_pedra_preta())
+        assert not Go.eh_jogada_legal(g, retoma, Go.cria_pedra_branca(), anterior)
+        assert not retoma in Go.jogadas_legais(g, Go.cria_pedra_branca(), anterior)
+
+        for outro in (Go.cria_goban(13, brancas, pretas), Go.cria_goban_vazio(19, representacao), None, 'goban'):
+            assert Go.eh_jogada_legal(g, retoma, Go.cria_pedra_branca(), outro), representacao
+            assert retoma in Go.jogadas_legais(g, Go.cria_pedra_branca(), outro)
@@ -0,0 +1,107 @@
+import asyncio
+import concurrent.futures
+import concurrent.futures.process
+
+import pytest
+
+import servidor
+
+
+def _executa(corrotina):
+    return asyncio.run(corrotina)
+
+
+def test_comando_desconhecido():
+    async def cenario():
+        estado = servidor.cria_servidor(concurrent.futures.ThreadPoolExecutor(1))
+        identificador = (await servidor.trata_comando(estado, 'NOVA 9'))[0].split()[1]
+        for linha in ('FOO', f'FOO {identificador}', 'FOO 999'):
+            with pytest.raises(ValueError, match='comando desconhecido'):
+                await servidor.trata_comando(estado, linha)
+        with pytest.raises(ValueError, match='partida inexistente'):
+            await servidor.trata_comando(estado, 'ESTADO 999')
+
+    _executa(cenario())
+
+
+def test_fecha_espera_pelos_comandos_anteriores():
+    async def cenario():
+        estado = servidor.cria_servidor(concurrent.futures.ThreadPoolExecutor(1))
+        identificador = (await servidor.trata_comando(estado, 'NOVA 9'))[0].split()[1]
+
+        # PONTOS espera pelo executor com o trinco; FECHA e JOGA chegam entretanto
+        pontos = asyncio.create_task(servidor.trata_comando(estado, f'PONTOS {identificador}'))
+        await asyncio.sleep(0)
+        fecha = asyncio.create_task(servidor.trata_comando(estado, f'FECHA {identificador}'))
+        joga = asyncio.create_task(servidor.trata_comando(estado, f'JOGA {identificador} C3'))
+
+        assert (await pontos) == ['OK 0 0']
+        assert (await fecha) == ['OK']
+        with pytest.raises(ValueError, match='partida inexistente'):
+            await joga
+        assert not identificador in estado['partidas']
+
+    _executa(cenario())
+
+
+class _ExecutorPartido(concurrent.futures.ThreadPoolExecutor):
+    # Executor cujos processos terminaram, como um conjunto de processos partido
+    def submit(self, *argumentos, **opcoes):
+        raise concurrent.futures.process.BrokenProcessPool('processo terminado')
+
+
+async def _liga(estado):
+    servidor_asyncio = await servidor.inicia_servidor(estado, '127.0.0.1', 0)
+    porta = servidor_asyncio.sockets[0].getsockname()[1]
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+
+    async def pede(linha):
+        escritor.write(f'{linha}\n'.encode('utf-8'))
+        await escritor.drain()
+        return (await leitor.readline()).decode('utf-8').rstrip('\n')
+
+    return servidor_asyncio, leitor, escritor, pede
+
+
+def test_ligacao_tcp():
+    async def cenario():
+        estado = servidor.cria_servidor(concurrent.futures.ThreadPoolExecutor(1))
+        servidor_asyncio, leitor, escritor, pede = await _liga(estado)
+        async with servidor_asyncio:
+            assert await pede('NOVA 9') == 'OK 1'
+            assert await pede('JOGA 1 C3') == 'OK'
+            assert await pede('JOGA 1 C3') == 'ERRO jogada ilegal'
+            assert await pede('JOGA 999 C3') == 'ERRO partida inexistente'
+            assert await pede('FOO') == 'ERRO comando desconhecido'
+            assert await pede('ESTADO 1') == 'OK O 1 EM_CURSO'
+            # Uma pedra preta sozinha rodeia todas as interseções livres
+            assert await pede('PONTOS 1') == 'OK 0 81'
+            # NOVA 1 não é um comando da partida 1, pelo que a sua latência não conta
+            assert await pede('NOVA 1') == 'ERRO cria_partida: argumentos invalidos'
+
+            latencias = (await pede('LATENCIAS 1')).split()
+            assert latencias[0] == 'OK'
+            assert latencias[1] == 'comandos=4'
+            assert [campo.split('=')[0] for campo in latencias[2:]] == ['p50', 'p90', 'p99', 'max']
+
+            assert await pede('SAI') == 'OK'
+            assert await leitor.readline() == b''
+            escritor.close()
+
+    _executa(cenario())
+
+
+def test_falha_do_executor_responde_erro():
+    async def cenario():
+        estado = servidor.cria_servidor(_ExecutorPartido(1))
+        servidor_asyncio, leitor, escritor, pede = await _liga(estado)
+        async with servidor_asyncio:
+            assert await pede('NOVA 9') == 'OK 1'
+            assert await pede('PONTOS 1') == 'ERRO falha no calculo (BrokenProcessPool)'
+            assert await pede('BOT 1 10') == 'ERRO falha no calculo (BrokenProcessPool)'
+            # A ligação e a partida continuam utilizáveis
+            assert await pede('JOGA 1 C3') == 'OK'
+            assert await pede('SAI') == 'OK'
+            escritor.close()
+
+    _executa(cenario())
@@ -0,0 +1,110 @@
+import pytest
+
+import Go
+import sgf
+
+# Uma partida com uma coordenada inválida entre duas partidas válidas
+COLECAO = '(;GM[1]SZ[9];B[ee];W[cc])\n(;GM[1]SZ[9];B[e1];W[cc])\n(;GM[1]SZ[9];B[dd])\n'
+
+
+def test_partida_invalida_saltada_com_aviso(tmp_path):
+    caminho = tmp_path / 'colecao.sgf'
+    caminho.write_text(COLECAO)
+
+    with pytest.warns(UserWarning, match='partida 1'):
+        partidas = list(sgf.le_partidas(str(caminho)))
+
+    assert [partida['jogadas'] for partida in partidas] == \
+        [[Go.cria_intersecao('E', 5), Go.cria_intersecao('C', 7)], [Go.cria_intersecao('D', 6)]]
+
+
+def test_partida_invalida_com_registo_de_erro(tmp_path):
+    caminho = tmp_path / 'colecao.sgf'
+    caminho.write_text(COLECAO)
+
+    partidas = list(sgf.le_partidas(str(caminho), erros=True))
+
+    assert len(partidas) == 3
+    assert 'erro' in partidas[1] and not 'erro' in partidas[0] and not 'erro' in partidas[2]
+    assert partidas[2]['jogadas'] == [Go.cria_intersecao('D', 6)]
+
+
+# Uma dimensão não suportada e uma jogada ilegal (em D6, já ocupada) entre partidas válidas
+REPRODUCOES = '(;SZ[9];B[ah];W[ai];B[bi])\n(;SZ[7];B[aa])\n(;SZ[9];B[dd];W[dd])\n(;SZ[9];B[ee])\n'
+
+
+def test_posicoes_reproduz_as_jogadas_com_capturas():
+    partida = sgf.partida_do_texto('(;SZ[9];B[ah];W[ai];B[bi])')
+    pedras = (Go.cria_pedra_preta(), Go.cria_pedra_branca())
+    esperado = Go.cria_goban_vazio(9)
+    numero = 0
+
+    for goban in sgf.posicoes(partida):
+        if numero > 0:
+            Go.jogada(esperado, partida['jogadas'][numero - 1], pedras[(numero - 1) % 2])
+        assert Go.gobans_iguais(Go.converte_goban(goban, 'listas'), esperado)
+        numero += 1
+
+    # A pedra branca em A1 é capturada pela última jogada
+    assert numero == 4
+    assert not Go.eh_pedra_jogador(Go.obtem_pedra(esperado, Go.cria_intersecao('A', 1)))
+
+
+def test_pedras_iniciais_e_retangulos():
+    partida = sgf.partida_do_texto('(;SZ[9]AB[aa:bb][ee]AW[ii];W[cc])')
+
+    assert set(partida['ip']) == {Go.cria_intersecao(col, lin) for col in 'AB' for lin in (8, 9)} | \
+        {Go.cria_intersecao('E', 5)}
+    assert partida['ib'] == (Go.cria_intersecao('I', 1),)
+    # O branco joga primeiro, pelo que o preto passa antes
+    assert partida['jogadas'] == ['P', Go.cria_intersecao('C', 7)]
+
+    goban = next(sgf.posicoes(partida))
+    assert Go.obtem_pedras_jogadores(goban) == (1, 5)
+
+
+def test_so_a_linha_principal_das_variantes():
+    partida = sgf.partida_do_texto('(;SZ[9];B[ee](;W[cc](;B[dd])(;B[gg]))(;W[hh];B[aa]))')
+
+    assert partida['jogadas'] == [Go.cria_intersecao('E', 5), Go.cria_intersecao('C', 7), Go.cria_intersecao('D', 6)]
+
+
+def test_escreve_e_le_as_mesmas_partidas(tmp_path):
+    caminho = tmp_path / 'escritas.sgf'
+    partidas = [{'n': 9, 'ib': (Go.cria_intersecao('A', 1),), 'ip': (Go.cria_intersecao('I', 9),),
+                 'jogadas': [Go.cria_intersecao('E', 5), 'P', Go.cria_intersecao('C', 3)],
+                 'propriedades': {'PB': ('preto [forte]',), 'C': ('a\\b',)}},
+                {'n': 13, 'ib': (), 'ip': (), 'jogadas': ['P', 'P'], 'propriedades': {}}]
+
+    assert sgf.escreve_partidas(str(caminho), partidas) == 2
+
+    # O escritor acrescenta as propriedades GM e FF ao primeiro nó
+    for partida in partidas:
+        partida['propriedades'] = {'GM': ('1',), 'FF': ('4',), **partida['propriedades']}
+    assert list(sgf.le_partidas(str(caminho))) == partidas
+
+
+def test_posicoes_continuam_depois_de_partidas_que_falham(tmp_path):
+    caminho = tmp_path / 'reproducoes.sgf'
+    caminho.write_text(REPRODUCOES)
+
+    with pytest.warns(UserWarning) as avisos:
+        posicoes = [(partida['jogadas'], numero) for partida, numero, _ in sgf.le_posicoes(str(caminho))]
+
+    assert [str(aviso.message) for aviso in avisos] == \
+        ['le_posicoes: partida 1: cria_goban: argumentos invalidos', 'le_posicoes: partida 2: posicoes: jogada ilegal 1']
+    # A partida com a jogada ilegal produz as posições anteriores a essa jogada
+    assert [numero for _, numero in posicoes] == [0, 1, 2, 3, 0, 1, 0, 1]
+    assert posicoes[-1] == ([Go.cria_intersecao('E', 5)], 1)
+
+
+def test_posicoes_com_registos_de_erro(tmp_path):
+    caminho = tmp_path / 'reproducoes.sgf'
+    caminho.write_text(REPRODUCOES + COLECAO)
+
+    erros = [(partida['erro'], numero) for partida, numero, goban in sgf.le_posicoes(str(caminho), erros=True)
+             if goban is None]
+
+    assert [numero for _, numero in erros] == [0, 2, 0]
+    assert erros[0][0].startswith('partida 1:') and erros[1][0].startswith('partida 2:')
+    assert erros[2][0].startswith('partida 5:')
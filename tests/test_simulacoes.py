@@ -0,0 +1,43 @@
+import Go
+
+
+def test_simulacoes_reprodutiveis_e_terminadas_por_passagens():
+    for n in (9, 13):
+        vazio = Go.cria_goban_vazio(n)
+        preta = Go.cria_pedra_preta()
+        pontuacoes = set()
+        for fluxo in range(10):
+            pontuacao = Go.simula_partida(vazio, preta, vazio, Go.cria_gerador(7, fluxo))
+            assert pontuacao == Go.simula_partida(vazio, preta, vazio, Go.cria_gerador(7, fluxo))
+            # A partida acaba com duas passagens, antes do limite de jogadas, quando só restam olhos
+            assert pontuacao == Go.simula_partida(vazio, preta, vazio, Go.cria_gerador(7, fluxo), 20 * n * n)
+            assert sum(pontuacao) == n * n
+            pontuacoes.add(pontuacao)
+        # Fluxos diferentes dão partidas diferentes
+        assert len(pontuacoes) > 1
+
+
+def test_simulacao_nao_modifica_os_argumentos():
+    brancas = tuple(Go.cria_intersecao(*i) for i in (('C', 3), ('B', 2), ('D', 2), ('C', 1)))
+    pretas = tuple(Go.cria_intersecao(*i) for i in (('B', 3), ('A', 2), ('B', 1), ('E', 5)))
+
+    for representacao in Go.REPRESENTACOES:
+        g = Go.cria_goban(9, brancas, pretas, representacao)
+        h = Go.regista_goban(Go.cria_historico(), g)
+        antes = Go.goban_para_str(g), list(h['sequencia'])
+        pontuacao = Go.simula_partida(g, Go.cria_pedra_branca(), h, Go.cria_gerador(3))
+        assert (Go.goban_para_str(g), list(h['sequencia'])) == antes
+        # A simulação é a mesma em todas as representações
+        assert pontuacao == Go.simula_partida(Go.cria_goban(9, brancas, pretas), Go.cria_pedra_branca(), h,
+                                              Go.cria_gerador(3))
+
+
+def test_mede_simulacoes():
+    vazio = Go.cria_goban_vazio(9)
+    preta = Go.cria_pedra_preta()
+    medicao = Go.mede_simulacoes(vazio, preta, vazio, 20, semente=5)
+
+    assert medicao['simulacoes'] == 20 and medicao['simulacoes_por_segundo'] > 0
+    assert medicao['vitorias_branco'] == Go.mede_simulacoes(vazio, preta, vazio, 20, semente=5)['vitorias_branco']
+    pontuacoes = [Go.simula_partida(vazio, preta, vazio, Go.cria_gerador(5, fluxo)) for fluxo in range(20)]
+    assert medicao['vitorias_branco'] == sum(1 for branco, preto in pontuacoes if branco > preto)
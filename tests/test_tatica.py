@@ -0,0 +1,76 @@
+import Go
+import tatica
+
+
+def _intersecoes(*nomes):
+    return tuple(Go.cria_intersecao(nome[0], int(nome[1:])) for nome in nomes)
+
+
+# A pedra branca em C3, com duas liberdades, foge em escada na diagonal para cima e para a direita
+ALVO = Go.cria_intersecao('C', 3)
+PRETAS = _intersecoes('B3', 'C2', 'D2')
+
+# As pretas de A1 a C1 têm uma liberdade (D1) e as brancas de A2 a D2 têm duas (D1 e E2)
+CORRIDA = (_intersecoes('A2', 'B2', 'C2', 'D2', 'E1'),
+           _intersecoes('A1', 'B1', 'C1', 'A3', 'B3', 'C3', 'D3', 'E3', 'F2'))
+
+
+def test_escada_captura():
+    preta, branca = Go.cria_pedra_preta(), Go.cria_pedra_branca()
+    g = Go.cria_goban(9, (ALVO,), PRETAS)
+    antes = Go.goban_para_str(g)
+
+    resultado = tatica.le_escada(g, ALVO, preta)
+    assert resultado['capturada'] is True
+    assert resultado['jogada'] == Go.cria_intersecao('C', 4)
+    assert resultado['nos'] > 10
+
+    # Com o defensor a jogar, a cadeia chega a três liberdades
+    resultado = tatica.le_escada(g, ALVO, branca)
+    assert resultado['capturada'] is False
+    assert resultado['jogada'] in _intersecoes('C4', 'D3')
+
+    # A leitura é feita numa cópia do goban
+    assert Go.goban_para_str(g) == antes
+
+
+def test_escada_com_quebra_escadas():
+    preta = Go.cria_pedra_preta()
+
+    for quebra in _intersecoes('F6', 'G7'):
+        g = Go.cria_goban(9, (ALVO, quebra), PRETAS)
+        resultado = tatica.le_escada(g, ALVO, preta)
+        assert resultado['capturada'] is False
+        assert resultado['jogada'] is None
+
+    # Uma pedra branca fora do caminho da escada não a quebra
+    g = Go.cria_goban(9, (ALVO,) + _intersecoes('B8'), PRETAS)
+    assert tatica.le_escada(g, ALVO, preta)['capturada'] is True
+
+
+def test_corrida_de_liberdades():
+    preta, branca = Go.cria_pedra_preta(), Go.cria_pedra_branca()
+    g = Go.cria_goban(9, *CORRIDA)
+    i1, i2 = _intersecoes('A1', 'A2')
+
+    resultado = tatica.le_corrida(g, i1, i2, branca)
+    assert resultado['vencedor'] == branca
+    assert resultado['jogada'] == Go.cria_intersecao('D', 1)
+
+    # O preto a jogar também perde, e não há jogada que ganhe
+    resultado = tatica.le_corrida(g, i2, i1, preta)
+    assert resultado['vencedor'] == branca
+    assert resultado['jogada'] is None
+
+
+def test_orcamento_esgotado():
+    preta = Go.cria_pedra_preta()
+    g = Go.cria_goban(9, (ALVO,), PRETAS)
+
+    resultado = tatica.le_escada(g, ALVO, preta, max_nos=1)
+    assert resultado['capturada'] is None and resultado['jogada'] is None
+    assert resultado['nos'] == 2
+
+    g = Go.cria_goban(9, *CORRIDA)
+    resultado = tatica.le_corrida(g, *_intersecoes('A1', 'A2'), preta, max_nos=1)
+    assert resultado['vencedor'] is None and resultado['jogada'] is None
@@ -0,0 +1,35 @@
+import Go
+import transposicoes
+
+
+def test_chaves_distinguem_dimensoes():
+    # O goban vazio tem o hash 0 em todas as dimensões
+    t = transposicoes.cria_tabela(100)
+    preta = Go.cria_pedra_preta()
+
+    for n in (9, 19, 9, 13):
+        g = Go.cria_goban_vazio(n)
+        assert len(transposicoes.jogadas_legais_em_cache(t, g, preta, Go.cria_historico())) == n * n
+        assert transposicoes.jogadas_legais_em_cache(t, g, preta, Go.cria_goban_vazio(n)) == \
+            Go.jogadas_legais(g, preta, Go.cria_goban_vazio(n))
+        assert transposicoes.calcula_pontos_em_cache(t, g) == Go.calcula_pontos(g)
+
+
+def test_pontos_distinguem_dimensoes():
+    t = transposicoes.cria_tabela(100)
+    ib = (Go.cria_intersecao('A', 1),)
+
+    for n in (9, 19):
+        g = Go.cria_goban(n, ib, ())
+        assert transposicoes.calcula_pontos_em_cache(t, Go.cria_goban_vazio(n)) == (0, 0)
+        assert transposicoes.calcula_pontos_em_cache(t, g) == Go.calcula_pontos(g)
+
+
+def test_jogadas_legais_sem_goban_anterior():
+    t = transposicoes.cria_tabela(100)
+    preta = Go.cria_pedra_preta()
+    g = Go.cria_goban(9, (Go.cria_intersecao('B', 1),), (Go.cria_intersecao('A', 2),))
+
+    for l in (None, Go.cria_goban_vazio(13), Go.cria_goban_vazio(9)):
+        assert transposicoes.jogadas_legais_em_cache(t, g, preta, l) == Go.jogadas_legais(g, preta, l)
+        assert transposicoes.jogadas_legais_em_cache(t, g, preta, l) == Go.jogadas_legais(g, preta, l)
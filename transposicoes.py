@@ -0,0 +1,266 @@
+'''
+Tabela de transposições com chaves canónicas por simetria, para guardar resultados de análise.
+
+A chave canónica de um goban é o menor dos hashes de Zobrist dos 8 gobans obtidos pelas simetrias
+do goban (rotações e reflexões), pelo que posições iguais a menos de uma simetria, ou a que se chega
+por ordens diferentes de jogadas, têm a mesma chave. As simetrias são as de planos.aplica_simetria:
+a simetria s roda o goban s % 4 quartos de volta e, se s >= 4, reflete-o depois.
+
+O TAD tabela é usado para guardar valores associados a chaves, com um número máximo de entradas.
+
+-Cada tabela é representada por um dicionário com a capacidade ('capacidade'), um dicionário
+ordenado das entradas, da menos para a mais recentemente usada ('entradas'), e os contadores de
+acertos, falhas e substituições ('acertos', 'falhas', 'substituicoes'). Quando a tabela está cheia,
+a entrada usada há mais tempo é substituída pela nova.
+
+Os valores guardados com a chave canónica têm de ser iguais em todas as simetrias da posição (como
+a pontuação ou o valor de uma procura); os que dependem da orientação (como as jogadas) são guardados
+na orientação canónica e transformados com transforma_indices, como em jogadas_legais_em_cache.
+'''
+
+import collections
+
+import Go
+
+# Permutações dos índices de cada simetria e chaves de Zobrist de cada simetria, por dimensão do goban
+_PERMUTACOES = {}
+_CHAVES = {}
+
+SIMETRIAS = 8
+
+def _obtem_permutacoes(n):
+    '''
+    _obtem_permutacoes: int → tuplo
+
+    Esta função auxiliar devolve o tuplo que associa a cada simetria de um goban nxn o tuplo com o
+    índice para onde cada índice é levado pela simetria.
+    '''
+
+    if not n in _PERMUTACOES:
+        permutacoes = ()
+        for simetria in range(SIMETRIAS):
+            destinos = ()
+            for k in range(n * n):
+                linha, coluna = divmod(k, n)
+                # Cada quarto de volta leva (linha, coluna) a (n - 1 - coluna, linha)
+                for _ in range(simetria % 4):
+                    linha, coluna = n - 1 - coluna, linha
+                if simetria >= 4:
+                    coluna = n - 1 - coluna
+                destinos += (linha * n + coluna,)
+            permutacoes += (destinos,)
+        _PERMUTACOES[n] = permutacoes
+
+    return _PERMUTACOES[n]
+
+def _obtem_chaves(n):
+    '''
+    _obtem_chaves: int → lista
+
+    Esta função auxiliar devolve a lista que associa a cada índice de um goban nxn um dicionário com,
+    para cada pedra de jogador, o tuplo das chaves de Zobrist dessa pedra no índice transformado por
+    cada uma das simetrias.
+    '''
+
+    if not n in _CHAVES:
+        zobrist = Go.obtem_chaves_zobrist(n)
+        permutacoes = _obtem_permutacoes(n)
+        _CHAVES[n] = [{pedra: tuple(zobrist[permutacoes[simetria][k]][pedra] for simetria in range(SIMETRIAS))
+                       for pedra in (Go.cria_pedra_branca(), Go.cria_pedra_preta())} for k in range(n * n)]
+
+    return _CHAVES[n]
+
+def _pedras(g):
+    '''
+    _pedras: goban → lista
+
+    Esta função auxiliar devolve a lista dos pares (indice, pedra) das pedras de jogador do goban g.
+    '''
+
+    n = Go.obtem_tamanho(g)
+    if Go.eh_goban_bits(g):
+        return [(k, Go.cria_pedra_branca()) for k in Go.indices_dos_bits(g['brancas'])] + \
+               [(k, Go.cria_pedra_preta()) for k in Go.indices_dos_bits(g['pretas'])]
+
+    colunas = Go.obtem_colunas(g)
+    if Go.eh_goban_incremental(g):
+        return [(k, colunas[k % n][k // n]) for pedras in g['pedras'].values() for k in pedras]
+
+    return [(k, colunas[k % n][k // n]) for k in range(n * n) if Go.eh_pedra_jogador(colunas[k % n][k // n])]
+
+def hashes_simetricos(g):
+    '''
+    hashes_simetricos: goban → tuplo
+
+    Esta função devolve o tuplo com o hash de Zobrist do goban g transformado por cada simetria
+    (o da simetria 0 é obtem_hash(g)).
+    '''
+
+    chaves = _obtem_chaves(Go.obtem_tamanho(g))
+    h0 = h1 = h2 = h3 = h4 = h5 = h6 = h7 = 0
+    for k, pedra in _pedras(g):
+        c = chaves[k][pedra]
+        h0 ^= c[0]; h1 ^= c[1]; h2 ^= c[2]; h3 ^= c[3]
+        h4 ^= c[4]; h5 ^= c[5]; h6 ^= c[6]; h7 ^= c[7]
+
+    return (h0, h1, h2, h3, h4, h5, h6, h7)
+
+def chave_canonica(g):
+    '''
+    chave_canonica: goban → tuplo
+
+    Esta função devolve o tuplo com a chave canónica do goban g (o menor hash das suas simetrias)
+    e a simetria que leva g à orientação canónica (a de menor número, em caso de empate).
+    '''
+
+    hashes = hashes_simetricos(g)
+    chave = min(hashes)
+
+    return chave, hashes.index(chave)
+
+def transforma_indices(indices, simetria, n, inversa=False):
+    '''
+    transforma_indices: iterável x int x int x booleano → tuplo
+
+    Esta função devolve o tuplo ordenado dos índices de um goban nxn transformados pela simetria
+    dada, ou pela sua inversa se inversa for True.
+    '''
+
+    permutacao = _obtem_permutacoes(n)[simetria]
+    if inversa:
+        inversa_permutacao = [0] * (n * n)
+        for k in range(n * n):
+            inversa_permutacao[permutacao[k]] = k
+        permutacao = inversa_permutacao
+
+    return tuple(sorted(permutacao[k] for k in indices))
+
+def cria_tabela(capacidade):
+    '''
+    cria_tabela: int → tabela
+
+    Esta função devolve uma tabela vazia com no máximo capacidade entradas.
+    '''
+
+    if not isinstance(capacidade, int) or capacidade < 1:
+        raise ValueError('cria_tabela: argumentos invalidos')
+
+    return {'capacidade': capacidade, 'entradas': collections.OrderedDict(),
+            'acertos': 0, 'falhas': 0, 'substituicoes': 0}
+
+def obtem_entrada(t, chave, omissao=None):
+    '''
+    obtem_entrada: tabela x universal x universal → universal
+
+    Esta função devolve o valor associado à chave na tabela t, ou omissao se não existir,
+    contando um acerto ou uma falha.
+    '''
+
+    entradas = t['entradas']
+    if chave in entradas:
+        entradas.move_to_end(chave)
+        t['acertos'] += 1
+        return entradas[chave]
+
+    t['falhas'] += 1
+    return omissao
+
+def guarda_entrada(t, chave, valor):
+    '''
+    guarda_entrada: tabela x universal x universal → tabela
+
+    Esta função associa o valor à chave na tabela t, substituindo a entrada usada há mais tempo
+    se a tabela estiver cheia, e devolve a tabela.
+    '''
+
+    entradas = t['entradas']
+    if chave in entradas:
+        entradas.move_to_end(chave)
+    elif len(entradas) >= t['capacidade']:
+        entradas.popitem(last=False)
+        t['substituicoes'] += 1
+    entradas[chave] = valor
+
+    return t
+
+def limpa_tabela(t):
+    '''
+    limpa_tabela: tabela → tabela
+
+    Esta função remove todas as entradas da tabela t e põe os seus contadores a zero.
+    '''
+
+    t['entradas'].clear()
+    t['acertos'] = t['falhas'] = t['substituicoes'] = 0
+
+    return t
+
+def estatisticas_tabela(t):
+    '''
+    estatisticas_tabela: tabela → dicionário
+
+    Esta função devolve um dicionário com o número de entradas, a capacidade, os acertos, as falhas,
+    as substituições e a taxa de acertos da tabela t.
+    '''
+
+    consultas = t['acertos'] + t['falhas']
+
+    return {'entradas': len(t['entradas']), 'capacidade': t['capacidade'], 'acertos': t['acertos'],
+            'falhas': t['falhas'], 'substituicoes': t['substituicoes'],
+            'taxa_acertos': t['acertos'] / consultas if consultas else 0.0}
+
+def calcula_pontos_em_cache(t, g):
+    '''
+    calcula_pontos_em_cache: tabela x goban → tuplo
+
+    Esta função devolve calcula_pontos(g), guardando-a na tabela t com a dimensão e a chave canónica de g.
+    '''
+
+    # O goban vazio tem o hash 0 em todas as dimensões, pelo que a chave inclui a dimensão
+    chave = ('pontos', Go.obtem_lin(Go.obtem_ultima_intersecao(g)), chave_canonica(g)[0])
+    pontuacao = obtem_entrada(t, chave)
+    if pontuacao is None:
+        pontuacao = Go.calcula_pontos(g)
+        guarda_entrada(t, chave, pontuacao)
+
+    return pontuacao
+
+def jogadas_legais_em_cache(t, g, p, l):
+    '''
+    jogadas_legais_em_cache: tabela x goban x pedra x (goban ou historico) → tuplo
+
+    Esta função devolve jogadas_legais(g, p, l), guardando-a na tabela t. Se l não proibir nenhuma
+    posição (None, um goban de outra dimensão ou um histórico sem posições anteriores), as jogadas
+    são guardadas na orientação canónica e partilhadas pelas simetrias de g; caso contrário dependem
+    da posição proibida e são guardadas com o hash de g e o da posição proibida. Com superko, as jogadas
+    não são guardadas. As chaves incluem a dimensão de g.
+    '''
+
+    n = Go.obtem_lin(Go.obtem_ultima_intersecao(g))
+    if Go.eh_historico(l) and l['superko']:
+        return Go.jogadas_legais(g, p, l)
+
+    # A posição proibida é obtida de l como em jogadas_legais
+    if Go.eh_historico(l):
+        proibida = l['sequencia'][-2] if len(l['sequencia']) >= 2 else None
+    elif Go.eh_goban(l) and Go.intersecoes_iguais(Go.obtem_ultima_intersecao(l), Go.obtem_ultima_intersecao(g)):
+        proibida = Go.obtem_hash(l)
+    else:
+        proibida = None
+
+    if proibida is None:
+        chave, simetria = chave_canonica(g)
+        indices = obtem_entrada(t, ('legais', n, p, chave))
+        if indices is None:
+            indices = Go.indices_dos_bits(Go.mascara_jogadas_legais(g, p, l))
+            guarda_entrada(t, ('legais', n, p, chave), transforma_indices(indices, simetria, n))
+        else:
+            indices = transforma_indices(indices, simetria, n, inversa=True)
+    else:
+        chave = ('legais_proibida', n, p, Go.obtem_hash(g), proibida)
+        indices = obtem_entrada(t, chave)
+        if indices is None:
+            indices = Go.indices_dos_bits(Go.mascara_jogadas_legais(g, p, l))
+            guarda_entrada(t, chave, tuple(indices))
+
+    return tuple(Go.intersecao_do_indice(k, n) for k in indices)